@@ -1,28 +1,63 @@
-from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import insert, select, update, func
 from db.session import get_db
 from models.strategy_models import Strategy, StrategyTriggerLog
 from config import Settings
-from pydantic import BaseModel, Field
-from typing import Dict, Any, Optional, Literal
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Dict, Any, List, Optional, Literal
+from datetime import datetime
+import hmac
 import uuid
 from core.strategy_loader import StrategyLoader
 from models.strategy_models import StrategyStatus
 from core.data_prefetcher import DataPrefetcher
 from core.condition_evaluator import ConditionEvaluator, EvaluationContext
 from core.logic_tree_evaluator import LogicTreeEvaluator
-import aioredis
+from cachetools import TTLCache
+from cache.redis_client import get_redis
 
 router = APIRouter()
 
 # Instantiate settings globally or use a dependency if settings are dynamic
 settings = Settings()
 
+# Active strategies are read far more often than they change; writes below clear this cache.
+_STRATEGY_CACHE: TTLCache = TTLCache(maxsize=1, ttl=settings.STRATEGY_CACHE_TTL_SECONDS)
+_STRATEGY_CACHE_KEY = "active_strategies"
+
+
+async def cached_active_strategies(db: AsyncSession) -> List[Strategy]:
+    strategies = _STRATEGY_CACHE.get(_STRATEGY_CACHE_KEY)
+    if strategies is None:
+        strategies = await StrategyLoader(db).load_active_strategies()
+        _STRATEGY_CACHE[_STRATEGY_CACHE_KEY] = strategies
+    return strategies
+
+
+def invalidate_strategy_cache(request: Request) -> None:
+    _STRATEGY_CACHE.clear()
+    scheduler = getattr(request.app.state, "scheduler", None)
+    if scheduler is not None:
+        scheduler.invalidate()
+
+_API_KEY: Optional[bytes] = settings.MONITORING_API_KEY.encode() if settings.MONITORING_API_KEY else None
+
 async def require_api_key(x_monitoring_key: str = Header(None, alias="X-Monitoring-Key")) -> None:
-    if not settings.MONITORING_API_KEY or x_monitoring_key != settings.MONITORING_API_KEY:
+    # compare_digest keeps the check constant-time so the key can't be recovered byte by byte
+    if _API_KEY is None or not hmac.compare_digest((x_monitoring_key or "").encode(), _API_KEY):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
 
+def get_prefetcher(request: Request) -> DataPrefetcher:
+    """
+    Returns the app-scoped DataPrefetcher created at startup.
+    """
+    prefetcher = getattr(request.app.state, "prefetcher", None)
+    if prefetcher is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Data prefetcher not initialized")
+    return prefetcher
+
 @router.get("/health")
 async def health_check():
     return {"status": "healthy"}
@@ -36,9 +71,8 @@ async def list_strategies(
     Retrieves a list of active strategies from the database.
     This endpoint demonstrates fetching data using the SQLAlchemy async session.
     """
-    strategy_loader = StrategyLoader(db)
-    strategies = await strategy_loader.load_active_strategies()
-    return [
+    strategies = await cached_active_strategies(db)
+    return ORJSONResponse([
         {
             "id": s.id,
             "name": s.name,
@@ -48,10 +82,12 @@ async def list_strategies(
             "trigger_count": s.trigger_count,
         }
         for s in strategies
-    ]
+    ])
 
 
 class StrategyTriggerLogCreate(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     strategy_id: uuid.UUID
     name: str
     status: Literal["TRIGGERED", "HELD", "FAILED"]
@@ -61,6 +97,7 @@ class StrategyTriggerLogCreate(BaseModel):
 
 @router.post("/trigger_log", status_code=status.HTTP_201_CREATED)
 async def create_trigger_log(
+    request: Request,
     log_data: StrategyTriggerLogCreate,
     db: AsyncSession = Depends(get_db),
     _: None = Depends(require_api_key),
@@ -68,42 +105,44 @@ async def create_trigger_log(
     """
     Creates a new strategy trigger log entry in the database.
     """
-    strategy_loader = StrategyLoader(db)
-    strategy = await strategy_loader.load_strategy_by_id(log_data.strategy_id)
-    if strategy is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Strategy not found")
-
-    # Update strategy's last_triggered_at and increment trigger_count
-    strategy.last_triggered_at = func.now()
-    strategy.trigger_count += 1
-    db.add(strategy) # Mark the strategy as modified
-
     # Add name and status to snapshot
-    log_data.snapshot["strategy_name"] = log_data.name
-    log_data.snapshot["trigger_status"] = log_data.status
-
-    new_log = StrategyTriggerLog(
-        strategy_id=log_data.strategy_id,
-        snapshot=log_data.snapshot,
-        message=log_data.message,
-    )
-    db.add(new_log)
+    snapshot = {**log_data.snapshot, "strategy_name": log_data.name, "trigger_status": log_data.status}
+
     try:
+        # Update strategy's last_triggered_at and increment trigger_count; RETURNING doubles as the existence check
+        updated = await db.execute(
+            update(Strategy)
+            .where(Strategy.id == log_data.strategy_id)
+            .values(trigger_count=Strategy.trigger_count + 1, last_triggered_at=func.now())
+            .returning(Strategy.id)
+        )
+        if updated.scalar_one_or_none() is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Strategy not found")
+
+        log_id = (await db.execute(
+            insert(StrategyTriggerLog)
+            .values(strategy_id=log_data.strategy_id, snapshot=snapshot, message=log_data.message)
+            .returning(StrategyTriggerLog.id)
+        )).scalar_one()
         await db.commit()
+    except HTTPException:
+        await db.rollback()
+        raise
     except Exception as e:
         await db.rollback()
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Failed to create trigger log: {e}")
-    await db.refresh(new_log)
-    return {"message": "Trigger log created successfully", "log_id": str(new_log.id)}
+    invalidate_strategy_cache(request)
+    return {"message": "Trigger log created successfully", "log_id": str(log_id)}
 
 @router.post("/reload_strategies")
 @router.post("/reload-strategies")
 async def reload_strategies(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     _: None = Depends(require_api_key),
 ):
-    strategy_loader = StrategyLoader(db)
-    strategies = await strategy_loader.load_active_strategies()
+    invalidate_strategy_cache(request)
+    strategies = await cached_active_strategies(db)
     total = len(strategies)
     return {"reloaded": total}
 
@@ -131,26 +170,35 @@ async def metrics(
     db: AsyncSession = Depends(get_db),
     _: None = Depends(require_api_key),
 ):
-    strategy_loader = StrategyLoader(db)
-    active_strategies = await strategy_loader.load_active_strategies()
-    s_count = len(active_strategies)
-    t_count = (await db.execute(select(func.count(StrategyTriggerLog.id)))).scalar_one()
-    return {
+    s_count_q = select(func.count(Strategy.id)).where(Strategy.status == StrategyStatus.active).scalar_subquery()
+    t_count_q = select(func.count(StrategyTriggerLog.id)).scalar_subquery()
+    # Both counts in one round-trip; an AsyncSession cannot run statements concurrently
+    s_count, t_count = (await db.execute(select(s_count_q, t_count_q))).one()
+    return ORJSONResponse({
         "active_strategies": s_count,
         "total_trigger_logs": t_count,
-    }
+    })
 
 @router.get("/trigger_logs")
 async def get_trigger_logs(
+    limit: int = Query(100, ge=1, le=1000),
+    before: Optional[datetime] = None,
+    strategy_id: Optional[uuid.UUID] = None,
     db: AsyncSession = Depends(get_db),
     _: None = Depends(require_api_key),
 ):
     """
-    Retrieves a list of all strategy trigger logs from the database.
+    Retrieves the most recent strategy trigger logs, newest first, optionally for a single strategy.
+    Pass the oldest `timestamp` of a page as `before` to fetch the next page.
     """
-    result = await db.execute(select(StrategyTriggerLog))
+    q = select(StrategyTriggerLog).order_by(StrategyTriggerLog.triggered_at.desc()).limit(limit)
+    if strategy_id is not None:
+        q = q.where(StrategyTriggerLog.strategy_id == strategy_id)
+    if before is not None:
+        q = q.where(StrategyTriggerLog.triggered_at < before)
+    result = await db.execute(q)
     trigger_logs = result.scalars().all()
-    return [
+    return ORJSONResponse([
         {
             "id": log.id,
             "strategy_id": log.strategy_id,
@@ -159,14 +207,17 @@ async def get_trigger_logs(
             "message": log.message,
         }
         for log in trigger_logs
-    ]
+    ])
 
 
 class StrategyStatusUpdate(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     status: StrategyStatus
 
 @router.put("/strategies/{strategy_id}/status", status_code=status.HTTP_200_OK)
 async def update_strategy_status(
+    request: Request,
     strategy_id: uuid.UUID,
     status_update: StrategyStatusUpdate,
     db: AsyncSession = Depends(get_db),
@@ -189,6 +240,7 @@ async def update_strategy_status(
     except Exception as e:
         await db.rollback()
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Failed to update strategy status: {e}")
+    invalidate_strategy_cache(request)
 
     return {"message": f"Strategy {strategy_id} status updated to {status_update.status.value}", "new_status": strategy.status.value}
 
@@ -196,22 +248,18 @@ async def update_strategy_status(
 async def evaluate_strategy(
     strategy_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
+    pref: DataPrefetcher = Depends(get_prefetcher),
     _: None = Depends(require_api_key),
 ):
     loader = StrategyLoader(db)
     strategy = await loader.load_strategy_by_id(str(strategy_id))
     if strategy is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Strategy not found")
-    pref = DataPrefetcher(redis_url=settings.REDIS_URL)
-    await pref.connect()
-    try:
-        evaluator = ConditionEvaluator(pref)
-        logic = LogicTreeEvaluator(evaluator)
-        ctx = EvaluationContext(pref)
-        res = await logic.evaluate(strategy, ctx)
-        return {"met": res.met, "details": res.details}
-    finally:
-        await pref.close()
+    evaluator = ConditionEvaluator(pref)
+    logic = LogicTreeEvaluator(evaluator)
+    ctx = EvaluationContext(pref)
+    res = await logic.evaluate(strategy, ctx)
+    return {"met": res.met, "details": res.details}
 
 @router.get("/cache/get")
 async def cache_get(
@@ -220,8 +268,10 @@ async def cache_get(
 ):
     if not settings.REDIS_URL:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="REDIS_URL not configured")
-    pool = aioredis.ConnectionPool.from_url(settings.REDIS_URL)
-    async with aioredis.Redis(connection_pool=pool) as redis:
-        raw = await redis.get(key)
-        val = raw.decode() if isinstance(raw, (bytes, bytearray)) else raw
-        return {"key": key, "value": val}
\ No newline at end of file
+    try:
+        redis = get_redis()
+    except RuntimeError:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Redis not connected")
+    raw = await redis.get(key)
+    val = raw.decode() if isinstance(raw, (bytes, bytearray)) else raw
+    return {"key": key, "value": val}
\ No newline at end of file
@@ -1,20 +1,23 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from config import get_settings
 from api.strategies import router as strategies_router
 from core.batched_scheduler import BatchedScheduler
+from core.data_prefetcher import DataPrefetcher
 import logging
 
 logging.basicConfig(level=logging.DEBUG)
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
-    allow_methods=["*"],
+    allow_methods=["GET", "POST", "PUT"],
     allow_headers=["*"],
+    max_age=86400,  # let browsers cache preflight responses for a day
 )
 
 app.include_router(strategies_router, prefix="/internal")
@@ -37,12 +40,14 @@ async def on_startup():
         await test_redis_connection(settings.REDIS_URL)
     except Exception as e:
         logging.error(f"Redis connection failed: {e}")
+    app.state.prefetcher = DataPrefetcher(redis_url=settings.REDIS_URL)
+    await app.state.prefetcher.connect()
     if settings.POSTGRES_URL:
         try:
             await test_db_connection(settings.POSTGRES_URL)
             from db.session import AsyncSessionLocal
             if settings.ENABLE_SCHEDULER:
-                app.state.scheduler = BatchedScheduler(AsyncSessionLocal)
+                app.state.scheduler = BatchedScheduler(AsyncSessionLocal, app.state.prefetcher)
                 await app.state.scheduler.start()
         except Exception as e:
             logging.error(f"Postgres connection failed: {e}")
@@ -52,10 +57,14 @@ async def on_startup():
 
 from cache.redis_client import close_redis_connection
 from db.session import close_db_connection
+from clients.http import close_http_session
 
 @app.on_event("shutdown")
 async def on_shutdown():
     if hasattr(app.state, "scheduler") and app.state.scheduler:
         await app.state.scheduler.stop()
+    if getattr(app.state, "prefetcher", None):
+        await app.state.prefetcher.close()
     await close_redis_connection()
+    await close_http_session()
     await close_db_connection()
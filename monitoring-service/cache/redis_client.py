@@ -1,6 +1,10 @@
-import aioredis
+from redis import asyncio as aioredis
+import logging
+from redis.utils import HIREDIS_AVAILABLE
 from typing import Optional
 
+logger = logging.getLogger(__name__)
+
 redis_pool: Optional[aioredis.ConnectionPool] = None
 
 async def test_redis_connection(redis_url: str) -> None:
@@ -9,10 +13,20 @@ async def test_redis_connection(redis_url: str) -> None:
         redis_pool = aioredis.ConnectionPool.from_url(redis_url)
         async with aioredis.Redis(connection_pool=redis_pool) as redis:
             await redis.ping()
+        logger.info(f"Redis connected (protocol parser: {'hiredis' if HIREDIS_AVAILABLE else 'python'})")
     except Exception as e:
         raise RuntimeError(f"Redis connection failed: {str(e)}") from e
 
+def get_redis() -> aioredis.Redis:
+    """
+    Returns a client bound to the shared pool created at startup.
+    """
+    if redis_pool is None:
+        raise RuntimeError("Redis pool not initialized")
+    return aioredis.Redis(connection_pool=redis_pool)
+
 async def close_redis_connection() -> None:
     global redis_pool
     if redis_pool:
-        await redis_pool.disconnect()
\ No newline at end of file
+        await redis_pool.disconnect()
+        redis_pool = None
\ No newline at end of file
@@ -1,6 +1,8 @@
 import aiohttp
+import orjson
 from typing import Any, Dict, List, Optional
 from .base import BaseClient
+from .http import get_http_session
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,13 +19,11 @@ class AsyncBinanceClient(BaseClient):
 
     BASE_URL = "https://api.binance.com"
 
-    def __init__(self) -> None:
-        self._session: Optional[aiohttp.ClientSession] = None
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None) -> None:
+        self._session = session
 
     async def _get_session(self) -> aiohttp.ClientSession:
-        if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
-        return self._session
+        return self._session or get_http_session()
 
     def _quote_for_currency(self, currency: str) -> str:
         """
@@ -59,7 +59,7 @@ class AsyncBinanceClient(BaseClient):
         try:
             async with session.get(url, params=params) as resp:
                 resp.raise_for_status()
-                data = await resp.json()
+                data = await resp.json(loads=orjson.loads)
                 price_str = data.get("price")
                 if price_str is None:
                     logger.warning(f"No price found for {pair}")
@@ -72,6 +72,27 @@ class AsyncBinanceClient(BaseClient):
             logger.error(f"Unexpected error fetching price for {pair}: {e}")
             return None
 
+    @staticmethod
+    def _parse_klines(data: List[List[Any]]) -> List[Dict[str, Any]]:
+        """
+        Converts raw Binance kline rows into { timestamp, open, high, low, close, volume } dicts.
+        """
+        # Binance kline array format:
+        # [0] openTime(ms), [1] open, [2] high, [3] low, [4] close, [5] volume,
+        # [6] closeTime(ms), [7] quoteAssetVolume, [8] trades, [9] takerBuyBase,
+        # [10] takerBuyQuote, [11] ignore
+        return [
+            {
+                "timestamp": int(k[0]),
+                "open": float(k[1]),
+                "high": float(k[2]),
+                "low": float(k[3]),
+                "close": float(k[4]),
+                "volume": float(k[5]),
+            }
+            for k in data
+        ]
+
     async def get_klines(
         self,
         symbol: str,
@@ -98,22 +119,8 @@ class AsyncBinanceClient(BaseClient):
         try:
             async with session.get(url, params=params) as resp:
                 resp.raise_for_status()
-                data = await resp.json()
-                klines: List[Dict[str, Any]] = []
-                # Binance kline array format:
-                # [0] openTime(ms), [1] open, [2] high, [3] low, [4] close, [5] volume,
-                # [6] closeTime(ms), [7] quoteAssetVolume, [8] trades, [9] takerBuyBase,
-                # [10] takerBuyQuote, [11] ignore
-                for k in data:
-                    klines.append({
-                        "timestamp": int(k[0]),
-                        "open": float(k[1]),
-                        "high": float(k[2]),
-                        "low": float(k[3]),
-                        "close": float(k[4]),
-                        "volume": float(k[5]),
-                    })
-                return klines
+                data = await resp.json(loads=orjson.loads)
+                return self._parse_klines(data)
         except aiohttp.ClientError as e:
             logger.error(f"Binance API error fetching klines for {pair}: {e}")
             return None
@@ -122,7 +129,6 @@ class AsyncBinanceClient(BaseClient):
             return None
 
     async def close(self) -> None:
-        if self._session and not self._session.closed:
-            await self._session.close()
-            self._session = None
-            logger.info("Binance client session closed.")
\ No newline at end of file
+        # The HTTP session is shared process-wide and closed by clients.http.close_http_session()
+        self._session = None
+        logger.info("Binance client released.")
\ No newline at end of file
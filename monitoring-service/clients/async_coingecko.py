@@ -1,6 +1,8 @@
 import aiohttp
+import orjson
 from typing import Any, Dict, List, Optional
 from .base import BaseClient
+from .http import get_http_session
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,14 +14,12 @@ class AsyncCoinGeckoClient(BaseClient):
     """
     BASE_URL = "https://api.coingecko.com/api/v3"
 
-    def __init__(self):
-        self._session: Optional[aiohttp.ClientSession] = None
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
+        self._session = session
 
     async def _get_session(self) -> aiohttp.ClientSession:
-        """Ensures a single aiohttp ClientSession is used."""
-        if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
-        return self._session
+        """Uses the injected session, or the process-wide shared one."""
+        return self._session or get_http_session()
 
     async def get_price(self, symbol: str, currency: str = "usd") -> Optional[float]:
         """
@@ -38,7 +38,7 @@ class AsyncCoinGeckoClient(BaseClient):
         try:
             async with session.get(url, params=params) as response:
                 response.raise_for_status()  # Raise an exception for HTTP errors
-                data = await response.json()
+                data = await response.json(loads=orjson.loads)
                 price = data.get(symbol, {}).get(currency)
                 if price is None:
                     logger.warning(f"Price not found for {symbol} in {currency}")
@@ -110,7 +110,7 @@ class AsyncCoinGeckoClient(BaseClient):
         try:
             async with session.get(url, params=params) as response:
                 response.raise_for_status()
-                data = await response.json()
+                data = await response.json(loads=orjson.loads)
 
                 klines = []
                 # CoinGecko returns prices, market_caps, and total_volumes separately.
@@ -155,8 +155,6 @@ class AsyncCoinGeckoClient(BaseClient):
             return None
 
     async def close(self) -> None:
-        """Closes the aiohttp client session."""
-        if self._session and not self._session.closed:
-            await self._session.close()
-            self._session = None
-            logger.info("CoinGecko client session closed.")
+        """Releases the client; the shared session is closed by clients.http.close_http_session()."""
+        self._session = None
+        logger.info("CoinGecko client released.")
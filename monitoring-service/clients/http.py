@@ -0,0 +1,19 @@
+import aiohttp
+from typing import Optional
+
+# One keep-alive connection pool shared by every market-data client in the process.
+http_session: Optional[aiohttp.ClientSession] = None
+
+def get_http_session() -> aiohttp.ClientSession:
+    global http_session
+    if http_session is None or http_session.closed:
+        http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=100, limit_per_host=32, ttl_dns_cache=300, keepalive_timeout=60)
+        )
+    return http_session
+
+async def close_http_session() -> None:
+    global http_session
+    if http_session and not http_session.closed:
+        await http_session.close()
+    http_session = None
@@ -9,12 +9,23 @@ class Settings:
     def __init__(self) -> None:
         self.POSTGRES_URL = os.getenv("POSTGRES_URL", "")
         self.REDIS_URL = os.getenv("REDIS_URL", "")
+        self.DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+        self.DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "30"))
+        self.DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "10"))
+        # psycopg prepares a query server-side after this many executions; "none" disables it
+        # (required behind PgBouncer in transaction pooling mode)
+        _prepare = os.getenv("DB_PREPARE_THRESHOLD", "5").strip().lower()
+        self.DB_PREPARE_THRESHOLD = None if _prepare in ("", "none") else int(_prepare)
         self.MONITORING_HOST = os.getenv("MONITORING_HOST", "0.0.0.0")
         self.MONITORING_PORT = int(os.getenv("MONITORING_PORT", "9000"))
         self.ENABLE_WEBSOCKETS = os.getenv("ENABLE_WEBSOCKETS", "false").lower() == "true"
         self.ENABLE_SCHEDULER = os.getenv("ENABLE_SCHEDULER", "false").lower() == "true"
         self.SCHEDULER_INTERVAL_SECONDS = int(os.getenv("SCHEDULER_INTERVAL_SECONDS", "5"))
+        self.SCHEDULER_REFRESH_SECONDS = int(os.getenv("SCHEDULER_REFRESH_SECONDS", "60"))
+        self.SCHEDULER_MAX_CONCURRENCY = int(os.getenv("SCHEDULER_MAX_CONCURRENCY", "32"))
+        self.SCHEDULER_BATCH_SIZE = int(os.getenv("SCHEDULER_BATCH_SIZE", "500"))
         self.MONITORING_API_KEY = os.getenv("MONITORING_API_KEY")
+        self.STRATEGY_CACHE_TTL_SECONDS = int(os.getenv("STRATEGY_CACHE_TTL_SECONDS", "30"))
 
 @lru_cache
 def get_settings() -> Settings:
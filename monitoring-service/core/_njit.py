@@ -0,0 +1,15 @@
+"""
+Optional Numba JIT. Without numba installed, `njit(...)` returns functions unchanged.
+"""
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on the environment
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda f: f
+
+__all__ = ["njit", "NUMBA_AVAILABLE"]
@@ -1,10 +1,15 @@
 import asyncio
+import heapq
 import logging
-from typing import Optional, Dict, List
-from datetime import datetime
-from core.strategy_loader import StrategyLoader
-from core.condition_evaluator import ConditionEvaluator, EvaluationContext
-from core.logic_tree_evaluator import LogicTreeEvaluator
+import random
+import time
+import uuid
+from typing import Any, Optional, Dict, List, Tuple
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import insert, update
+from core.strategy_loader import StrategyLoader, as_utc, schedule_interval
+from core.condition_evaluator import ConditionEvaluator, EvaluationContext, Indicator
+from core.logic_tree_evaluator import LogicTreeEvaluator, LogicResult
 from core.data_prefetcher import DataPrefetcher
 from models.strategy_models import Strategy, StrategyTriggerLog
 from config import get_settings
@@ -12,18 +17,30 @@ from config import get_settings
 logger = logging.getLogger(__name__)
 
 class BatchedScheduler:
-    def __init__(self, async_session_local) -> None:
+    def __init__(self, async_session_local, prefetcher: Optional[DataPrefetcher] = None) -> None:
         self._task: Optional[asyncio.Task] = None
         self._running = False
         self.async_session_local = async_session_local
         settings = get_settings()
-        self._prefetcher = DataPrefetcher(redis_url=settings.REDIS_URL)
+        # A prefetcher passed in is shared with the API and closed by its owner, not by stop()
+        self._owns_prefetcher = prefetcher is None
+        self._prefetcher = prefetcher or DataPrefetcher(redis_url=settings.REDIS_URL)
         self.interval = settings.SCHEDULER_INTERVAL_SECONDS
+        self._semaphore = asyncio.Semaphore(settings.SCHEDULER_MAX_CONCURRENCY)
+        self._logic = LogicTreeEvaluator(ConditionEvaluator(self._prefetcher))
+        self._busy = False
+        # Min-heap of (next_run_at, strategy_id) so each tick only touches due strategies
+        self._heap: List[Tuple[datetime, uuid.UUID]] = []
+        self._heap_built_at: Optional[float] = None
+        self._refresh_seconds = settings.SCHEDULER_REFRESH_SECONDS
+        self._batch_size = settings.SCHEDULER_BATCH_SIZE
 
     async def start(self) -> None:
         if self._task is None:
             self._running = True
             await self._prefetcher.connect()
+            # Compile the indicator kernels off the event loop before the first cycle needs them
+            await asyncio.to_thread(Indicator.warm_up)
             logger.info("BatchedScheduler started")
             self._task = asyncio.create_task(self._run())
 
@@ -32,41 +49,154 @@ class BatchedScheduler:
         if self._task:
             self._task.cancel()
             self._task = None
-    
-        await self._prefetcher.close()
+
+        if self._owns_prefetcher:
+            await self._prefetcher.close()
         logger.info("BatchedScheduler stopped")
 
-    async def _run(self) -> None:
+    def invalidate(self) -> None:
+        """
+        Forces the schedule heap to be rebuilt from the database on the next cycle.
+        """
+        self._heap_built_at = None
+
+    async def _rebuild_schedule(self, loader: StrategyLoader, now: datetime) -> None:
+        rows = await loader.load_schedule()
+        self._heap = [
+            ((as_utc(last_run_at) + schedule_interval(schedule)) if last_run_at else now, sid)
+            for sid, schedule, last_run_at in rows
+        ]
+        heapq.heapify(self._heap)
+        self._heap_built_at = time.monotonic()
+        logger.info(f"Schedule rebuilt for {len(self._heap)} active strategies")
+
+    async def _pop_due(self, loader: StrategyLoader, now: datetime) -> List[uuid.UUID]:
+        if self._heap_built_at is None or time.monotonic() - self._heap_built_at >= self._refresh_seconds:
+            await self._rebuild_schedule(loader, now)
+        due: List[uuid.UUID] = []
+        while self._heap and self._heap[0][0] <= now and len(due) < self._batch_size:
+            due.append(heapq.heappop(self._heap)[1])
+        return due
+
+    async def _evaluate(self, logic: LogicTreeEvaluator, strategy: Strategy, ctx: EvaluationContext, include_details: bool) -> LogicResult:
+        async with self._semaphore:
+            return await logic.evaluate(strategy, ctx, include_details=include_details)
+
+    async def run_cycle(self) -> None:
+        """
+        Loads due strategies, evaluates them and persists the results. Overlapping calls are skipped.
+        """
+        if self._busy:
+            logger.warning("Previous scheduler cycle still running; skipping this tick.")
+            return
+        self._busy = True
         try:
-            evaluator = ConditionEvaluator(self._prefetcher)
-            logic = LogicTreeEvaluator(evaluator)
-            while self._running:
-                async with self.async_session_local() as session:
-                    loader = StrategyLoader(session)
-                    strategies: List[Strategy] = await loader.load_active_strategies()
-                    logger.info(f"Scheduler cycle: loaded {len(strategies)} active strategies")
-                    if not strategies:
-                        logger.info("No active strategies found.")
+            async with self.async_session_local() as session:
+                loader = StrategyLoader(session)
+                now = datetime.now(timezone.utc)
+                due_ids = await self._pop_due(loader, now)
+                # Row locks are held until the commit below; rows another worker holds are skipped.
+                loaded: List[Strategy] = await loader.load_strategies_by_ids(due_ids, skip_locked=True)
+                # Skipped ids (locked, or paused/deleted since the heap was built) are retried next tick:
+                # the re-check below then sees the other worker's run, and the next rebuild drops the rest
+                loaded_ids = {s.id for s in loaded}
+                retry_at = now + timedelta(seconds=self.interval)
+                for sid in due_ids:
+                    if sid not in loaded_ids:
+                        heapq.heappush(self._heap, (retry_at, sid))
+                strategies: List[Strategy] = []
+                for s in loaded:
+                    # Another worker may have run it since our heap was built; re-check under the lock
+                    next_at = as_utc(s.last_run_at) + schedule_interval(s.schedule) if s.last_run_at else now
+                    if next_at > now:
+                        heapq.heappush(self._heap, (next_at, s.id))
                     else:
-                        logger.info(f"Processing {len(strategies)} strategies...")
-                    for s in strategies:
-                        ctx = EvaluationContext(self._prefetcher)
-                        res = await logic.evaluate(s, ctx)
-                        s.last_run_at = datetime.utcnow()
-                        logger.info(f"Strategy {s.id} evaluated: met={res.met}, details={res.details}")
-                        if res.met:
-                            s.trigger_count += 1
-                            s.last_triggered_at = datetime.utcnow()
-                            session.add(StrategyTriggerLog(strategy_id=s.id, snapshot=res.details, message=None))
-                            logger.info(f"Trigger logged for strategy {s.id}")
-                        session.add(s)
-                    logger.info("Finished processing strategies for this cycle.")
-                    await session.commit()
-                    logger.info(f"Scheduler cycle committed for {len(strategies)} strategies")
+                        strategies.append(s)
+                logger.info(f"Scheduler cycle: loaded {len(strategies)} due strategies")
+                if not strategies:
+                    logger.info("No strategies due this cycle.")
+                else:
+                    logger.info(f"Processing {len(strategies)} strategies...")
+                reqs = {r for s in strategies for r in self._logic.data_requests(s)}
+                keys = {ConditionEvaluator.request_key(r): r for r in reqs}
+                cache = await self._prefetcher.mget(sorted(keys))
+                logger.debug(f"Prefetched {len(cache)}/{len(keys)} cache keys for this cycle")
+                # One context per cycle: strategies sharing a condition reuse its data and result
+                ctx = EvaluationContext(self._prefetcher, now=now, cache=cache)
+                # Fan out every Redis miss at once instead of letting conditions fetch them one by one
+                missing = [r for k, r in keys.items() if k not in cache]
+                if missing:
+                    prices, klines = await self._prefetcher.prewarm(
+                        {r[1:] for r in missing if r[0] == "price"},
+                        {r[1:] for r in missing if r[0] == "klines"},
+                    )
+                    self._logic.condition_evaluator.prime(ctx, prices, klines)
+                # Non-triggered results only carry their breakdown when someone is reading debug logs
+                include_details = logger.isEnabledFor(logging.DEBUG)
+                results = await asyncio.gather(
+                    *(self._evaluate(self._logic, s, ctx, include_details) for s in strategies),
+                    return_exceptions=True,
+                )
+                run_at = now.replace(tzinfo=None)  # last_run_at/last_triggered_at are stored as naive UTC
+                ran_ids: List[uuid.UUID] = []
+                triggered_ids: List[uuid.UUID] = []
+                pending_logs: List[Dict[str, Any]] = []
+                for s, res in zip(strategies, results):
+                    if isinstance(res, Exception):
+                        logger.error(f"Strategy {s.id} evaluation failed: {res!r}")
+                        heapq.heappush(self._heap, (now, s.id))  # retry next tick
+                        continue
+                    heapq.heappush(self._heap, (now + schedule_interval(s.schedule), s.id))
+                    ran_ids.append(s.id)
+                    logger.info("Strategy %s evaluated: met=%s", s.id, res.met)
+                    logger.debug("Strategy %s details: %s", s.id, res.details)
+                    if res.met:
+                        triggered_ids.append(s.id)
+                        pending_logs.append({"strategy_id": s.id, "snapshot": res.details, "message": None})
+                        logger.info(f"Trigger queued for strategy {s.id}")
+                # Set-based writes: one UPDATE per column set and one multi-row INSERT, whatever the batch size
+                if ran_ids:
+                    await session.execute(
+                        update(Strategy)
+                        .where(Strategy.id.in_(ran_ids))
+                        .values(last_run_at=run_at)
+                        .execution_options(synchronize_session=False)
+                    )
+                if triggered_ids:
+                    await session.execute(
+                        update(Strategy)
+                        .where(Strategy.id.in_(triggered_ids))
+                        .values(trigger_count=Strategy.trigger_count + 1, last_triggered_at=run_at)
+                        .execution_options(synchronize_session=False)
+                    )
+                if pending_logs:
+                    await session.execute(insert(StrategyTriggerLog), pending_logs)
+                    logger.info(f"Inserted {len(pending_logs)} trigger logs")
+                logger.info("Finished processing strategies for this cycle.")
+                await session.commit()
+                logger.info(f"Scheduler cycle committed for {len(strategies)} strategies")
+        except Exception:
+            # The heap may no longer match what was committed; resync from the database next cycle
+            self.invalidate()
+            raise
+        finally:
+            self._busy = False
 
-                await asyncio.sleep(self.interval)
+    async def _run(self) -> None:
+        try:
+            while self._running:
+                started = time.monotonic()
+                try:
+                    await self.run_cycle()
+                except Exception as e:
+                    # run_cycle has invalidated the heap, so the next cycle resyncs from the database
+                    logger.exception("Scheduler cycle failed: %s", e)
+                elapsed = time.monotonic() - started
+                # Sleep only for what is left of the interval, plus up to 10% jitter to spread upstream API load
+                delay = max(0.0, self.interval - elapsed) + random.uniform(0, self.interval * 0.1)
+                if elapsed > self.interval:
+                    logger.warning(f"Scheduler cycle took {elapsed:.2f}s, longer than the {self.interval}s interval")
+                await asyncio.sleep(delay)
                 logger.info("Scheduler resuming cycle.")
         except asyncio.CancelledError:
             logger.info("BatchedScheduler _run task cancelled.")
-        except Exception as e:
-            logger.exception(f"Unhandled exception in BatchedScheduler _run: {e}")
@@ -1,9 +1,14 @@
 from __future__ import annotations
+import asyncio
+import operator
+import orjson
 from dataclasses import dataclass
-from typing import Any, Dict, Optional, List, Tuple
-from datetime import datetime
+from typing import Any, Dict, Optional, List, Sequence, Tuple, Union
+from datetime import datetime, timezone
+import numpy as np
+from core._njit import njit
 from models.strategy_models import StrategyCondition
-from core.data_prefetcher import DataPrefetcher
+from core.data_prefetcher import DataPrefetcher, kline_volume
 
 @dataclass
 class ConditionResult:
@@ -12,55 +17,127 @@ class ConditionResult:
     details: Dict[str, Any] = None
 
 class EvaluationContext:
-    def __init__(self, prefetcher: DataPrefetcher, now: Optional[datetime] = None, prior_state: Optional[Dict[str, Any]] = None):
+    __slots__ = ("prefetcher", "now", "prior_state", "cache", "price_cache", "klines_cache", "indicator_cache")
+
+    def __init__(
+        self,
+        prefetcher: DataPrefetcher,
+        now: Optional[datetime] = None,
+        prior_state: Optional[Dict[str, Any]] = None,
+        cache: Optional[Dict[str, bytes]] = None,
+    ):
         self.prefetcher = prefetcher
-        self.now = now or datetime.utcnow()
+        # the scheduler passes its cycle timestamp so every strategy in a cycle sees the same instant
+        self.now = now or datetime.now(timezone.utc)
         self.prior_state = prior_state or {}
-        self.price_cache: Dict[str, float] = {}
-        self.klines_cache: Dict[str, List[Dict[str, Any]]] = {}
-        self.indicator_cache: Dict[str, Any] = {}
+        # raw Redis values fetched up-front for the whole cycle (see DataPrefetcher.mget)
+        self.cache: Dict[str, bytes] = cache or {}
+        # tuple keys: (asset, currency) and (asset, interval, limit, currency)
+        self.price_cache: Dict[Tuple[str, str], float] = {}
+        # per klines key: {"raw": list of kline dicts, "closes"/"volumes": float64 arrays built once}
+        self.klines_cache: Dict[Tuple[str, str, int, str], Dict[str, Any]] = {}
+        # condition evaluations memoized by (type, canonical payload, currency); a context shared
+        # across concurrently evaluated strategies runs each distinct condition once
+        self.indicator_cache: Dict[Tuple[str, str, str], asyncio.Task] = {}
+
+@njit(cache=True, fastmath=True)
+def _ema_np(arr: np.ndarray, period: int) -> np.ndarray:
+    """
+    Full EMA series in a single pass, seeded with the SMA of the first `period` values.
+    Entries before the seed are NaN.
+    """
+    out = np.full_like(arr, np.nan)
+    if len(arr) < period:
+        return out
+    k = 2 / (period + 1)
+    out[period - 1] = arr[:period].mean()
+    for i in range(period, len(arr)):
+        out[i] = arr[i] * k + out[i - 1] * (1 - k)
+    return out
+
+@njit(cache=True, fastmath=True)
+def _sma_nb(v: np.ndarray, period: int) -> float:
+    total = 0.0
+    for i in range(len(v) - period, len(v)):
+        total += v[i]
+    return total / period
+
+@njit(cache=True, fastmath=True)
+def _ema_nb(v: np.ndarray, period: int) -> float:
+    k = 2 / (period + 1)
+    ema = v[0]
+    for i in range(1, len(v)):
+        ema = v[i] * k + ema * (1 - k)
+    return ema
+
+@njit(cache=True, fastmath=True)
+def _rsi_nb(v: np.ndarray, period: int) -> float:
+    gains = 0.0
+    losses = 0.0
+    for i in range(len(v) - period, len(v)):
+        delta = v[i] - v[i - 1]
+        if delta >= 0:
+            gains += delta
+        else:
+            losses -= delta
+    if losses == 0:
+        return 100.0
+    rs = gains / losses
+    return 100.0 - (100.0 / (1.0 + rs))
+
+@njit(cache=True, fastmath=True)
+def _stddev_nb(v: np.ndarray, period: int) -> float:
+    m = _sma_nb(v, period)
+    var = 0.0
+    for i in range(len(v) - period, len(v)):
+        var += (v[i] - m) ** 2
+    return (var / period) ** 0.5
+
+# Operator dispatch tables for condition comparisons
+_CMP = {"gt": operator.gt, "ge": operator.ge, "lt": operator.lt, "le": operator.le, "eq": operator.eq}
+_CROSS = {
+    "cross_above": lambda prev, curr, threshold: prev <= threshold < curr,
+    "cross_below": lambda prev, curr, threshold: prev >= threshold > curr,
+}
+
+Series = Union[Sequence[float], np.ndarray]
+# ("price", asset, currency) or ("klines", asset, interval, limit, currency)
+DataRequest = Tuple[Any, ...]
 
 class Indicator:
     @staticmethod
-    def sma(values: List[float], period: int) -> Optional[float]:
+    def warm_up() -> None:
+        """
+        Triggers JIT compilation (or loads it from the on-disk cache) so the first real evaluation doesn't pay for it.
+        """
+        dummy = np.linspace(1.0, 2.0, 32)
+        _sma_nb(dummy, 5)
+        _ema_nb(dummy, 5)
+        _rsi_nb(dummy, 5)
+        _stddev_nb(dummy, 5)
+        _ema_np(dummy, 5)
+    @staticmethod
+    def sma(values: Series, period: int) -> Optional[float]:
         if len(values) < period or period <= 0:
             return None
-        return sum(values[-period:]) / period
+        return float(_sma_nb(np.asarray(values, dtype=np.float64), period))
     @staticmethod
-    def ema(values: List[float], period: int) -> Optional[float]:
+    def ema(values: Series, period: int) -> Optional[float]:
         if len(values) < period or period <= 0:
             return None
-        k = 2 / (period + 1)
-        ema = values[0]
-        for v in values[1:]:
-            ema = v * k + ema * (1 - k)
-        return ema
+        return float(_ema_nb(np.asarray(values, dtype=np.float64), period))
     @staticmethod
-    def rsi(values: List[float], period: int) -> Optional[float]:
+    def rsi(values: Series, period: int) -> Optional[float]:
         if len(values) < period + 1 or period <= 0:
             return None
-        gains = 0.0
-        losses = 0.0
-        for i in range(-period, 0):
-            delta = values[i] - values[i - 1]
-            if delta >= 0:
-                gains += delta
-            else:
-                losses -= delta
-        if losses == 0:
-            return 100.0
-        rs = gains / losses
-        return 100.0 - (100.0 / (1.0 + rs))
+        return float(_rsi_nb(np.asarray(values, dtype=np.float64), period))
     @staticmethod
-    def stddev(values: List[float], period: int) -> Optional[float]:
+    def stddev(values: Series, period: int) -> Optional[float]:
         if len(values) < period or period <= 0:
             return None
-        window = values[-period:]
-        m = sum(window) / period
-        var = sum((v - m) ** 2 for v in window) / period
-        return var ** 0.5
+        return float(_stddev_nb(np.asarray(values, dtype=np.float64), period))
     @staticmethod
-    def bollinger(values: List[float], period: int, mult: float) -> Optional[Tuple[float, float, float]]:
+    def bollinger(values: Series, period: int, mult: float) -> Optional[Tuple[float, float, float]]:
         sma = Indicator.sma(values, period)
         if sma is None:
             return None
@@ -71,23 +148,17 @@ class Indicator:
         lower = sma - mult * sd
         return sma, upper, lower
     @staticmethod
-    def macd(values: List[float], fast: int = 12, slow: int = 26, signal: int = 9) -> Optional[Tuple[float, float, float]]:
+    def macd(values: Series, fast: int = 12, slow: int = 26, signal: int = 9) -> Optional[Tuple[float, float, float]]:
         if len(values) < slow + signal or fast <= 0 or slow <= 0 or signal <= 0:
             return None
-        macd_line_series: List[float] = []
-        for i in range(slow, len(values) + 1):
-            slice_vals = values[:i]
-            ema_fast = Indicator.ema(slice_vals, fast)
-            ema_slow = Indicator.ema(slice_vals, slow)
-            if ema_fast is None or ema_slow is None:
-                continue
-            macd_line_series.append(ema_fast - ema_slow)
-        if len(macd_line_series) < signal:
-            return None
-        signal_line = Indicator.ema(macd_line_series, signal)
-        if signal_line is None:
+        closes = np.asarray(values, dtype=np.float64)
+        # Both EMAs are defined from the longer period onwards; MACD is computed over that overlap only
+        start = max(fast, slow) - 1
+        macd_series = _ema_np(closes, fast)[start:] - _ema_np(closes, slow)[start:]
+        if len(macd_series) < signal:
             return None
-        macd_line = macd_line_series[-1]
+        signal_line = float(_ema_np(macd_series, signal)[-1])
+        macd_line = float(macd_series[-1])
         hist = macd_line - signal_line
         return macd_line, signal_line, hist
 
@@ -96,10 +167,16 @@ class ConditionEvaluator:
         self.prefetcher = prefetcher
 
     async def _ensure_price(self, ctx: EvaluationContext, asset: str, currency: str) -> Optional[float]:
-        key = f"{asset}:{currency}"
+        key = (asset, currency)
         if key in ctx.price_cache:
             return ctx.price_cache[key]
-        await self.prefetcher.connect()
+        raw = ctx.cache.get(DataPrefetcher.price_key(asset))
+        if raw is not None:
+            try:
+                ctx.price_cache[key] = float(raw)
+                return ctx.price_cache[key]
+            except (TypeError, ValueError):
+                pass
         prices = await self.prefetcher.get_prices([asset], currency)
         val = prices.get(asset)
         if isinstance(val, (int, float)):
@@ -107,62 +184,147 @@ class ConditionEvaluator:
             return float(val)
         return None
 
-    async def _ensure_klines(self, ctx: EvaluationContext, asset: str, interval: str, limit: int, currency: str) -> Optional[List[Dict[str, Any]]]:
-        key = f"{asset}:{interval}:{limit}:{currency}"
+    def _series_bundle(self, klines: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {"raw": klines, "closes": self._close_series(klines), "volumes": self._volume_series(klines)}
+
+    async def _ensure_klines(self, ctx: EvaluationContext, asset: str, interval: str, limit: int, currency: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the klines bundle for the key, converting to close/volume arrays once per context.
+        """
+        key = (asset, interval, limit, currency)
         if key in ctx.klines_cache:
             return ctx.klines_cache[key]
-        await self.prefetcher.connect()
+        raw = ctx.cache.get(DataPrefetcher.klines_key(asset, interval, limit, currency))
+        if raw is not None:
+            try:
+                ctx.klines_cache[key] = self._series_bundle(orjson.loads(raw))
+                return ctx.klines_cache[key]
+            except orjson.JSONDecodeError:
+                pass
         kl = await self.prefetcher.get_klines(asset, interval, limit, currency)
         if kl is not None:
-            ctx.klines_cache[key] = kl
-            return kl
+            ctx.klines_cache[key] = self._series_bundle(kl)
+            return ctx.klines_cache[key]
+        return None
+
+    def _needed_limit(self, indicator: str, params: Dict[str, Any], op: str) -> Optional[int]:
+        """
+        Smallest number of klines the indicator needs. Cross operators also compute the value as of
+        the previous bar, so they need exactly one bar more.
+        """
+        extra = 1 if op.startswith("cross_") else 0
+        if indicator == "rsi":
+            period = int(params.get("period", 14))
+            return period + 1 + extra
+        if indicator in {"sma", "ema"}:
+            period = int(params.get("period", 20))
+            return max(period + extra, 2)
+        if indicator == "macd":
+            fast = int(params.get("fast", 12))
+            slow = int(params.get("slow", 26))
+            signal = int(params.get("signal", 9))
+            return max(fast, slow) + signal + extra
+        if indicator == "bollinger":
+            return int(params.get("period", 20)) + extra
+        if indicator == "volume":
+            return 1 + extra
+        return None
+
+    def data_request(self, condition: StrategyCondition, currency: str = "usd") -> Optional[DataRequest]:
+        """
+        Returns what market data this condition reads: ("price", asset, currency) or
+        ("klines", asset, interval, limit, currency), or None when it reads nothing.
+        """
+        if not condition.enabled:
+            return None
+        t = (condition.type or "").strip().lower()
+        payload = condition.payload or {}
+        asset = str(payload.get("asset", "")).upper()
+        if not asset:
+            return None
+        if t == "price_alert":
+            return ("price", asset, currency)
+        if t == "technical_indicator":
+            indicator = str(payload.get("indicator", "")).lower()
+            if indicator in {"price", "price_change"}:
+                return ("price", asset, currency)
+            op = str(payload.get("operator", "")).lower()
+            try:
+                limit = self._needed_limit(indicator, payload.get("params") or {}, op)
+            except (TypeError, ValueError):
+                return None
+            if limit is None:
+                return None
+            interval = str(payload.get("timeframe", "1h")).lower()
+            return ("klines", asset, interval, limit, currency)
         return None
 
-    def _close_series(self, klines: List[Dict[str, Any]]) -> List[float]:
-        return [float(k["close"]) for k in klines if "close" in k]
+    @staticmethod
+    def request_key(req: DataRequest) -> str:
+        """
+        Redis cache key for a data request.
+        """
+        if req[0] == "price":
+            return DataPrefetcher.price_key(req[1])
+        return DataPrefetcher.klines_key(*req[1:])
+
+    def prime(
+        self,
+        ctx: EvaluationContext,
+        prices: Dict[Tuple[str, str], Optional[float]],
+        klines: Dict[Tuple[str, str, int, str], Optional[List[Dict[str, Any]]]],
+    ) -> None:
+        """
+        Seeds a context with data prewarmed for the cycle so evaluation doesn't fetch it again.
+        """
+        for key, val in prices.items():
+            if isinstance(val, (int, float)):
+                ctx.price_cache[key] = float(val)
+        for key, kl in klines.items():
+            if kl is not None:
+                ctx.klines_cache[key] = self._series_bundle(kl)
 
-    def _volume_series(self, klines: List[Dict[str, Any]]) -> List[float]:
+    def _close_series(self, klines: List[Dict[str, Any]]) -> np.ndarray:
+        return np.fromiter((float(k["close"]) for k in klines if "close" in k), dtype=np.float64)
+
+    def _volume_series(self, klines: List[Dict[str, Any]]) -> np.ndarray:
+        try:
+            # Fast path: klines from the prefetcher carry a canonical numeric "volume"
+            return np.fromiter((k["volume"] for k in klines), dtype=np.float64, count=len(klines))
+        except (KeyError, TypeError, ValueError):
+            pass
         vals: List[float] = []
         for k in klines:
-            v = k.get("volume")
-            if v is None:
-                v = k.get("vol") or k.get("quote_volume") or k.get("quoteVolume")
-            if v is None:
-                continue
-            try:
-                vals.append(float(v))
-            except Exception:
-                continue
-        return vals
+            v = kline_volume(k)
+            if v is not None:
+                vals.append(v)
+        return np.asarray(vals, dtype=np.float64)
 
     def _compare(self, lhs: Optional[float], op: str, rhs: float) -> bool:
-        if lhs is None:
-            return False
-        if op == "gt":
-            return lhs > rhs
-        if op == "ge":
-            return lhs >= rhs
-        if op == "lt":
-            return lhs < rhs
-        if op == "le":
-            return lhs <= rhs
-        if op == "eq":
-            return lhs == rhs
-        return False
+        f = _CMP.get(op)
+        return False if lhs is None or f is None else f(lhs, rhs)
 
     def _cross(self, prev: Optional[float], curr: Optional[float], direction: str, threshold: float) -> bool:
-        if prev is None or curr is None:
-            return False
-        if direction == "cross_above":
-            return prev <= threshold and curr > threshold
-        if direction == "cross_below":
-            return prev >= threshold and curr < threshold
-        return False
+        f = _CROSS.get(direction)
+        return False if prev is None or curr is None or f is None else f(prev, curr, threshold)
 
     async def evaluate(self, condition: StrategyCondition, ctx: EvaluationContext, currency: str = "usd") -> ConditionResult:
         if not condition.enabled:
             return ConditionResult(met=False, value=None, details={"disabled": True})
         t = (condition.type or "").strip().lower()
+        cache_key = (t, orjson.dumps(condition.payload or {}, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str), currency)
+        task = ctx.indicator_cache.get(cache_key)
+        if task is None:
+            # Store the task, not the result, so concurrent strategies join an evaluation already in flight
+            task = asyncio.ensure_future(self._evaluate(t, condition, ctx, currency))
+            ctx.indicator_cache[cache_key] = task
+            def _forget_failure(done: asyncio.Task) -> None:
+                if done.cancelled() or done.exception() is not None:
+                    ctx.indicator_cache.pop(cache_key, None)
+            task.add_done_callback(_forget_failure)
+        return await asyncio.shield(task)
+
+    async def _evaluate(self, t: str, condition: StrategyCondition, ctx: EvaluationContext, currency: str) -> ConditionResult:
         if t == "price_alert":
             payload = condition.payload or {}
             asset = str(payload.get("asset", "")).upper()
@@ -190,38 +352,22 @@ class ConditionEvaluator:
                 price = await self._ensure_price(ctx, asset, currency)
                 if price is None:
                     return ConditionResult(met=False, value=None, details={"source_unavailable": True})
-                if op in {"gt", "ge", "lt", "le", "eq"}:
+                if op in _CMP:
                     met = self._compare(price, op, float(rhs))
-                elif op in {"cross_above", "cross_below"}:
+                elif op in _CROSS:
                     prev_price: Optional[float] = None
                     met = self._cross(prev_price, price, op, float(rhs))
                 else:
                     return ConditionResult(met=False, value=None, details={"unknown_operator": op})
                 return ConditionResult(met=bool(met), value=price, details={"indicator": "price", "operator": op, "threshold": float(rhs), "asset": asset})
 
-            needed_limit = 0
-            if indicator == "rsi":
-                period = int(params.get("period", 14))
-                needed_limit = period + 1
-            elif indicator in {"sma", "ema"}:
-                period = int(params.get("period", 14))
-                needed_limit = max(period + 1 if op.startswith("cross_") else period, 2)
-            elif indicator == "macd":
-                fast = int(params.get("fast", 12))
-                slow = int(params.get("slow", 26))
-                signal = int(params.get("signal", 9))
-                needed_limit = slow + signal
-            elif indicator == "bollinger":
-                period = int(params.get("period", 20))
-                needed_limit = period
-            elif indicator == "volume":
-                needed_limit = 2 if op.startswith("cross_") else 1
-            else:
+            needed_limit = self._needed_limit(indicator, params, op)
+            if needed_limit is None:
                 return ConditionResult(met=False, value=None, details={"unknown_indicator": indicator})
-            kl = await self._ensure_klines(ctx, asset, interval, needed_limit, currency)
-            if not kl or len(kl) < needed_limit:
+            bundle = await self._ensure_klines(ctx, asset, interval, needed_limit, currency)
+            if not bundle or len(bundle["raw"]) < needed_limit:
                 return ConditionResult(met=False, value=None, details={"insufficient_data": True})
-            closes = self._close_series(kl)
+            closes = bundle["closes"]  # float64 array; closes[:-1] below is a view, not a copy
             val: Optional[float] = None
             prev_val: Optional[float] = None
             if indicator == "rsi":
@@ -274,13 +420,13 @@ class ConditionEvaluator:
                         else:
                             prev_val = bb_prev[0]
             elif indicator == "volume":
-                vols = self._volume_series(kl)
-                val = vols[-1] if vols else None
+                vols = bundle["volumes"]
+                val = float(vols[-1]) if len(vols) else None
                 if op.startswith("cross_"):
-                    prev_val = vols[-2] if len(vols) >= 2 else None
-            if op in {"gt", "ge", "lt", "le", "eq"}:
+                    prev_val = float(vols[-2]) if len(vols) >= 2 else None
+            if op in _CMP:
                 met = self._compare(val, op, float(rhs))
-            elif op in {"cross_above", "cross_below"}:
+            elif op in _CROSS:
                 met = self._cross(prev_val, val, op, float(rhs))
             else:
                 return ConditionResult(met=False, value=None, details={"unknown_operator": op})
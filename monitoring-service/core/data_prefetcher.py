@@ -1,32 +1,80 @@
 import asyncio
-from typing import Dict, List, Optional, Any
-import aioredis
-import json
+import time
+from typing import Awaitable, Callable, Dict, List, Mapping, Optional, Any, Set, Tuple, Union
+from redis import asyncio as aioredis
+import orjson
 import logging
 from clients.async_binance import AsyncBinanceClient
 from clients.async_coingecko import AsyncCoinGeckoClient
 
 logger = logging.getLogger(__name__)
 
+# Volume field names seen across kline sources, in priority order
+VOLUME_KEYS = ("volume", "vol", "quote_volume", "quoteVolume")
+
+def kline_volume(kline: Dict[str, Any]) -> Optional[float]:
+    """
+    Returns the first usable volume field of a kline as a float, or None.
+    """
+    for key in VOLUME_KEYS:
+        v = kline.get(key)
+        if v is None:
+            continue
+        try:
+            return float(v)
+        except (TypeError, ValueError):
+            return None
+    return None
+
+def normalize_klines(klines: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Gives every kline a canonical float "volume" (or None) so readers can skip the fallback keys.
+    """
+    for k in klines:
+        v = k.get("volume")
+        if not isinstance(v, float):
+            k["volume"] = kline_volume(k)
+    return klines
+
 class DataPrefetcher:
+    # In-process L1 entries never outlive this, whatever the Redis TTL, to keep values fresh
+    L1_MAX_TTL_SECONDS = 5.0
+    # Expired L1 entries are swept once a store grows past this many keys
+    L1_SWEEP_SIZE = 1024
+
     def __init__(self, redis_url: Optional[str] = None) -> None:
         self._redis_url = redis_url
-        self._pool: Optional[aioredis.ConnectionPool] = None
+        self._redis: Optional[aioredis.Redis] = None
+        self._ready = False
         self._binance: Optional[AsyncBinanceClient] = None
         self._coingecko: Optional[AsyncCoinGeckoClient] = None
+        # L1 caches in front of Redis, keyed like Redis: key -> (expires_at, value)
+        self._l1_prices: Dict[str, Tuple[float, float]] = {}
+        self._l1_klines: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+        # upstream fetches in flight, keyed by "price:{asset}:{currency}" or the klines cache key
+        self._inflight: Dict[str, asyncio.Task] = {}
 
     async def connect(self) -> None:
-        if self._redis_url and self._pool is None:
-            self._pool = aioredis.ConnectionPool.from_url(self._redis_url)
+        """
+        Opens the Redis client and upstream API clients. Called once by the owner (app startup or scheduler);
+        evaluation code assumes a connected prefetcher.
+        """
+        if self._ready:
+            return
+        if self._redis_url and self._redis is None:
+            # One long-lived client; it owns its connection pool and closes it in aclose()
+            self._redis = aioredis.Redis.from_url(self._redis_url, max_connections=32, decode_responses=False)
         if self._binance is None:
             self._binance = AsyncBinanceClient()
         if self._coingecko is None:
             self._coingecko = AsyncCoinGeckoClient()
+        self._ready = True
 
     async def close(self) -> None:
-        if self._pool:
-            await self._pool.disconnect()
-            self._pool = None
+        self._ready = False
+        if self._redis:
+            await self._redis.aclose()
+            self._redis = None
         if self._binance:
             await self._binance.close()
             self._binance = None
@@ -34,42 +82,160 @@ class DataPrefetcher:
             await self._coingecko.close()
             self._coingecko = None
 
+    @staticmethod
+    def _l1_get(store: Dict[str, Tuple[float, Any]], key: str) -> Any:
+        hit = store.get(key)
+        if hit is None:
+            return None
+        if hit[0] > time.monotonic():
+            return hit[1]
+        del store[key]
+        return None
+
+    def _l1_put(self, store: Dict[str, Tuple[float, Any]], key: str, value: Any, ttl_seconds: float) -> None:
+        now = time.monotonic()
+        if len(store) >= self.L1_SWEEP_SIZE:
+            # Keys that are never read again would otherwise stay forever
+            for k in [k for k, (expires_at, _) in store.items() if expires_at <= now]:
+                del store[k]
+        store[key] = (now + min(ttl_seconds, self.L1_MAX_TTL_SECONDS), value)
+
+    async def _coalesce(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Joins an in-flight upstream fetch for key, or starts one, so concurrent callers share a single request.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    @staticmethod
+    def price_key(asset: str) -> str:
+        return f"prices:{asset}"
+
+    @staticmethod
+    def klines_key(symbol: str, interval: str, limit: int, currency: str = "usd") -> str:
+        return f"klines:{symbol}:{interval}:{limit}:{currency}"
+
+    async def mget(self, keys: List[str]) -> Dict[str, bytes]:
+        """
+        Fetches many cache keys in a single Redis round-trip. Missing keys are omitted from the result.
+        """
+        redis = self._redis
+        if redis is None or not keys:
+            return {}
+        values = await redis.mget(keys)
+        return {k: v for k, v in zip(keys, values) if v is not None}
+
+    async def mset(self, kv: Mapping[str, Union[str, bytes]], ex: int) -> None:
+        """
+        Writes many cache keys with a shared TTL through one non-transactional pipeline, i.e. a single round-trip.
+        """
+        redis = self._redis
+        if redis is None or not kv:
+            return
+        async with redis.pipeline(transaction=False) as pipe:
+            for k, v in kv.items():
+                pipe.set(k, v, ex=ex)
+            await pipe.execute()
+
     async def get_prices(self, assets: List[str], currency: str = "usd", ttl_seconds: int = 30) -> Dict[str, Optional[float]]:
         result: Dict[str, Optional[float]] = {}
-        redis: Optional[aioredis.Redis] = None
-        if self._pool:
-            redis = aioredis.Redis(connection_pool=self._pool)
+        pending: List[str] = []
         for a in assets:
-            key = f"prices:{a}"
+            result[a] = self._l1_get(self._l1_prices, self.price_key(a))
+            if result[a] is None:
+                pending.append(a)
+        if not pending:
+            return result
+
+        redis = self._redis
+        keys = [self.price_key(a) for a in pending]
+        # One MGET for every asset instead of a GET per asset
+        raws = await redis.mget(keys) if redis else [None] * len(keys)
+        missing: List[str] = []
+        for a, key, raw in zip(pending, keys, raws):
             val: Optional[float] = None
-            if redis:
-                logger.debug(f"Checking cache for {key}")
-                raw = await redis.get(key)
-                if raw is not None:
-                    try:
-                        val = float(raw)
-                        logger.debug(f"Cache hit for {key}: {val}")
-                    except Exception:
-                        logger.warning(f"Cached value for {key} is not a float")
-                        val = None
+            if raw is not None:
+                try:
+                    val = float(raw)
+                    logger.debug(f"Cache hit for {key}: {val}")
+                    self._l1_put(self._l1_prices, key, val, ttl_seconds)
+                except Exception:
+                    logger.warning(f"Cached value for {key} is not a float")
+                    val = None
             if val is None:
-                fetched = await self.fetch_price(a, currency)
-                if fetched is not None:
-                    val = fetched
-                    if redis:
-                        await redis.setex(key, ttl_seconds, str(fetched))
-                        logger.debug(f"Caching price for {key} with TTL {ttl_seconds}")
-                else:
-                    logger.debug(f"No price fetched for {a}")
+                missing.append(a)
             result[a] = val
+
+        if missing:
+            # One failing upstream call must not discard the prices fetched for the other assets
+            fetched = await asyncio.gather(
+                *(self.fetch_price(a, currency) for a in missing),
+                return_exceptions=True,
+            )
+            to_cache: Dict[str, str] = {}
+            for a, val in zip(missing, fetched):
+                if isinstance(val, Exception):
+                    logger.warning(f"Price fetch for {a} failed: {val!r}")
+                    continue
+                if val is None:
+                    logger.debug(f"No price fetched for {a}")
+                    continue
+                result[a] = val
+                self._l1_put(self._l1_prices, self.price_key(a), val, ttl_seconds)
+                to_cache[self.price_key(a)] = str(val)
+            if to_cache:
+                logger.debug(f"Caching {len(to_cache)} prices with TTL {ttl_seconds}")
+                await self.mset(to_cache, ttl_seconds)
         return result
 
+    async def prewarm(
+        self,
+        price_reqs: Set[Tuple[str, str]],
+        kline_reqs: Set[Tuple[str, str, int, str]],
+    ) -> Tuple[Dict[Tuple[str, str], Optional[float]], Dict[Tuple[str, str, int, str], Optional[List[Dict[str, Any]]]]]:
+        """
+        Fetches every (asset, currency) price and (asset, interval, limit, currency) klines set concurrently,
+        warming L1/Redis on the way. Failed requests are logged and left out of the result.
+        """
+        by_currency: Dict[str, List[str]] = {}
+        for asset, currency in price_reqs:
+            by_currency.setdefault(currency, []).append(asset)
+        kline_list = list(kline_reqs)
+        results = await asyncio.gather(
+            *(self.get_prices(assets, currency) for currency, assets in by_currency.items()),
+            *(self.get_klines(symbol, interval, limit, currency) for symbol, interval, limit, currency in kline_list),
+            return_exceptions=True,
+        )
+        prices: Dict[Tuple[str, str], Optional[float]] = {}
+        for currency, res in zip(by_currency, results):
+            if isinstance(res, Exception):
+                logger.warning(f"Prewarming {currency} prices failed: {res!r}")
+                continue
+            for asset, val in res.items():
+                prices[(asset, currency)] = val
+        klines: Dict[Tuple[str, str, int, str], Optional[List[Dict[str, Any]]]] = {}
+        for req, res in zip(kline_list, results[len(by_currency):]):
+            if isinstance(res, Exception):
+                logger.warning(f"Prewarming klines {req} failed: {res!r}")
+                continue
+            klines[req] = res
+        return prices, klines
+
     async def set_price(self, asset: str, price: float, ttl_seconds: int = 30) -> None:
-        if self._pool:
-            async with aioredis.Redis(connection_pool=self._pool) as redis:
-                await redis.setex(f"prices:{asset}", ttl_seconds, str(price))
+        self._l1_put(self._l1_prices, self.price_key(asset), price, ttl_seconds)
+        await self.mset({self.price_key(asset): str(price)}, ttl_seconds)
 
     async def fetch_price(self, asset: str, currency: str = "usd") -> Optional[float]:
+        """
+        Fetches a price upstream; concurrent calls for the same asset and currency share one request.
+        """
+        return await self._coalesce(f"price:{asset}:{currency}", lambda: self._fetch_price(asset, currency))
+
+    async def _fetch_price(self, asset: str, currency: str) -> Optional[float]:
         val: Optional[float] = None
         if self._binance:
             val = await self._binance.get_price(asset, currency)
@@ -78,21 +244,33 @@ class DataPrefetcher:
         return val
 
     async def get_klines(self, symbol: str, interval: str, limit: int, currency: str = "usd", ttl_seconds: int = 60) -> Optional[List[Dict[str, Any]]]:
-        key = f"klines:{symbol}:{interval}:{limit}:{currency}"
+        key = self.klines_key(symbol, interval, limit, currency)
         logger.debug(f"Attempting to get klines for {key}")
-        redis: Optional[aioredis.Redis] = None
-        if self._pool:
-            redis = aioredis.Redis(connection_pool=self._pool)
+        hit = self._l1_get(self._l1_klines, key)
+        if hit is not None:
+            return hit
+        redis = self._redis
 
         if redis:
             cached_klines_raw = await redis.get(key)
             if cached_klines_raw:
                 try:
                     logger.debug(f"Klines found in cache for {key}")
-                    return json.loads(cached_klines_raw)
-                except json.JSONDecodeError:
+                    klines = orjson.loads(cached_klines_raw)
+                    self._l1_put(self._l1_klines, key, klines, ttl_seconds)
+                    return klines
+                except orjson.JSONDecodeError:
                     logger.warning(f"Failed to decode cached klines for {key}. Attempting to refetch.")
 
+        klines = await self._coalesce(key, lambda: self._fetch_klines(key, symbol, interval, limit, currency))
+        if klines:
+            self._l1_put(self._l1_klines, key, klines, ttl_seconds)
+            if redis:
+                logger.debug(f"Caching klines for {key} with TTL {ttl_seconds}s.")
+                await self.mset({key: orjson.dumps(klines)}, ttl_seconds)
+        return klines
+
+    async def _fetch_klines(self, key: str, symbol: str, interval: str, limit: int, currency: str) -> Optional[List[Dict[str, Any]]]:
         klines: Optional[List[Dict[str, Any]]] = None
         if self._binance:
             logger.debug(f"Fetching klines from Binance for {key}")
@@ -110,9 +288,4 @@ class DataPrefetcher:
                 logger.info(f"Fetched {len(klines)} klines from CoinGecko for {symbol} (price/volume only).")
             else:
                 logger.debug(f"No klines fetched from CoinGecko for {symbol}.")
-
-        if klines and redis:
-            logger.debug(f"Caching klines for {key} with TTL {ttl_seconds}s.")
-            await redis.setex(key, ttl_seconds, json.dumps(klines))
-        
-        return klines
\ No newline at end of file
+        return normalize_klines(klines) if klines else klines
\ No newline at end of file
@@ -1,49 +1,104 @@
 from __future__ import annotations
+import orjson
 from dataclasses import dataclass
-from typing import Any, Dict, Optional, List
+from typing import Any, Dict, Optional, List, Tuple
 from models.strategy_models import Strategy, StrategyCondition
-from core.condition_evaluator import ConditionEvaluator, EvaluationContext, ConditionResult
+from core.condition_evaluator import ConditionEvaluator, EvaluationContext, ConditionResult, DataRequest
 
 @dataclass
 class LogicResult:
     met: bool
     details: Dict[str, Any]
 
+# Opcodes of a compiled logic tree node: (opcode, arg). REF's arg is an index into the
+# strategy's interned refs; AND/OR's arg is a tuple of child nodes.
+OP_AND, OP_OR, OP_REF, OP_FALSE = 0, 1, 2, 3
+
+CompiledNode = Tuple[int, Any]
+
+def compile_logic_tree(tree: Dict[str, Any]) -> Tuple[CompiledNode, List[str]]:
+    """
+    Compiles a logic tree dict into nested (opcode, arg) tuples plus the list of condition refs it uses.
+    """
+    refs: List[str] = []
+    index: Dict[str, int] = {}
+    def compile_node(node: Dict[str, Any]) -> CompiledNode:
+        if "ref" in node:
+            ref = str(node["ref"])
+            if ref not in index:
+                index[ref] = len(refs)
+                refs.append(ref)
+            return (OP_REF, index[ref])
+        op = str(node.get("operator", "")).upper()
+        children = tuple(compile_node(c) for c in node.get("conditions") or [])
+        if op == "AND":
+            return (OP_AND, children)
+        if op == "OR":
+            return (OP_OR, children)
+        return (OP_FALSE, None)
+    return compile_node(tree), refs
+
 class LogicTreeEvaluator:
     def __init__(self, condition_evaluator: ConditionEvaluator):
         self.condition_evaluator = condition_evaluator
+        # strategy id -> (tree hash, compiled root, refs); recompiled when the tree changes
+        self._compiled: Dict[str, Tuple[int, CompiledNode, List[str]]] = {}
+
+    def _compile(self, strategy: Strategy) -> Tuple[CompiledNode, List[str]]:
+        tree = strategy.logic_tree or {}
+        h = hash(orjson.dumps(tree, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str))
+        key = str(strategy.id)
+        entry = self._compiled.get(key)
+        if entry is None or entry[0] != h:
+            root, refs = compile_logic_tree(tree)
+            entry = (h, root, refs)
+            self._compiled[key] = entry
+        return entry[1], entry[2]
+
+    def data_requests(self, strategy: Strategy, currency: str = "usd") -> List[DataRequest]:
+        reqs: List[DataRequest] = []
+        for c in strategy.conditions:
+            req = self.condition_evaluator.data_request(c, currency)
+            if req is not None:
+                reqs.append(req)
+        return reqs
 
-    async def evaluate(self, strategy: Strategy, ctx: EvaluationContext, currency: str = "usd") -> LogicResult:
+    async def evaluate(
+        self, strategy: Strategy, ctx: EvaluationContext, currency: str = "usd", include_details: bool = True
+    ) -> LogicResult:
+        """
+        Evaluates the strategy's logic tree. With include_details=False the per-condition breakdown
+        is only built when the strategy is met, since that is when it gets persisted.
+        """
+        root, refs = self._compile(strategy)
         cond_map: Dict[str, StrategyCondition] = {str(c.id): c for c in strategy.conditions if c.enabled}
-        cache: Dict[str, ConditionResult] = {}
-        async def eval_node(node: Dict[str, Any]) -> bool:
-            if "ref" in node:
-                ref = str(node["ref"])
-                if ref in cache:
-                    return cache[ref].met
-                cond = cond_map.get(ref)
+        conds: List[Optional[StrategyCondition]] = [cond_map.get(r) for r in refs]
+        cache: Dict[int, ConditionResult] = {}
+        async def eval_node(node: CompiledNode) -> bool:
+            op, arg = node
+            if op == OP_REF:
+                if arg in cache:
+                    return cache[arg].met
+                cond = conds[arg]
                 if not cond:
-                    cache[ref] = ConditionResult(met=False, value=None, details={"missing_condition": True})
+                    cache[arg] = ConditionResult(met=False, value=None, details={"missing_condition": True})
                     return False
                 res = await self.condition_evaluator.evaluate(cond, ctx, currency)
-                cache[ref] = res
+                cache[arg] = res
                 return res.met
-            op = str(node.get("operator", "")).upper()
-            children = node.get("conditions") or []
-            if op == "AND":
-                for child in children:
+            if op == OP_AND:
+                for child in arg:
                     if not await eval_node(child):
                         return False
                 return True
-            if op == "OR":
-                for child in children:
+            if op == OP_OR:
+                for child in arg:
                     if await eval_node(child):
                         return True
                 return False
             return False
-        met = await eval_node(strategy.logic_tree or {})
-        details = {
-            "met": met,
-            "evaluated": {k: {"met": v.met, "value": v.value, "details": v.details} for k, v in cache.items()}
-        }
-        return LogicResult(met=met, details=details)
\ No newline at end of file
+        met = await eval_node(root)
+        details: Dict[str, Any] = {"met": met}
+        if include_details or met:
+            details["evaluated"] = {refs[i]: {"met": v.met, "value": v.value, "details": v.details} for i, v in cache.items()}
+        return LogicResult(met=met, details=details)
@@ -1,11 +1,57 @@
-from typing import List
+import uuid
+from typing import List, Optional, Tuple
 from datetime import datetime, timedelta, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import Integer, case, cast, func, literal, or_, select
 from sqlalchemy.orm import selectinload
+from sqlalchemy.sql.elements import ColumnElement
 
 from models.strategy_models import Strategy, StrategyCondition, StrategyStatus
 
+
+def schedule_interval(schedule: Optional[str]) -> timedelta:
+    """
+    Parses interval-based schedules (e.g., "1m", "5m", "1h"). Event-driven strategies are not
+    time-scheduled and run every cycle (zero interval).
+    """
+    if schedule == "event":
+        return timedelta(0)
+    if schedule and schedule.endswith("m"):
+        return timedelta(minutes=int(schedule[:-1]))
+    if schedule and schedule.endswith("h"):
+        return timedelta(hours=int(schedule[:-1]))
+    # Default to 1 minute if schedule is not recognized or is cron-like (not yet implemented)
+    return timedelta(minutes=1)
+
+
+def as_utc(value: datetime) -> datetime:
+    """
+    Returns an aware UTC datetime; naive values are stored as UTC by the scheduler.
+    """
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+# SQL mirror of schedule_interval() so the database can decide which strategies are due
+_SCHEDULE_INTERVAL_SQL = case(
+    (Strategy.schedule == "event", literal(timedelta(0))),
+    (Strategy.schedule.op("~")("^[0-9]+m$"), func.make_interval(0, 0, 0, 0, 0, cast(func.rtrim(Strategy.schedule, "m"), Integer))),
+    (Strategy.schedule.op("~")("^[0-9]+h$"), func.make_interval(0, 0, 0, 0, cast(func.rtrim(Strategy.schedule, "h"), Integer))),
+    else_=literal(timedelta(minutes=1)),
+)
+
+
+def due_clause() -> ColumnElement[bool]:
+    """
+    True for strategies that never ran or whose schedule interval has elapsed. last_run_at is naive UTC.
+    """
+    return or_(
+        Strategy.last_run_at.is_(None),
+        Strategy.last_run_at + _SCHEDULE_INTERVAL_SQL <= func.timezone("UTC", func.now()),
+    )
+
+
 class StrategyLoader:
     def __init__(self, db_session: AsyncSession):
         self.db_session = db_session
@@ -16,37 +62,38 @@ class StrategyLoader:
         """
         result = await self.db_session.execute(
             select(Strategy)
+            .where(Strategy.status == StrategyStatus.active, due_clause())
+            .options(selectinload(Strategy.conditions))
+        )
+        return list(result.scalars().all())
+
+    async def load_schedule(self) -> List[Tuple[uuid.UUID, str, Optional[datetime]]]:
+        """
+        Loads (id, schedule, last_run_at) for every active strategy, without conditions.
+        """
+        result = await self.db_session.execute(
+            select(Strategy.id, Strategy.schedule, Strategy.last_run_at)
             .where(Strategy.status == StrategyStatus.active)
+        )
+        return [tuple(row) for row in result.all()]
+
+    async def load_strategies_by_ids(self, strategy_ids: List[uuid.UUID], skip_locked: bool = False) -> List[Strategy]:
+        """
+        Loads the given strategies if they are still active, eagerly loading their conditions.
+        With skip_locked, the rows are locked until the session's transaction ends and rows already
+        locked by another scheduler worker are skipped, so concurrent workers never run the same strategy.
+        """
+        if not strategy_ids:
+            return []
+        stmt = (
+            select(Strategy)
+            .where(Strategy.id.in_(strategy_ids), Strategy.status == StrategyStatus.active)
             .options(selectinload(Strategy.conditions))
         )
-        all_active_strategies = result.scalars().all()
-
-        strategies_due_to_run = []
-        now = datetime.now(timezone.utc)
-
-        for strategy in all_active_strategies:
-            if strategy.schedule == "event": # Event-driven strategies are not time-scheduled
-                strategies_due_to_run.append(strategy)
-                continue
-
-            # Parse interval-based schedules (e.g., "1m", "5m", "1h")
-            if strategy.schedule.endswith("m"):
-                interval_minutes = int(strategy.schedule[:-1])
-                interval = timedelta(minutes=interval_minutes)
-            elif strategy.schedule.endswith("h"):
-                interval_hours = int(strategy.schedule[:-1])
-                interval = timedelta(hours=interval_hours)
-            else:
-                # Default to 1 minute if schedule is not recognized or is cron-like (not yet implemented)
-                interval = timedelta(minutes=1)
-
-            # Ensure last_run_at is timezone-aware if it exists
-            last_run_at_aware = strategy.last_run_at.astimezone(timezone.utc) if strategy.last_run_at else None
-
-            if last_run_at_aware is None or (now - last_run_at_aware) >= interval:
-                strategies_due_to_run.append(strategy)
-
-        return strategies_due_to_run
+        if skip_locked:
+            stmt = stmt.with_for_update(skip_locked=True, of=Strategy)
+        result = await self.db_session.execute(stmt)
+        return list(result.scalars().all())
 
     async def load_strategy_by_id(self, strategy_id: str) -> Strategy | None:
         """
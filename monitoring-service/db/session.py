@@ -1,10 +1,21 @@
+"""
+Async SQLAlchemy engine and session factory for the monitoring service.
+
+Server-side prepared statements are enabled: psycopg prepares a query after DB_PREPARE_THRESHOLD
+executions and keeps up to 100 per connection (its default prepared_max, an LRU). Named prepared
+statements live on a server connection, so connect directly to Postgres or through PgBouncer in
+pool_mode=session. Behind PgBouncer in transaction mode set DB_PREPARE_THRESHOLD=none, otherwise
+queries fail with InvalidSqlStatementName.
+"""
 from typing import AsyncGenerator
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy import text
+from config import get_settings
 
 
 engine = None
 AsyncSessionLocal = None
+_engine_url = None
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
@@ -16,37 +27,38 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
 async def test_db_connection(postgres_url: str) -> None:
     """
     Initializes the SQLAlchemy async engine and tests the connection.
-    
-    The engine configuration includes fixes for the 'prepared statement does not exist' error.
     """
-    global engine, AsyncSessionLocal
+    global engine, AsyncSessionLocal, _engine_url
     try:
-        url = postgres_url
-        
-        # Standardize URL for use with psycopg (async driver)
-        if url.startswith("postgres://"):
-            url = url.replace("postgres://", "postgresql+psycopg://", 1)
-        elif url.startswith("postgresql+asyncpg://"):
-            url = url.replace("postgresql+asyncpg://", "postgresql+psycopg://", 1)
-        elif url.startswith("postgresql://"):
-            url = url.replace("postgresql://", "postgresql+psycopg://", 1)
-        
-        # --- FIXES FOR InvalidSqlStatementName ARE APPLIED HERE ---
-        # 1. pool_recycle: Ensures connections are recycled periodically.
-        # 2. connect_args: Specifically disables prepared statements 
-        #    to prevent PgBouncer/connection reset issues.
-        engine = create_async_engine(
-            url, 
-            pool_pre_ping=True, 
-            pool_recycle=1800,  # Recycle connections every 30 minutes (1800 seconds)
-            connect_args={
-                "prepare_threshold": None  # Disables prepared statements (solves psycopg.errors.InvalidSqlStatementName)
-            }
-        )
-        # --- END OF FIXES  ---
-        # Testing new deployment
-        AsyncSessionLocal = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
-        
+        # Reuse the engine (and its warm pool) if it was already built for this URL
+        if engine is None or _engine_url != postgres_url:
+            settings = get_settings()
+            url = postgres_url
+
+            # Standardize URL for use with psycopg (async driver)
+            if url.startswith("postgres://"):
+                url = url.replace("postgres://", "postgresql+psycopg://", 1)
+            elif url.startswith("postgresql+asyncpg://"):
+                url = url.replace("postgresql+asyncpg://", "postgresql+psycopg://", 1)
+            elif url.startswith("postgresql://"):
+                url = url.replace("postgresql://", "postgresql+psycopg://", 1)
+
+            engine = create_async_engine(
+                url,
+                pool_size=settings.DB_POOL_SIZE,
+                max_overflow=settings.DB_MAX_OVERFLOW,
+                pool_timeout=settings.DB_POOL_TIMEOUT,
+                pool_use_lifo=True,  # reuse the most recently returned (warm) connections first
+                pool_pre_ping=True,
+                pool_recycle=1800,  # Recycle connections every 30 minutes (1800 seconds)
+                connect_args={
+                    # None disables prepared statements (see module docstring for PgBouncer)
+                    "prepare_threshold": settings.DB_PREPARE_THRESHOLD
+                }
+            )
+            _engine_url = postgres_url
+            AsyncSessionLocal = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+
         # Test connection
         async with engine.connect() as connection:
             await connection.execute(text("SELECT 1"))
@@ -58,6 +70,8 @@ async def close_db_connection() -> None:
     """
     Disposes of the database engine and closes all pooled connections.
     """
-    global engine
+    global engine, _engine_url
     if engine:
-        await engine.dispose()
\ No newline at end of file
+        await engine.dispose()
+        engine = None
+        _engine_url = None
\ No newline at end of file
@@ -9,7 +9,7 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from db.session import AsyncSessionLocal, engine, test_db_connection, close_db_connection
-import aioredis
+from redis import asyncio as aioredis
 import os
 
 # Load environment variables for testing
@@ -21,7 +21,7 @@ def event_loop():
     """
     Creates a session-scoped event loop for async tests.
     """
-    loop = asyncio.get_event_loop_policy().new_event_loop()
+    loop = asyncio.new_event_loop()
     yield loop
     loop.close()
 
@@ -57,31 +57,28 @@ async def db_session() -> AsyncGenerator[AsyncSession, None]:
 @pytest.fixture(scope="session")
 async def setup_redis_for_tests(event_loop):
     """
-    Sets up the Redis connection pool for all tests in the session.
+    Sets up one Redis client (and its connection pool) shared by all tests in the session.
     """
     redis_url = os.getenv("REDIS_URL")
     if not redis_url:
         raise ValueError("REDIS_URL environment variable not set for testing.")
     
-    pool = aioredis.ConnectionPool.from_url(redis_url)
-    redis = aioredis.Redis(connection_pool=pool)
+    redis = aioredis.Redis.from_url(redis_url, decode_responses=True)
     
     # Clear Redis before tests to ensure a clean state
     await redis.flushdb()
     
-    yield pool
+    yield redis
     
-    # Close Redis connection pool after tests
-    await pool.disconnect()
+    # Close the client and its connection pool after tests
+    await redis.aclose()
 
 @pytest.fixture
 async def redis_client(setup_redis_for_tests) -> AsyncGenerator[aioredis.Redis, None]:
     """
-    Provides a Redis client instance for each test.
+    Provides the shared Redis client to each test; pooled connections stay open between tests.
     """
-    pool = setup_redis_for_tests
-    redis = aioredis.Redis(connection_pool=pool)
+    redis = setup_redis_for_tests
     yield redis
     # Clean up any keys set by the test
     await redis.flushdb()
-    await redis.close()
\ No newline at end of file
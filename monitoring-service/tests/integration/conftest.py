@@ -0,0 +1,24 @@
+import os
+
+import pytest
+
+from clients.http import close_http_session, get_http_session
+
+
+def pytest_collection_modifyitems(config, items):
+    # These tests call the live Binance/CoinGecko APIs; opt in with RUN_INTEGRATION_TESTS=1
+    if os.getenv("RUN_INTEGRATION_TESTS"):
+        return
+    skip = pytest.mark.skip(reason="set RUN_INTEGRATION_TESTS=1 to run live API tests")
+    for item in items:
+        if "integration" in item.nodeid:
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope="module")
+async def http_session():
+    """
+    One keep-alive aiohttp session per module, so every request after the first reuses its TCP/TLS connection.
+    """
+    yield get_http_session()
+    await close_http_session()
@@ -1,12 +1,20 @@
-import asyncio
+import pytest
+
 from clients.async_binance import AsyncBinanceClient
 
-async def main():
-    client = AsyncBinanceClient()
-    # Binance expects symbol like 'BTCUSDT'
+
+@pytest.fixture(scope="module")
+def client(http_session):
+    return AsyncBinanceClient(session=http_session)
+
+
+async def test_get_klines(client):
+    # Binance expects symbol like 'BTCUSDT'; the client maps BTC + usd to it
     klines = await client.get_klines("BTC", "1h", 5)
-    print("BTC/USDT 1h klines:", klines)
-    await client.close()
+    assert klines and len(klines) == 5
+    assert {"open", "high", "low", "close", "volume"} <= klines[0].keys()
+
 
-if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+async def test_get_price(client):
+    price = await client.get_price("BTC", "usd")
+    assert price is not None and price > 0
@@ -1,16 +1,18 @@
-import asyncio
+import pytest
+
 from clients.async_coingecko import AsyncCoinGeckoClient
 
-async def main():
-    client = AsyncCoinGeckoClient()
+
+@pytest.fixture(scope="module")
+def client(http_session):
+    return AsyncCoinGeckoClient(session=http_session)
+
+
+async def test_get_price(client):
     price = await client.get_price("bitcoin", "usd")
-    print("bitcoin usd price:", price)
-    
-    # Test klines as well
-    klines = await client.get_klines("bitcoin", "1d", limit=7, currency="usd")
-    print(f"CoinGecko Bitcoin 1d klines (last 7): {klines}")
+    assert price is not None and price > 0
 
-    await client.close()
 
-if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+async def test_get_klines(client):
+    klines = await client.get_klines("bitcoin", "1d", limit=7, currency="usd")
+    assert klines
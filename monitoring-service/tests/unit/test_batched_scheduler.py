@@ -0,0 +1,188 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from core import batched_scheduler
+from core.batched_scheduler import BatchedScheduler
+from core.logic_tree_evaluator import LogicResult
+from models.strategy_models import Strategy, StrategyStatus
+from test_evaluators import FakePrefetcher
+
+NOW = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+class FixedDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return NOW
+
+
+class CyclePrefetcher(FakePrefetcher):
+    async def mget(self, keys):
+        return {}
+
+
+class FakeSession:
+    def __init__(self):
+        self.executed = []
+        self.commits = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+    async def execute(self, statement, params=None):
+        self.executed.append(statement)
+
+    async def commit(self):
+        self.commits += 1
+
+
+class FakeLoader:
+    """Stands in for StrategyLoader over a dict of strategies; records which ids were loaded."""
+    strategies = {}
+    loaded_ids = []
+
+    def __init__(self, session):
+        pass
+
+    async def load_schedule(self):
+        return [(s.id, s.schedule, s.last_run_at) for s in self.strategies.values()]
+
+    async def load_strategies_by_ids(self, strategy_ids, skip_locked=False):
+        FakeLoader.loaded_ids.append(list(strategy_ids))
+        return [self.strategies[sid] for sid in strategy_ids if sid in self.strategies]
+
+
+class FakeLogic:
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.evaluated = []
+
+    def data_requests(self, strategy):
+        return []
+
+    async def evaluate(self, strategy, ctx, include_details=False):
+        self.evaluated.append(strategy.id)
+        if strategy.id in self.failing:
+            raise RuntimeError("data source down")
+        return LogicResult(met=False, details={})
+
+
+def make_strategy(last_run_at=None, schedule="5m"):
+    return Strategy(
+        id=uuid.uuid4(), name="t", status=StrategyStatus.active, logic_tree={"ref": "c1"},
+        conditions=[], schedule=schedule, last_run_at=last_run_at,
+    )
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    monkeypatch.setattr(batched_scheduler, "datetime", FixedDatetime)
+    monkeypatch.setattr(batched_scheduler, "StrategyLoader", FakeLoader)
+    FakeLoader.strategies = {}
+    FakeLoader.loaded_ids = []
+    session = FakeSession()
+    sched = BatchedScheduler(lambda: session, prefetcher=CyclePrefetcher())
+    sched._logic = FakeLogic()
+    sched.session = session
+    return sched
+
+
+def heap_times(sched):
+    return {sid: at for at, sid in sched._heap}
+
+
+async def test_pop_due_returns_only_due_ids_up_to_the_batch_size(scheduler):
+    due = [make_strategy(last_run_at=NOW - timedelta(minutes=10)) for _ in range(3)]
+    never_run = make_strategy()
+    not_due = make_strategy(last_run_at=NOW - timedelta(minutes=1))
+    FakeLoader.strategies = {s.id: s for s in due + [never_run, not_due]}
+    scheduler._batch_size = 3
+
+    popped = await scheduler._pop_due(FakeLoader(None), NOW)
+
+    assert len(popped) == 3
+    assert not_due.id not in popped
+    remaining = await scheduler._pop_due(FakeLoader(None), NOW)
+    assert len(remaining) == 1 and remaining[0] != not_due.id
+    assert heap_times(scheduler) == {not_due.id: NOW + timedelta(minutes=4)}
+
+
+async def test_cycle_requeues_by_outcome(scheduler):
+    ok, failing = make_strategy(), make_strategy()
+    FakeLoader.strategies = {ok.id: ok, failing.id: failing}
+    scheduler._logic = FakeLogic(failing=[failing.id])
+
+    await scheduler.run_cycle()
+
+    assert sorted(scheduler._logic.evaluated) == sorted([ok.id, failing.id])
+    # Failures are retried on the next tick; successes wait for their schedule interval
+    assert heap_times(scheduler) == {ok.id: NOW + timedelta(minutes=5), failing.id: NOW}
+    assert scheduler.session.commits == 1
+
+
+async def test_overlapping_cycles_are_skipped(scheduler):
+    strategy = make_strategy()
+    FakeLoader.strategies = {strategy.id: strategy}
+    release = asyncio.Event()
+    evaluate = scheduler._logic.evaluate
+
+    async def slow_evaluate(*args, **kwargs):
+        await release.wait()
+        return await evaluate(*args, **kwargs)
+
+    scheduler._logic.evaluate = slow_evaluate
+    first = asyncio.ensure_future(scheduler.run_cycle())
+    await asyncio.sleep(0)
+    await scheduler.run_cycle()
+    release.set()
+    await first
+
+    assert FakeLoader.loaded_ids == [[strategy.id]]
+    assert scheduler._logic.evaluated == [strategy.id]
+
+
+async def test_failed_cycle_invalidates_the_schedule(scheduler):
+    strategy = make_strategy()
+    FakeLoader.strategies = {strategy.id: strategy}
+
+    async def broken_mget(keys):
+        raise ConnectionError("redis down")
+
+    scheduler._prefetcher.mget = broken_mget
+    with pytest.raises(ConnectionError):
+        await scheduler.run_cycle()
+    assert scheduler._heap_built_at is None
+    assert scheduler._busy is False
+
+
+async def test_strategy_already_run_by_another_worker_is_requeued_not_evaluated(scheduler):
+    strategy = make_strategy()
+    FakeLoader.strategies = {strategy.id: strategy}
+    await scheduler._rebuild_schedule(FakeLoader(None), NOW)
+    # Another worker ran it after our heap was built; the row we lock carries its last_run_at
+    strategy.last_run_at = NOW - timedelta(minutes=1)
+
+    await scheduler.run_cycle()
+
+    assert scheduler._logic.evaluated == []
+    assert heap_times(scheduler) == {strategy.id: NOW + timedelta(minutes=4)}
+    assert scheduler.session.executed == []
+
+
+async def test_locked_or_inactive_ids_are_retried_next_tick(scheduler):
+    locked = make_strategy()
+    FakeLoader.strategies = {locked.id: locked}
+    await scheduler._rebuild_schedule(FakeLoader(None), NOW)
+    # skip_locked leaves out rows another worker holds, as well as paused or deleted ones
+    FakeLoader.strategies = {}
+
+    await scheduler.run_cycle()
+
+    assert scheduler._logic.evaluated == []
+    assert heap_times(scheduler) == {locked.id: NOW + timedelta(seconds=scheduler.interval)}
@@ -1,3 +1,5 @@
+import asyncio
+import numpy as np
 import pytest
 import uuid
 from typing import List, Dict, Any
@@ -65,4 +67,193 @@ async def test_logic_and_combination():
     ctx = EvaluationContext(prefetcher=FakePrefetcher())
     logic = LogicTreeEvaluator(evaluator)
     res = await logic.evaluate(s, ctx)
-    assert res.met is False
\ No newline at end of file
+    assert res.met is False
+
+@pytest.mark.asyncio
+async def test_cycle_cache_hit_skips_prefetcher():
+    cond = StrategyCondition(
+        id=uuid.uuid4(),
+        type="price_alert",
+        payload={"asset": "BTC", "direction": "below", "target_price": 90.0},
+        enabled=True,
+    )
+    s = Strategy(id=uuid.uuid4(), name="t", status=StrategyStatus.active, logic_tree={"ref": str(cond.id)}, conditions=[cond])
+    evaluator = ConditionEvaluator(FakePrefetcher())
+    logic = LogicTreeEvaluator(evaluator)
+    assert [ConditionEvaluator.request_key(r) for r in logic.data_requests(s)] == ["prices:BTC"]
+    ctx = EvaluationContext(prefetcher=FakePrefetcher(), cache={"prices:BTC": b"80.0"})
+    res = await logic.evaluate(s, ctx)
+    assert res.met is True
+
+def test_macd_matches_sma_seeded_reference():
+    from core.condition_evaluator import Indicator
+
+    def ema_series(vals, period):
+        k = 2 / (period + 1)
+        out = [sum(vals[:period]) / period]
+        for v in vals[period:]:
+            out.append(v * k + out[-1] * (1 - k))
+        return out
+
+    closes = [100 + ((i * 37) % 11) - i * 0.5 for i in range(60)]
+    fast = ema_series(closes, 12)[26 - 12:]
+    slow = ema_series(closes, 26)
+    macd_line = [f - s for f, s in zip(fast, slow)]
+    signal_line = ema_series(macd_line, 9)[-1]
+
+    m, sig, hist = Indicator.macd(closes, 12, 26, 9)
+    assert m == pytest.approx(macd_line[-1])
+    assert sig == pytest.approx(signal_line)
+    assert hist == pytest.approx(macd_line[-1] - signal_line)
+    assert Indicator.macd(closes[:30], 12, 26, 9) is None
+
+@pytest.mark.asyncio
+async def test_shared_context_memoizes_identical_conditions():
+    class CountingPrefetcher(FakePrefetcher):
+        calls = 0
+        async def get_prices(self, assets, currency="usd"):
+            CountingPrefetcher.calls += 1
+            return await super().get_prices(assets, currency)
+
+    pref = CountingPrefetcher()
+    payload = {"asset": "BTC", "direction": "above", "target_price": 90.0}
+    logic = LogicTreeEvaluator(ConditionEvaluator(pref))
+    ctx = EvaluationContext(prefetcher=pref)
+    for _ in range(3):
+        cond = StrategyCondition(id=uuid.uuid4(), type="price_alert", payload=dict(reversed(payload.items())), enabled=True)
+        s = Strategy(id=uuid.uuid4(), name="t", status=StrategyStatus.active, logic_tree={"ref": str(cond.id)}, conditions=[cond])
+        res = await logic.evaluate(s, ctx)
+        assert res.met is True
+    assert CountingPrefetcher.calls == 1
+    assert len(ctx.indicator_cache) == 1
+
+@pytest.mark.asyncio
+async def test_concurrent_strategies_join_in_flight_condition():
+    class SlowPrefetcher(FakePrefetcher):
+        calls = 0
+        async def get_prices(self, assets, currency="usd"):
+            SlowPrefetcher.calls += 1
+            await asyncio.sleep(0.01)
+            return await super().get_prices(assets, currency)
+
+    pref = SlowPrefetcher()
+    logic = LogicTreeEvaluator(ConditionEvaluator(pref))
+    ctx = EvaluationContext(prefetcher=pref)
+    strategies = []
+    for _ in range(5):
+        cond = StrategyCondition(id=uuid.uuid4(), type="price_alert", payload={"asset": "BTC", "direction": "below", "target_price": 90.0}, enabled=True)
+        strategies.append(Strategy(id=uuid.uuid4(), name="t", status=StrategyStatus.active, logic_tree={"ref": str(cond.id)}, conditions=[cond]))
+
+    results = await asyncio.gather(*(logic.evaluate(s, ctx) for s in strategies))
+
+    assert [r.met for r in results] == [False] * 5
+    assert SlowPrefetcher.calls == 1
+
+def test_compile_logic_tree_interns_refs():
+    from core.logic_tree_evaluator import compile_logic_tree, OP_AND, OP_OR, OP_REF, OP_FALSE
+
+    tree = {"operator": "and", "conditions": [{"ref": "a"}, {"operator": "OR", "conditions": [{"ref": "b"}, {"ref": "a"}]}, {"operator": "xor"}]}
+    root, refs = compile_logic_tree(tree)
+
+    assert refs == ["a", "b"]
+    assert root == (OP_AND, ((OP_REF, 0), (OP_OR, ((OP_REF, 1), (OP_REF, 0))), (OP_FALSE, None)))
+
+@pytest.mark.asyncio
+async def test_logic_tree_recompiled_when_tree_changes():
+    c1 = StrategyCondition(id=uuid.uuid4(), type="price_alert", payload={"asset": "BTC", "direction": "above", "target_price": 90.0}, enabled=True)
+    c2 = StrategyCondition(id=uuid.uuid4(), type="price_alert", payload={"asset": "BTC", "direction": "below", "target_price": 90.0}, enabled=True)
+    s = Strategy(id=uuid.uuid4(), name="t", status=StrategyStatus.active, logic_tree={"ref": str(c1.id)}, conditions=[c1, c2])
+    logic = LogicTreeEvaluator(ConditionEvaluator(FakePrefetcher()))
+
+    assert (await logic.evaluate(s, EvaluationContext(prefetcher=FakePrefetcher()))).met is True
+    s.logic_tree = {"ref": str(c2.id)}
+    assert (await logic.evaluate(s, EvaluationContext(prefetcher=FakePrefetcher()))).met is False
+
+@pytest.mark.asyncio
+async def test_klines_converted_to_arrays_once_per_context():
+    pref = FakePrefetcher()
+    evaluator = ConditionEvaluator(pref)
+    ctx = EvaluationContext(prefetcher=pref)
+
+    first = await evaluator._ensure_klines(ctx, "BTC", "1h", 20, "usd")
+    second = await evaluator._ensure_klines(ctx, "BTC", "1h", 20, "usd")
+
+    assert first is second
+    assert first["closes"].dtype == np.float64
+    assert first["closes"].tolist() == [float(100 - i) for i in range(20)]
+    assert first["volumes"].tolist() == [1.0] * 20
+
+@pytest.mark.asyncio
+async def test_ema_depends_only_on_the_window():
+    from core.condition_evaluator import Indicator
+
+    cond = StrategyCondition(
+        id=uuid.uuid4(),
+        type="technical_indicator",
+        payload={"indicator": "ema", "params": {"period": 5}, "operator": "cross_above", "value": 90.0, "asset": "BTC", "timeframe": "1h"},
+        enabled=True,
+    )
+    evaluator = ConditionEvaluator(FakePrefetcher())
+    first = await evaluator.evaluate(cond, EvaluationContext(prefetcher=FakePrefetcher()))
+    # A long-lived evaluator (the scheduler's) gives the same answer as a fresh one (the API's)
+    again = await evaluator.evaluate(cond, EvaluationContext(prefetcher=FakePrefetcher()))
+    fresh = await ConditionEvaluator(FakePrefetcher()).evaluate(cond, EvaluationContext(prefetcher=FakePrefetcher()))
+
+    closes = [float(100 - i) for i in range(6)]
+    assert first.value == pytest.approx(Indicator.ema(closes, 5))
+    assert again.value == first.value == fresh.value
+
+def test_compare_and_cross_dispatch():
+    evaluator = ConditionEvaluator(FakePrefetcher())
+    assert evaluator._compare(2.0, "ge", 2.0) is True
+    assert evaluator._compare(None, "gt", 1.0) is False
+    assert evaluator._compare(2.0, "between", 1.0) is False
+    assert evaluator._cross(1.0, 3.0, "cross_above", 2.0) is True
+    assert evaluator._cross(3.0, 1.0, "cross_above", 2.0) is False
+    assert evaluator._cross(3.0, 1.0, "cross_below", 2.0) is True
+    assert evaluator._cross(None, 1.0, "cross_below", 2.0) is False
+
+@pytest.mark.asyncio
+async def test_details_skipped_for_unmet_when_not_requested():
+    cond = StrategyCondition(id=uuid.uuid4(), type="price_alert", payload={"asset": "BTC", "direction": "below", "target_price": 90.0}, enabled=True)
+    s = Strategy(id=uuid.uuid4(), name="t", status=StrategyStatus.active, logic_tree={"ref": str(cond.id)}, conditions=[cond])
+    logic = LogicTreeEvaluator(ConditionEvaluator(FakePrefetcher()))
+
+    res = await logic.evaluate(s, EvaluationContext(prefetcher=FakePrefetcher()), include_details=False)
+
+    assert res.met is False
+    assert res.details == {"met": False}
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("indicator,params", [
+    ("rsi", {"period": 14}),
+    ("sma", {}),
+    ("macd", {}),
+    ("bollinger", {"period": 20}),
+])
+async def test_cross_operators_get_enough_bars_for_previous_value(indicator, params):
+    cond = StrategyCondition(
+        id=uuid.uuid4(),
+        type="technical_indicator",
+        payload={"indicator": indicator, "params": params, "operator": "cross_above", "value": 1e9, "asset": "BTC", "timeframe": "1h"},
+        enabled=True,
+    )
+    evaluator = ConditionEvaluator(FakePrefetcher())
+    captured = {}
+    original = evaluator._cross
+    def spy(prev, curr, direction, threshold):
+        captured["prev"] = prev
+        return original(prev, curr, direction, threshold)
+    evaluator._cross = spy
+
+    res = await evaluator.evaluate(cond, EvaluationContext(prefetcher=FakePrefetcher()))
+
+    assert res.details.get("insufficient_data") is None
+    assert captured["prev"] is not None
+
+def test_volume_series_falls_back_to_alternate_keys():
+    evaluator = ConditionEvaluator(FakePrefetcher())
+    klines = [{"close": 1.0, "volume": 5.0}, {"close": 1.0, "vol": "6"}, {"close": 1.0, "quoteVolume": 7}, {"close": 1.0}]
+
+    assert evaluator._volume_series(klines).tolist() == [5.0, 6.0, 7.0]
+    assert evaluator._volume_series([{"volume": 1.0}, {"volume": 2.0}]).tolist() == [1.0, 2.0]
@@ -1,35 +1,53 @@
+import asyncio
 import pytest
 from unittest.mock import AsyncMock
-import json
-import aioredis
+import orjson
 
 from core.data_prefetcher import DataPrefetcher
 
-class DummyPool:
-    async def disconnect(self):
-        pass
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+    async def __aenter__(self):
+        return self
+    async def __aexit__(self, *exc):
+        self.commands.clear()
+    def set(self, key, value, ex=None):
+        self.commands.append((key, ex, value))
+        return self
+    async def execute(self):
+        self.redis.pipeline_executions += 1
+        for key, ex, value in self.commands:
+            await self.redis.setex(key, ex, value)
+        results = [True] * len(self.commands)
+        self.commands = []
+        return results
 
 class FakeRedis:
     def __init__(self):
         self.cache = {}
         self.setex_calls = []
+        self.pipeline_executions = 0
+        self.mget_calls = 0
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
     async def get(self, key):
         return self.cache.get(key)
+    async def mget(self, keys):
+        self.mget_calls += 1
+        return [self.cache.get(k) for k in keys]
     async def setex(self, key, ttl, value):
         self.cache[key] = value
         self.setex_calls.append((key, ttl, value))
     async def flushdb(self):
         self.cache.clear()
-    async def close(self):
+    async def aclose(self):
         pass
 
 @pytest.fixture
-def fake_redis(monkeypatch):
-    instance = FakeRedis()
-    def factory(*args, **kwargs):
-        return instance
-    monkeypatch.setattr(aioredis, 'Redis', factory)
-    return instance
+def fake_redis():
+    return FakeRedis()
 
 @pytest.fixture
 def mock_binance_client():
@@ -50,7 +68,7 @@ async def prefetcher_with_mocks(mock_binance_client, mock_coingecko_client, fake
     p = DataPrefetcher(redis_url="redis://localhost:6379")
     p._binance = mock_binance_client
     p._coingecko = mock_coingecko_client
-    p._pool = DummyPool()
+    p._redis = fake_redis
     yield p
     await p.close()
 
@@ -58,7 +76,7 @@ async def prefetcher_with_mocks(mock_binance_client, mock_coingecko_client, fake
 async def test_get_klines_from_redis_cache(prefetcher_with_mocks, fake_redis):
     mock_klines = [{"timestamp": 1, "open": 1.0, "high": 2.0, "low": 0.5, "close": 1.5, "volume": 10.0}]
     key = "klines:BTC:1h:5:usd"
-    fake_redis.cache[key] = json.dumps(mock_klines)
+    fake_redis.cache[key] = orjson.dumps(mock_klines)
 
     result = await prefetcher_with_mocks.get_klines("BTC", "1h", 5, "usd")
 
@@ -79,7 +97,7 @@ async def test_get_klines_from_binance_and_cache(prefetcher_with_mocks, fake_red
 
     key = "klines:BTC:1h:5:usd"
     assert key in fake_redis.cache
-    assert json.loads(fake_redis.cache[key]) == mock_klines
+    assert orjson.loads(fake_redis.cache[key]) == mock_klines
     assert fake_redis.setex_calls[0][1] == 60
 
 @pytest.mark.asyncio
@@ -96,7 +114,7 @@ async def test_get_klines_from_coingecko_fallback_and_cache(prefetcher_with_mock
 
     key = "klines:ETH:1h:5:usd"
     assert key in fake_redis.cache
-    assert json.loads(fake_redis.cache[key]) == mock_klines_coingecko
+    assert orjson.loads(fake_redis.cache[key]) == mock_klines_coingecko
     assert fake_redis.setex_calls[0][1] == 60
 
 @pytest.mark.asyncio
@@ -121,6 +139,7 @@ async def test_get_prices_from_redis_cache(prefetcher_with_mocks, fake_redis):
     result = await prefetcher_with_mocks.get_prices(["BTC", "ETH"], "usd")
 
     assert result == {"BTC": 100.0, "ETH": 200.0}
+    assert fake_redis.mget_calls == 1
     prefetcher_with_mocks._binance.get_price.assert_not_called()
     prefetcher_with_mocks._coingecko.get_price.assert_not_called()
 
@@ -142,6 +161,7 @@ async def test_get_prices_fetch_and_cache(prefetcher_with_mocks, fake_redis):
     assert fake_redis.cache[key_btc] == "150.0"
     assert fake_redis.cache[key_eth] == "250.0"
     assert fake_redis.setex_calls[0][1] == 30
+    assert fake_redis.pipeline_executions == 1
 
 @pytest.mark.asyncio
 async def test_get_prices_coingecko_fallback(prefetcher_with_mocks, fake_redis):
@@ -175,3 +195,110 @@ async def test_get_prices_no_data_found(prefetcher_with_mocks, fake_redis):
     prefetcher_with_mocks._binance.get_price.assert_called_once_with("BTC", "usd")
     prefetcher_with_mocks._coingecko.get_price.assert_called_once_with("BTC", "usd")
     assert fake_redis.setex_calls == []
+
+@pytest.mark.asyncio
+async def test_get_prices_failed_fetch_keeps_other_assets(prefetcher_with_mocks, fake_redis):
+    prefetcher_with_mocks._binance.get_price.side_effect = [RuntimeError("boom"), 250.0]
+
+    result = await prefetcher_with_mocks.get_prices(["BTC", "ETH"], "usd")
+
+    assert result == {"BTC": None, "ETH": 250.0}
+    assert "prices:BTC" not in fake_redis.cache
+    assert fake_redis.cache["prices:ETH"] == "250.0"
+
+@pytest.mark.asyncio
+async def test_mget_returns_only_present_keys(prefetcher_with_mocks, fake_redis):
+    fake_redis.cache["prices:BTC"] = "100.0"
+
+    result = await prefetcher_with_mocks.mget(["prices:BTC", "prices:ETH"])
+
+    assert result == {"prices:BTC": "100.0"}
+
+
+@pytest.mark.asyncio
+async def test_mset_writes_all_keys_in_one_pipeline(prefetcher_with_mocks, fake_redis):
+    await prefetcher_with_mocks.mset({"prices:BTC": "1.0", "prices:ETH": "2.0"}, ex=15)
+
+    assert fake_redis.pipeline_executions == 1
+    assert fake_redis.setex_calls == [("prices:BTC", 15, "1.0"), ("prices:ETH", 15, "2.0")]
+
+@pytest.mark.asyncio
+async def test_get_prices_fetches_only_cache_misses(prefetcher_with_mocks, fake_redis):
+    fake_redis.cache["prices:BTC"] = "100.0"
+    prefetcher_with_mocks._binance.get_price.return_value = 250.0
+
+    result = await prefetcher_with_mocks.get_prices(["BTC", "ETH"], "usd")
+
+    assert result == {"BTC": 100.0, "ETH": 250.0}
+    prefetcher_with_mocks._binance.get_price.assert_called_once_with("ETH", "usd")
+    assert fake_redis.setex_calls == [("prices:ETH", 30, "250.0")]
+
+@pytest.mark.asyncio
+async def test_get_prices_served_from_l1_without_redis(prefetcher_with_mocks, fake_redis):
+    prefetcher_with_mocks._binance.get_price.return_value = 150.0
+    await prefetcher_with_mocks.get_prices(["BTC"], "usd")
+    fake_redis.cache.clear()
+
+    result = await prefetcher_with_mocks.get_prices(["BTC"], "usd")
+
+    assert result == {"BTC": 150.0}
+    prefetcher_with_mocks._binance.get_price.assert_called_once_with("BTC", "usd")
+
+@pytest.mark.asyncio
+async def test_concurrent_get_prices_share_one_fetch(prefetcher_with_mocks, fake_redis):
+    release = asyncio.Event()
+
+    async def slow_price(asset, currency):
+        await release.wait()
+        return 42.0
+    prefetcher_with_mocks._binance.get_price.side_effect = slow_price
+
+    first = asyncio.create_task(prefetcher_with_mocks.get_prices(["BTC"], "usd"))
+    second = asyncio.create_task(prefetcher_with_mocks.get_prices(["BTC"], "usd"))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await first == {"BTC": 42.0}
+    assert await second == {"BTC": 42.0}
+    assert prefetcher_with_mocks._binance.get_price.call_count == 1
+
+@pytest.mark.asyncio
+async def test_prewarm_fetches_prices_and_klines_together(prefetcher_with_mocks, fake_redis):
+    mock_klines = [{"timestamp": 1, "open": 1.0, "high": 2.0, "low": 0.5, "close": 1.5, "volume": 10.0}]
+    prefetcher_with_mocks._binance.get_price.return_value = 150.0
+    prefetcher_with_mocks._binance.get_klines.return_value = mock_klines
+
+    prices, klines = await prefetcher_with_mocks.prewarm({("BTC", "usd"), ("ETH", "usd")}, {("BTC", "1h", 1, "usd")})
+
+    assert prices == {("BTC", "usd"): 150.0, ("ETH", "usd"): 150.0}
+    assert klines == {("BTC", "1h", 1, "usd"): mock_klines}
+    assert "klines:BTC:1h:1:usd" in fake_redis.cache
+
+@pytest.mark.asyncio
+async def test_fetch_price_coalesces_per_currency(prefetcher_with_mocks):
+    release = asyncio.Event()
+
+    async def slow_price(asset, currency):
+        await release.wait()
+        return 1.0 if currency == "usd" else 2.0
+    prefetcher_with_mocks._binance.get_price.side_effect = slow_price
+
+    tasks = [
+        asyncio.create_task(prefetcher_with_mocks.fetch_price("BTC", "usd")),
+        asyncio.create_task(prefetcher_with_mocks.fetch_price("BTC", "usd")),
+        asyncio.create_task(prefetcher_with_mocks.fetch_price("BTC", "eur")),
+    ]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*tasks) == [1.0, 1.0, 2.0]
+    assert prefetcher_with_mocks._binance.get_price.call_count == 2
+
+def test_l1_put_sweeps_expired_entries_when_full(monkeypatch):
+    p = DataPrefetcher()
+    monkeypatch.setattr(DataPrefetcher, "L1_SWEEP_SIZE", 2)
+    store = {"old": (0.0, 1.0), "live": (float("inf"), 2.0)}
+
+    p._l1_put(store, "new", 3.0, 30)
+
+    assert set(store) == {"live", "new"}
@@ -0,0 +1,34 @@
+from datetime import datetime, timedelta, timezone
+
+from core.strategy_loader import as_utc, schedule_interval
+
+
+def test_schedule_interval_parses_minutes_and_hours():
+    assert schedule_interval("5m") == timedelta(minutes=5)
+    assert schedule_interval("2h") == timedelta(hours=2)
+
+
+def test_schedule_interval_event_runs_every_cycle():
+    assert schedule_interval("event") == timedelta(0)
+
+
+def test_schedule_interval_defaults_to_one_minute():
+    assert schedule_interval("0 * * * *") == timedelta(minutes=1)
+    assert schedule_interval(None) == timedelta(minutes=1)
+
+
+def test_as_utc_treats_naive_values_as_utc():
+    naive = datetime(2025, 1, 1, 12, 0)
+    assert as_utc(naive) == datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+    aware = datetime(2025, 1, 1, 14, 0, tzinfo=timezone(timedelta(hours=2)))
+    assert as_utc(aware) == datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def test_due_clause_compiles_for_postgres():
+    from sqlalchemy.dialects import postgresql
+    from core.strategy_loader import due_clause
+
+    sql = str(due_clause().compile(dialect=postgresql.dialect()))
+
+    assert "strategies.last_run_at IS NULL" in sql
+    assert "make_interval" in sql
@@ -0,0 +1,76 @@
+import pytest
+from pydantic import ValidationError
+
+from models.strategy_models import (
+    ConditionCreate,
+    NotificationCooldown,
+    NotificationPreferences,
+    PriceAlertPayload,
+    TechnicalIndicatorPayload,
+    check_logic_tree,
+)
+
+
+def test_condition_payload_dispatches_on_type():
+    c = ConditionCreate(type="price_alert", payload={"asset": "BTC", "direction": "above", "target_price": 1})
+    assert isinstance(c.payload, PriceAlertPayload)
+    c = ConditionCreate(
+        type="technical_indicator",
+        payload={"indicator": "rsi", "operator": "lt", "value": 30, "asset": "BTC", "timeframe": "1h"},
+    )
+    assert isinstance(c.payload, TechnicalIndicatorPayload)
+
+
+def test_condition_payload_keeps_already_built_model():
+    payload = PriceAlertPayload(asset="BTC", direction="below", target_price=1)
+    c = ConditionCreate(type="price_alert", payload=payload)
+    assert c.payload.target_price == 1
+    with pytest.raises(ValidationError):
+        ConditionCreate(type="volume_alert", payload=payload)
+
+
+def test_condition_payload_tag_is_not_dumped():
+    c = ConditionCreate(type="price_alert", payload={"asset": "BTC", "direction": "above", "target_price": 1})
+    assert c.payload.model_dump() == {"asset": "BTC", "direction": "above", "target_price": 1.0}
+    assert c.model_dump()["payload"] == {"asset": "BTC", "direction": "above", "target_price": 1.0}
+
+
+def test_condition_payload_rejects_unknown_type_and_bad_timeframe():
+    with pytest.raises(ValidationError, match="Unknown condition type"):
+        ConditionCreate(type="wallet_inflow", payload={})
+    with pytest.raises(ValidationError, match="timeframe must be one of"):
+        ConditionCreate(type="volume_alert", payload={"asset": "BTC", "timeframe": "2h", "operator": "gt", "threshold": 1})
+
+
+def test_cooldown_duration():
+    assert NotificationCooldown(duration="10m").duration == "10m"
+    assert NotificationCooldown(duration="").duration == ""
+    with pytest.raises(ValidationError):
+        NotificationCooldown(duration="10 minutes")
+
+
+def test_notification_preferences_defaults_are_independent_copies():
+    a, b = NotificationPreferences(), NotificationPreferences()
+    assert a.alert_on.trigger is True and a.alert_on.reset is False
+    assert a.cooldown.enabled is False and a.cooldown.duration is None
+    a.alert_on.reset = True
+    assert b.alert_on.reset is False
+
+
+def test_check_logic_tree_accepts_nested_groups():
+    check_logic_tree({"operator": "AND", "conditions": [{"ref": "c1"}, {"operator": "OR", "conditions": [{"ref": "c2"}]}]})
+
+
+def test_check_logic_tree_rejects_bad_nodes():
+    with pytest.raises(ValueError, match="operator must be one of"):
+        check_logic_tree({"operator": "XOR", "conditions": [{"ref": "c1"}]})
+    with pytest.raises(ValueError, match="non-empty string"):
+        check_logic_tree({"operator": "AND", "conditions": [{"ref": " "}]})
+
+
+def test_check_logic_tree_caps_depth_without_recursing():
+    tree = {"ref": "c1"}
+    for _ in range(5000):
+        tree = {"operator": "AND", "conditions": [tree]}
+    with pytest.raises(ValueError, match="nested at most"):
+        check_logic_tree(tree)
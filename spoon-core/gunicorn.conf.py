@@ -0,0 +1,19 @@
+# gunicorn.conf.py - process manager settings for the agent server
+# Usage: gunicorn spoon_ai.agents.run_agent_server:app -c gunicorn.conf.py
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8765')}"
+# I/O-bound workers: two per core unless WEB_CONCURRENCY says otherwise
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2))
+# UvicornWorker picks uvloop and httptools when they are installed
+worker_class = "uvicorn.workers.UvicornWorker"
+# Import the app once in the master so workers share its modules copy-on-write.
+# The agent itself is still built per worker in the lifespan handler.
+preload_app = True
+# Access log lines only when ACCESS_LOG=1
+accesslog = "-" if os.getenv("ACCESS_LOG", "0") == "1" else None
+# LLM calls can take a while; don't let gunicorn kill a worker mid-request
+timeout = 120
+graceful_timeout = 30
+keepalive = 5
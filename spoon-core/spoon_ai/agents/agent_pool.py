@@ -0,0 +1,80 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Generic, List, Optional, Sequence, TypeVar
+
+from spoon_ai.agents.base import BaseAgent
+
+logger = logging.getLogger(__name__)
+
+AgentT = TypeVar("AgentT", bound=BaseAgent)
+
+
+class AgentPool(Generic[AgentT]):
+    """
+    A fixed set of agents handed out one run at a time.
+
+    An agent keeps per-run state (memory, current step, IDLE/RUNNING), so it can only serve one
+    request at a time; concurrent requests each check out their own agent from the pool.
+    """
+
+    def __init__(self, agents: Sequence[AgentT]):
+        if not agents:
+            raise ValueError("AgentPool needs at least one agent")
+        self.agents: List[AgentT] = list(agents)
+        self._idle: asyncio.Queue = asyncio.Queue()
+        for agent in self.agents:
+            self._idle.put_nowait(agent)
+
+    @property
+    def size(self) -> int:
+        return len(self.agents)
+
+    @property
+    def in_use(self) -> int:
+        return self.size - self._idle.qsize()
+
+    @asynccontextmanager
+    async def acquire(self, timeout: Optional[float] = None) -> AsyncIterator[AgentT]:
+        """
+        Check out an idle agent for one run, waiting up to `timeout` seconds (None waits as long as it takes).
+        Raises asyncio.TimeoutError when no agent frees up in time.
+        """
+        agent = await self.checkout(timeout)
+        try:
+            yield agent
+        finally:
+            self.release(agent)
+
+    def release(self, agent: AgentT, after: Optional[asyncio.Future] = None) -> None:
+        """
+        Return an agent taken with checkout() to the pool. `after` is a run still unwinding on the
+        agent (e.g. cancelled when its client went away); the agent only goes back once it finishes.
+        """
+        if after is not None and not after.done():
+            after.add_done_callback(lambda _: self.release(agent))
+            return
+        # Progress items nobody consumed must not show up in the next run's stream
+        while not agent.output_queue.empty():
+            agent.output_queue.get_nowait()
+        self._idle.put_nowait(agent)
+
+    async def checkout(self, timeout: Optional[float] = None) -> AgentT:
+        """Take an idle agent, as acquire() does; the caller must release() it."""
+        if not self._idle.empty():
+            return self._idle.get_nowait()
+
+        # asyncio.wait rather than wait_for: wait_for can time out after the get already took an
+        # agent, which would then never come back to the pool
+        getter = asyncio.ensure_future(self._idle.get())
+        try:
+            done, _ = await asyncio.wait({getter}, timeout=timeout)
+        except BaseException:
+            getter.cancel()
+            if getter.done() and not getter.cancelled():
+                self._idle.put_nowait(getter.result())
+            raise
+        if not done:
+            getter.cancel()
+            raise asyncio.TimeoutError
+        return getter.result()
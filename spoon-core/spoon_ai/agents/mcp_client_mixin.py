@@ -1,5 +1,6 @@
-from typing import Union, Dict, Any, Optional, List, AsyncIterator, AsyncContextManager
+from typing import Union, Dict, Any, Optional, List, AsyncIterator, AsyncContextManager, Callable, Tuple
 import asyncio
+import time
 import uuid
 from contextlib import asynccontextmanager
 
@@ -8,20 +9,86 @@ from fastmcp.client.transports import (FastMCPTransport, PythonStdioTransport,
 from fastmcp.client import Client as MCPClient
 import logging
 
+from spoon_ai.utils.config import MCP_POOL_SIZE
+
 logger = logging.getLogger(__name__)
 
+class MCPClientPool:
+    """
+    Connected MCP clients kept open between calls, so each tool call or tool listing
+    skips the SSE handshake and MCP initialize. At most `max_size` are in use at once.
+    """
+
+    def __init__(self, factory: Callable[[], MCPClient], max_size: int = 8, ping_after: float = 30.0):
+        self._factory = factory
+        self._slots = asyncio.Semaphore(max_size)
+        # (client, last returned at); most recently used last, so hot connections are reused first
+        self._idle: List[Tuple[MCPClient, float]] = []
+        # Idle connections older than this are pinged before reuse
+        self._ping_after = ping_after
+
+    @asynccontextmanager
+    async def client(self) -> AsyncIterator[MCPClient]:
+        async with self._slots:
+            client = await self._checkout()
+            try:
+                yield client
+            except BaseException:
+                # Tool errors leave the session usable; a dropped connection does not
+                if self._is_connected(client):
+                    self._idle.append((client, time.monotonic()))
+                else:
+                    await self._disconnect(client)
+                raise
+            self._idle.append((client, time.monotonic()))
+
+    async def _checkout(self) -> MCPClient:
+        while self._idle:
+            client, returned_at = self._idle.pop()
+            if await self._is_healthy(client, time.monotonic() - returned_at):
+                return client
+            await self._disconnect(client)
+        client = self._factory()
+        await client.__aenter__()
+        return client
+
+    async def _is_healthy(self, client: MCPClient, idle_for: float) -> bool:
+        if not self._is_connected(client):
+            return False
+        if idle_for < self._ping_after:
+            return True
+        try:
+            await asyncio.wait_for(client.ping(), timeout=5)
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _is_connected(client: MCPClient) -> bool:
+        is_connected = getattr(client, "is_connected", None)
+        return is_connected() if callable(is_connected) else True
+
+    @staticmethod
+    async def _disconnect(client: MCPClient) -> None:
+        try:
+            await client.__aexit__(None, None, None)
+        except Exception as e:
+            logger.debug(f"Error closing pooled MCP client: {e}")
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for client, _ in idle:
+            await self._disconnect(client)
+
 class MCPClientMixin:
     def __init__(self, mcp_transport: Union[str, WSTransport, SSETransport, PythonStdioTransport, FastMCPTransport]):
         self.mcp_transport = mcp_transport
-        self._client = MCPClient(self.mcp_transport)
+        self._client_pool = MCPClientPool(lambda: MCPClient(self.mcp_transport), max_size=MCP_POOL_SIZE)
         self._last_sender = None
         self._last_topic = None
         self._last_message_id = None
         self.output_topic = None
         
-        # We'll keep track of the active client session
-        self._active_session = None
-        self._session_lock = asyncio.Lock()
         # save the session for each task
         self._task_sessions = {}
     
@@ -45,23 +112,13 @@ class MCPClientMixin:
                 pass
             return
         
-        # If not, create a new session
-        async with self._session_lock:
-            # Create a new session for the current task
-            session = await self._client.__aenter__()
+        # If not, borrow a connected client from the pool for the duration of this task's call
+        async with self._client_pool.client() as session:
             self._task_sessions[task_id] = session
-            
             try:
                 yield session
             finally:
-                # Clean up the session
-                try:
-                    await self._client.__aexit__(None, None, None)
-                except Exception as e:
-                    logger.error(f"Error closing MCP session: {e}")
-                finally:
-                    if task_id in self._task_sessions:
-                        del self._task_sessions[task_id]
+                self._task_sessions.pop(task_id, None)
     
     async def list_mcp_tools(self):
         """Get the list of available tools from the MCP server"""
@@ -192,14 +249,8 @@ class MCPClientMixin:
             
     async def cleanup(self):
         """
-        Clean up resources (no explicit disconnection needed with context manager pattern)
+        Clean up resources: disconnect the pooled MCP clients (ones still borrowed are returned by their tasks)
         """
+        self._task_sessions.clear()
+        await self._client_pool.close()
         logger.info("MCP client resources cleaned up")
-        # Clean up all task sessions
-        for task_id, session in list(self._task_sessions.items()):
-            try:
-                await self._client.__aexit__(None, None, None)
-            except Exception as e:
-                logger.error(f"Error closing MCP session during cleanup: {e}")
-            finally:
-                del self._task_sessions[task_id]
@@ -1,46 +1,99 @@
 # omnichain_synapse.py
 
-import os
 import asyncio
 import logging
-from typing import Optional
+from typing import Any, AsyncIterator, Dict, Optional
 from dotenv import load_dotenv
+from pydantic import Field, PrivateAttr
 
 # Ensure you import the base classes correctly, including the exception
 from spoon_ai.agents.spoon_react import SpoonReactAI 
 from spoon_ai.chat import ChatBot
-from spoon_ai.tools.crypto_tools import get_crypto_tools
+from spoon_ai.tools.crypto_tools import get_shared_crypto_tools
 from spoon_ai.tools.premium_chainbase_tool import PaymentRequiredException # Needed for exception handling
+from spoon_ai.cache import InMemoryCacheBackend, LLMCache, RedisCacheBackend
+from spoon_ai.utils.config import LLM_CACHE_REDIS_URL, LLM_CACHE_TTL_SECONDS
+from spoon_ai.x402.context import get_txn_hash, get_user_privy_token
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
 load_dotenv()
 
+def create_llm_cache() -> Optional[LLMCache]:
+    """Builds the response cache from LLM_CACHE_* settings; None when caching is disabled."""
+    if LLM_CACHE_TTL_SECONDS <= 0:
+        return None
+    backend = RedisCacheBackend(LLM_CACHE_REDIS_URL) if LLM_CACHE_REDIS_URL else InMemoryCacheBackend()
+    return LLMCache(backend=backend, ttl_seconds=LLM_CACHE_TTL_SECONDS)
+
+# Marks the end of a run in its astream() queue
+_RUN_DONE = object()
+
 class OmnichainSynapseAgent(SpoonReactAI):
     """
     An AI agent for onchain data analysis, leveraging Chainbase and CoinGecko tools.
     """
+    llm_cache: Optional[LLMCache] = Field(default=None, exclude=True)
+    # The astream() run task, which can outlive the stream when the client goes away
+    _stream_run: Optional[asyncio.Task] = PrivateAttr(default=None)
+
     def __init__(self, name: str = "OmnichainSynapseAgent", llm: Optional[ChatBot] = None, **kwargs):
         llm = llm if llm else ChatBot()
+        if "llm_cache" not in kwargs:
+            kwargs["llm_cache"] = create_llm_cache()
         super().__init__(name=name, llm=llm, **kwargs)
         
         try:
-            crypto_tools = get_crypto_tools()
+            crypto_tools = get_shared_crypto_tools()
             self.avaliable_tools.add_tools(*crypto_tools)
-            logger.debug(f"Successfully registered {len(crypto_tools)} crypto tools.")
+            logger.debug("Successfully registered %s crypto tools.", len(crypto_tools))
         except Exception as e:
-            logger.error(f"Failed to initialize crypto tools: %s", e)
+            logger.error("Failed to initialize crypto tools: %s", e)
             raise
 
+    def response_cache_key(self, input_text: str) -> Optional[str]:
+        """
+        Key identifying this prompt's response, or None when it must not be shared between requests:
+        paid calls always re-verify their payment, and authenticated calls may run user-scoped tools.
+        """
+        if get_txn_hash() or get_user_privy_token():
+            return None
+        return self._response_key(input_text)
+
+    def _response_key(self, input_text: str) -> str:
+        return LLMCache.make_key(self.llm.model_name, self.system_prompt, input_text, self.avaliable_tools.tool_map)
+
+    @property
+    def pending_run(self) -> Optional[asyncio.Task]:
+        """The streamed run still in progress on this agent, if any; the agent is busy until it ends."""
+        run = self._stream_run
+        return run if run is not None and not run.done() else None
+
+    async def peek_cached_response(self, input_text: str) -> Optional[str]:
+        """
+        Cached response for an unpaid, unauthenticated prompt, or None. Doesn't read the request
+        context, so callers can check before setting it up; they must ensure the request is anonymous.
+        """
+        if self.llm_cache is None:
+            return None
+        return await self.llm_cache.get(self._response_key(input_text))
+
     async def process(self, input_text: str) -> str:
         """
         Processes the user's input with payment exception bubbling and history reset.
         """
-        logger.debug(f"OmnichainSynapseAgent received input: {input_text}")
+        logger.debug("OmnichainSynapseAgent received input: %s", input_text)
+        cache_key = self.response_cache_key(input_text)
+        if cache_key and self.llm_cache is not None:
+            cached = await self.llm_cache.get(cache_key)
+            if cached is not None:
+                logger.debug("OmnichainSynapseAgent served response from cache")
+                return cached
         try:
             response = await super().run(request=input_text)
-            logger.debug(f"SpoonReactAI run method returned: {response}")
+            logger.debug("SpoonReactAI run method returned: %s", response)
+            if cache_key and self.llm_cache is not None:
+                await self.llm_cache.set(cache_key, response)
             return response
         except PaymentRequiredException as e:
             # 🛑 CRITICAL FIX: Reset the agent's history and state when the 
@@ -50,12 +103,41 @@ class OmnichainSynapseAgent(SpoonReactAI):
             raise e # Re-raise to trigger the FastAPI 402 handler
             
         except Exception as e:
-            logger.error(f"Error during SpoonReactAI processing: {e}")
+            logger.error("Error during SpoonReactAI processing: %s", e)
             return f"An error occurred while processing your request: {str(e)}"
 
-# Example Usage
-if __name__ == "__main__":
-    async def main():
-        # Example or placeholder main function logic
-        pass
-    asyncio.run(main())
\ No newline at end of file
+    async def astream(self, input_text: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Runs process() and yields its progress as {"event", "data"} dicts while it runs:
+        "token" for streamed text deltas, "step" for each turn's reply, "tool_calls" for the
+        tools about to run, then a final "done" with the full response.
+        PaymentRequiredException is raised after the events emitted before it.
+        """
+        # An agent serves one run at a time, so its output_queue carries only this run's events
+        # (once earlier leftovers are dropped), closed with a sentinel when the run ends
+        while not self.output_queue.empty():
+            self.output_queue.get_nowait()
+        run = self._stream_run = asyncio.ensure_future(self.process(input_text))
+        run.add_done_callback(lambda _: self.output_queue.put_nowait(_RUN_DONE))
+        try:
+            while (item := await self.output_queue.get()) is not _RUN_DONE:
+                event = self._stream_event(item)
+                if event:
+                    yield event
+            yield {"event": "done", "data": {"response": await run}}
+        finally:
+            # The client went away mid-stream; stop the run. Nothing may be awaited here, since a
+            # cancelled stream cancels it too; pending_run keeps the agent busy until the run ends.
+            if not run.done():
+                run.cancel()
+
+    @staticmethod
+    def _stream_event(item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Maps an output_queue item to a stream event; None for items clients don't need."""
+        if item.get("type") == "text_delta":
+            return {"event": "token", "data": {"delta": item["delta"]}}
+        if item.get("content"):
+            return {"event": "step", "data": {"content": item["content"]}}
+        if item.get("tool_calls"):
+            return {"event": "tool_calls", "data": {"tools": [c.function.name for c in item["tool_calls"]]}}
+        return None
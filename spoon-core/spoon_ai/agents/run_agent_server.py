@@ -1,32 +1,52 @@
 # run_agent_server.py - PRODUCTION READY
 import asyncio
 import logging
+import os
+import sys
+import uuid
+from contextlib import asynccontextmanager
 import uvicorn
-import traceback
-from typing import Optional, Any 
-from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse
+from typing import AsyncIterator, Dict, Optional, Any 
+import orjson
+from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
+from slowapi import Limiter, _rate_limit_exceeded_handler
+from slowapi.errors import RateLimitExceeded
 from starlette.middleware.cors import CORSMiddleware
-from contextvars import Token # Import Token for context management
 
-from spoon_ai.agents.omnichain_synapse_agent import OmnichainSynapseAgent
-# Import the context setter and the exception for txn_hash
-from spoon_ai.x402.context import set_txn_hash, reset_txn_hash
+from spoon_ai.agents.agent_pool import AgentPool
+from spoon_ai.agents.omnichain_synapse_agent import OmnichainSynapseAgent, create_llm_cache
+from spoon_ai.batching import AsyncMicroBatcher
+from spoon_ai.http import close_http_client, get_http_client
+# Import the request context manager and the exception for txn_hash
+from spoon_ai.x402.context import request_context
 from spoon_ai.tools.premium_chainbase_tool import PaymentRequiredException
 # Import verification logic (moved from endpoint)
-from spoon_ai.x402.verifier import verify_payment
+from spoon_ai.x402.verifier import verify_payment_async
 
 # --- NEW IMPORTS for Authentication Context ---
-from spoon_ai.utils.auth import extract_privy_token # <--- Task 1.1: NEW UTILITY
-from spoon_ai.x402.context import tool_context # <--- Task 1.2: CONTEXT UTILITY (FIXED IMPORT)
+from spoon_ai.utils.auth import client_address, extract_privy_token # <--- Task 1.1: NEW UTILITY
+from spoon_ai.utils.log_config import configure_logging
+from spoon_ai.utils.config import (
+    ACCESS_LOG,
+    AGENT_MAX_CONCURRENCY,
+    AGENT_SLOT_TIMEOUT,
+    CHAT_BATCH_MAX_SIZE,
+    CHAT_BATCH_WINDOW_MS,
+    CHAT_GLOBAL_RATE_LIMIT,
+    CHAT_JOB_MAX_PENDING,
+    CHAT_JOB_RESULT_TTL,
+    CHAT_RATE_LIMIT,
+    PROFILE_OUTPUT_DIR,
+    PROFILING_ENABLED,
+    LOG_LEVEL,
+    RATE_LIMIT_STORAGE_URI,
+)
 # ---------------------------------------------
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO, 
-    format="%(asctime)s - %(levelname)s - %(message)s"
-)
+# Configure logging (once per process, from LOG_LEVEL / LOG_FORMAT)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 # --- Models ---
@@ -37,30 +57,138 @@ class ChatRequest(BaseModel):
 class ChatResponse(BaseModel):
     response: str
 
+class ChatJobResponse(BaseModel):
+    job_id: str
+    status: str
+    response: Optional[str] = None
+
+# AGENT_MAX_CONCURRENCY agents per worker, one run each at a time; created in lifespan on the serving loop
+agent_pool: Optional[AgentPool[OmnichainSynapseAgent]] = None
+# Runs in progress keyed by response key, so concurrent identical anonymous prompts share one run
+_inflight: Dict[str, asyncio.Task] = {}
+# Optional micro-batcher for plain prompts (CHAT_BATCH_WINDOW_MS > 0)
+batcher: Optional[AsyncMicroBatcher] = None
+# Background chat runs by job id (POST /chat/jobs); dropped once polled or CHAT_JOB_RESULT_TTL after finishing
+JOBS: Dict[str, asyncio.Task] = {}
+
+# Per-client and server-wide request rates for the chat endpoints; excess requests get a 429
+limiter = Limiter(key_func=client_address, storage_uri=RATE_LIMIT_STORAGE_URI)
+
+def _global_rate_key(request: Request) -> str:
+    return "all-clients"
+
+chat_rate_limit = limiter.limit(CHAT_RATE_LIMIT)
+chat_global_rate_limit = limiter.shared_limit(CHAT_GLOBAL_RATE_LIMIT, scope="chat", key_func=_global_rate_key)
+
+@asynccontextmanager
+async def agent_slot(timeout: Optional[float] = AGENT_SLOT_TIMEOUT) -> AsyncIterator[OmnichainSynapseAgent]:
+    """Check out a pooled agent; sheds load with a 503 when none frees up within `timeout` (None waits)."""
+    try:
+        agent = await agent_pool.checkout(timeout)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=503, detail="Server busy, retry shortly", headers={"Retry-After": "1"})
+    try:
+        yield agent
+    finally:
+        # A stream cancelled on disconnect can't wait for its run here (the cancel scope cancels every
+        # await), so the pool takes the agent back only once that run has finished unwinding
+        agent_pool.release(agent, after=agent.pending_run)
+
+def shared_agent() -> OmnichainSynapseAgent:
+    # The pooled agents share model, prompt, tools and cache, so any of them can key and peek responses
+    return agent_pool.agents[0]
+
+async def _run_pooled(message: str, timeout: Optional[float]) -> str:
+    async with agent_slot(timeout) as agent:
+        return await agent.process(input_text=message)
+
+async def run_agent(message: str, timeout: Optional[float] = AGENT_SLOT_TIMEOUT) -> str:
+    """Runs the prompt on its own pooled agent; concurrent identical shareable prompts await a single run."""
+    key = shared_agent().response_cache_key(message)
+    if key is None:
+        return await _run_pooled(message, timeout)
+
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_run_pooled(message, timeout))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    else:
+        logger.debug("Joined an identical in-flight request")
+    # Shielded so one caller disconnecting does not cancel the run for the others
+    return await asyncio.shield(task)
+
+async def ask_llm(prompt: str) -> str:
+    """A single tool-free LLM call under the agent's system prompt, used by the micro-batcher."""
+    async with agent_slot() as agent:
+        return await agent.llm.ask([{"role": "user", "content": prompt}], system_msg=agent.system_prompt)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global agent_pool, batcher
+    logger.info("🚀 Starting OmnichainSynapseAgent Server...")
+    logger.info("Event loop: %s", asyncio.get_running_loop().__class__.__name__)
+    llm_cache = create_llm_cache()
+    try:
+        agent_pool = AgentPool([OmnichainSynapseAgent(llm_cache=llm_cache) for _ in range(AGENT_MAX_CONCURRENCY)])
+        logger.info("✅ %s agents initialized successfully", agent_pool.size)
+    except Exception as e:
+        logger.error("❌ Failed to initialize agent: %s", e)
+        raise
+
+    if CHAT_BATCH_WINDOW_MS > 0:
+        batcher = AsyncMicroBatcher(ask_llm, max_batch=CHAT_BATCH_MAX_SIZE, window_ms=CHAT_BATCH_WINDOW_MS)
+
+    # Open the TCP/TLS connection to the LLM provider now rather than on the first user request
+    try:
+        await get_http_client().get(str(shared_agent().llm.llm.base_url))
+    except Exception as e:
+        logger.warning("LLM connection prewarm failed: %s", e)
+
+    try:
+        yield
+    finally:
+        if batcher is not None:
+            await batcher.close()
+            batcher = None
+        for task in JOBS.values():
+            task.cancel()
+        JOBS.clear()
+        if llm_cache is not None:
+            await llm_cache.close()
+        agent_pool = None
+        await close_http_client()
+        logger.info("🛑 OmnichainSynapseAgent Server stopped")
+
 # --- App Setup ---
 app = FastAPI(
     title="OmnichainSynapseAgent Server",
     description="API server for chatting with OmnichainSynapseAgent with x402 payment support",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
+app.state.limiter = limiter
+app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
 # --- Middleware/Exception Handlers ---
 
+def payment_required_body(exc: PaymentRequiredException) -> Dict[str, Any]:
+    """The 402 payload, shared by the /chat handler and the /chat/stream error event."""
+    return {
+        "error": "payment_required",
+        "payment": exc.payment_details,
+        "message": f"Payment required to access {exc.payment_details.get('tool_name', 'premium tool')}",
+    }
+
 # This handles the 402 logic GLOBALLY. 
 # Anytime a tool raises PaymentRequiredException, this runs.
 @app.exception_handler(PaymentRequiredException)
 async def payment_required_handler(request: Request, exc: PaymentRequiredException):
-    logger.info(f"💳 Payment required intercepted: {exc.payment_details}")
+    logger.info("💳 Payment required intercepted: %s", exc.payment_details)
     
-    # This JSONResponse returns the 402 status code and the payment info.
-    return JSONResponse(
-        status_code=402,
-        content={
-            "error": "payment_required",
-            "payment": exc.payment_details,
-            "message": f"Payment required to access {exc.payment_details.get('tool_name', 'premium tool')}"
-        }
-    )
+    # This returns the 402 status code and the payment info.
+    return ORJSONResponse(status_code=402, content=payment_required_body(exc))
 
 app.add_middleware(
     CORSMiddleware,
@@ -70,38 +198,62 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Global agent instance
-agent: Optional[OmnichainSynapseAgent] = None
+# Opt-in per-request profiling: only registered when SYNAPSE_PROFILE=1, so it costs nothing otherwise.
+# The async-aware profiler attributes time spent awaiting the LLM, tools and the verifier to the awaiting code.
+if PROFILING_ENABLED:
+    from pyinstrument import Profiler
 
-@app.on_event("startup")
-async def startup_event():
-    global agent
-    logger.info("🚀 Starting OmnichainSynapseAgent Server...")
-    try:
-        agent = OmnichainSynapseAgent()
-        logger.info("✅ Agent initialized successfully")
-    except Exception as e:
-        logger.error(f"❌ Failed to initialize agent: {e}")
-        raise
+    def _write_profile(path: str, html: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(html)
+
+    @app.middleware("http")
+    async def profile_middleware(request: Request, call_next):
+        if request.headers.get("X-Profile") != "1":
+            return await call_next(request)
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    global agent
-    agent = None
+        profiler = Profiler(async_mode="enabled")
+        profiler.start()
+        try:
+            response = await call_next(request)
+        finally:
+            profiler.stop()
+        # Streaming bodies are still being produced at this point; only the time to first byte is covered
+        response.headers["Server-Timing"] = f"total;dur={profiler.last_session.duration * 1000:.1f}"
+        path = os.path.join(PROFILE_OUTPUT_DIR, f"prof_{uuid.uuid4().hex}.html")
+        await asyncio.to_thread(_write_profile, path, profiler.output_html())
+        logger.info("Profile for %s %s written to %s", request.method, request.url.path, path)
+        return response
 
 # --- Endpoints ---
 
+def require_agent() -> AgentPool[OmnichainSynapseAgent]:
+    # Routes that need the agents answer 503 until lifespan startup has built them (and after shutdown)
+    if agent_pool is None:
+        raise HTTPException(status_code=503, detail="Agent not initialized")
+    return agent_pool
+
+agent_ready = Depends(require_agent)
+
 @app.get("/")
 async def root():
     return {"status": "online", "service": "OmnichainSynapseAgent"}
 
-@app.get("/health")
+@app.get("/health", dependencies=[agent_ready])
 async def health_check():
-    if not agent:
-        raise HTTPException(status_code=503, detail="Agent not initialized")
-    return {"status": "healthy"}
+    # In-flight runs against capacity, so a load balancer can steer away from (or drain) a busy worker
+    return {"status": "healthy", "inflight": agent_pool.in_use, "capacity": agent_pool.size}
+
+async def cached_response(request: Request, chat_request: ChatRequest) -> Optional[str]:
+    # Only anonymous, unpaid prompts are ever cached, so anything else goes straight to the agent
+    agent = shared_agent()
+    if agent.llm_cache is None or chat_request.txn_hash or "authorization" in request.headers:
+        return None
+    return await agent.peek_cached_response(chat_request.message)
 
-@app.post("/chat", response_model=ChatResponse)
+@app.post("/chat", response_model=ChatResponse, dependencies=[agent_ready])
+@chat_global_rate_limit
+@chat_rate_limit
 async def chat_with_agent(
     request: Request, # <-- Need to inject Request to read headers
     chat_request: ChatRequest # <-- Rename to avoid conflict with `Request`
@@ -111,59 +263,157 @@ async def chat_with_agent(
     Sets the transaction context AND the user authentication context, runs the agent.
     If the agent hits a premium tool without valid payment, it bubbles PaymentRequiredException.
     """
-    if not agent:
-        raise HTTPException(status_code=500, detail="Agent not initialized")
+    # A cache hit needs no request context, batching or agent slot
+    cached = await cached_response(request, chat_request)
+    if cached is not None:
+        return ChatResponse(response=cached)
     
     # --- CONTEXT MANAGEMENT ---
-    
-    # 1. AUTH CONTEXT: Extract the user's Privy token from the header
+    # Payment (txn_hash) and auth (Privy token from the header) context for this request only;
+    # request_context restores the previous context on exit, so nothing leaks between requests.
     privy_token = extract_privy_token(request)
-    
-    # 2. PAYMENT CONTEXT: Set the txn_hash context
-    txn_token: Token = set_txn_hash(chat_request.txn_hash)
-    
-    # 3. COMBINED CONTEXT: Manually manage the tool_context for the Privy Token
-    # We use a combined dictionary to hold both context pieces for the run
-    current_context = tool_context.get()
-    
     if privy_token:
-        current_context["privy_token"] = privy_token
         logger.info("🔑 Injected Privy Token into Agent context for authentication.")
-    
-    context_token: Token = tool_context.set(current_context)
-    
-    try:
-        if chat_request.txn_hash:
-            logger.info(f"💳 Context set with hash: {chat_request.txn_hash}")
-        
-        # 4. RUN AGENT: This line will use the context variables
-        response = await agent.process(input_text=chat_request.message)
-        
-        return ChatResponse(response=response)
-        
-    except PaymentRequiredException:
-        # Re-raise it so the @app.exception_handler can catch it for 402 response
-        raise 
+    if chat_request.txn_hash:
+        logger.info("💳 Context set with hash: %s", chat_request.txn_hash)
 
-    except Exception as e:
-        logger.error(f"❌ Error processing request: {e}")
-        logger.error(traceback.format_exc())
-        raise HTTPException(status_code=500, detail=str(e))
-        
-    finally:
-        # 5. CLEANUP: Always reset ALL contexts to prevent leaks between requests
-        reset_txn_hash(txn_token)
-        tool_context.reset(context_token) # Reset the combined context
+    with request_context(chat_request.txn_hash, privy_token):
+        try:
+            # Plain prompts (no payment, no user) can share one LLM call with the same client's concurrent ones
+            if batcher is not None and not chat_request.txn_hash and not privy_token:
+                answer = await batcher.submit(chat_request.message, group=client_address(request))
+                return ChatResponse(response=answer)
+
+            # RUN AGENT: This line will use the context variables
+            return ChatResponse(response=await run_agent(chat_request.message))
+
+        except PaymentRequiredException:
+            # Re-raise it so the @app.exception_handler can catch it for 402 response
+            raise 
+
+        except HTTPException:
+            # 503 from agent_slot when the worker is saturated
+            raise
+
+        except Exception as e:
+            logger.exception("❌ Error processing request: %s", e)
+            raise HTTPException(status_code=500, detail=str(e))
+
+async def run_chat_job(message: str) -> str:
+    # Jobs are already queued, so they wait for a free agent instead of failing
+    return await run_agent(message, timeout=None)
+
+def _expire_job(job_id: str, task: asyncio.Task) -> None:
+    # Results nobody polls for are dropped after CHAT_JOB_RESULT_TTL
+    asyncio.get_running_loop().call_later(CHAT_JOB_RESULT_TTL, JOBS.pop, job_id, None)
+
+@app.post("/chat/jobs", response_model=ChatJobResponse, status_code=202, dependencies=[agent_ready])
+@chat_global_rate_limit
+@chat_rate_limit
+async def submit_chat_job(request: Request, chat_request: ChatRequest):
+    """
+    Background variant of /chat: starts the agent run and returns a job id straight away.
+    Poll GET /jobs/{job_id} for the result.
+    """
+    job_id = uuid.uuid4().hex
+    cached = await cached_response(request, chat_request)
+    if cached is not None:
+        return ChatJobResponse(job_id=job_id, status="done", response=cached)
+
+    if sum(not task.done() for task in JOBS.values()) >= CHAT_JOB_MAX_PENDING:
+        raise HTTPException(status_code=503, detail="Server busy, retry shortly", headers={"Retry-After": "1"})
+
+    # The task copies the context on creation, so it keeps this request's txn_hash and Privy token
+    with request_context(chat_request.txn_hash, extract_privy_token(request)):
+        task = asyncio.create_task(run_chat_job(chat_request.message))
+    task.add_done_callback(lambda t: _expire_job(job_id, t))
+    JOBS[job_id] = task
+    return ChatJobResponse(job_id=job_id, status="pending")
+
+@app.get("/jobs/{job_id}", response_model=ChatJobResponse)
+async def get_chat_job(job_id: str):
+    """Status of a background chat job; a finished job is returned once and then forgotten."""
+    task = JOBS.get(job_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if not task.done():
+        return ChatJobResponse(job_id=job_id, status="pending")
+
+    del JOBS[job_id]
+    if task.cancelled():
+        raise HTTPException(status_code=500, detail="Job was cancelled")
+    exc = task.exception()
+    if isinstance(exc, PaymentRequiredException):
+        logger.info("💳 Payment required intercepted: %s", exc.payment_details)
+        return ORJSONResponse(
+            status_code=402,
+            content={**payment_required_body(exc), "job_id": job_id, "status": "payment_required"},
+        )
+    if exc is not None:
+        logger.error("❌ Error processing job %s: %s", job_id, exc, exc_info=exc)
+        raise HTTPException(status_code=500, detail=str(exc))
+    return ChatJobResponse(job_id=job_id, status="done", response=task.result())
+
+def sse_frame(event: str, data: Any) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+async def stream_agent_events(message: str, txn_hash: Optional[str], privy_token: Optional[str]) -> AsyncIterator[bytes]:
+    # The endpoint has already returned when this runs, so the request context is entered here
+    with request_context(txn_hash, privy_token):
+        try:
+            async with agent_slot() as agent:
+                async for event in agent.astream(message):
+                    yield sse_frame(event["event"], event["data"])
+        except HTTPException as exc:
+            yield sse_frame("error", {"error": "server_busy", "message": exc.detail})
+        except PaymentRequiredException as exc:
+            logger.info("💳 Payment required intercepted: %s", exc.payment_details)
+            # Headers are already sent, so the 402 travels as the final event instead
+            yield sse_frame("error", payment_required_body(exc))
+        except Exception as e:
+            logger.exception("❌ Error streaming request: %s", e)
+            yield sse_frame("error", {"error": "internal_error", "message": str(e)})
+
+@app.post("/chat/stream", dependencies=[agent_ready])
+@chat_global_rate_limit
+@chat_rate_limit
+async def chat_with_agent_stream(request: Request, chat_request: ChatRequest):
+    """
+    Streaming variant of /chat as Server-Sent Events: progress events while the agent runs,
+    then "done" with the full response, or "error" with the same body /chat returns on a 402.
+    """
+    cached = await cached_response(request, chat_request)
+    if cached is not None:
+        async def cached_events() -> AsyncIterator[bytes]:
+            yield sse_frame("done", {"response": cached})
+        return StreamingResponse(cached_events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+    return StreamingResponse(
+        stream_agent_events(chat_request.message, chat_request.txn_hash, extract_privy_token(request)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 @app.post("/verify-payment")
 async def verify_payment_endpoint(txn_hash: str):
     """Check payment status directly"""
     try:
-        is_valid = verify_payment(txn_hash)
+        is_valid = await verify_payment_async(txn_hash)
         return {"valid": is_valid, "txn_hash": txn_hash}
     except Exception as e:
-        logger.error(f"Error verifying payment: {e}")
+        logger.error("Error verifying payment: %s", e)
         return {"valid": False, "error": str(e)}
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8765, log_level="info")
\ No newline at end of file
+    # gunicorn.conf.py is the production launcher; this runs the same stack under uvicorn's own
+    # process manager. Each worker builds its own agent pool in lifespan. uvloop is not available on Windows.
+    uvicorn.run(
+        "spoon_ai.agents.run_agent_server:app",
+        host="0.0.0.0",
+        port=8765,
+        log_level=LOG_LEVEL.lower(),
+        access_log=ACCESS_LOG,
+        workers=int(os.getenv("WEB_CONCURRENCY", max(2, os.cpu_count() or 1))),
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+    )
\ No newline at end of file
@@ -3,8 +3,9 @@ import logging
 from fastmcp.server import FastMCP
 from spoon_ai.agents.omnichain_synapse_agent import OmnichainSynapseAgent
 from starlette.middleware.cors import CORSMiddleware # Import CORSMiddleware
+from spoon_ai.utils.log_config import configure_logging
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+configure_logging()
 logger = logging.getLogger(__name__)
 
 async def main():
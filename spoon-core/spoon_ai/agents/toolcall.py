@@ -2,11 +2,16 @@
 
 import json
 import asyncio
+import hashlib
+import itertools
+import os
+import tempfile
 import time
 from logging import getLogger
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
 import logging
 
+import orjson
 from pydantic import Field
 from termcolor import colored
 
@@ -18,10 +23,50 @@ from spoon_ai.schema import TOOL_CHOICE_TYPE, AgentState, ToolCall, ToolChoice,
 from spoon_ai.tools import ToolManager
 from mcp.types import Tool as MCPTool
 from spoon_ai.tools.mcp_tool import MCPTool as SpoonMCPTool
+from spoon_ai.utils.config import MCP_TOOLS_CACHE_DIR
 
 logging.getLogger("spoon_ai").setLevel(logging.INFO)
 logger = getLogger("spoon_ai")
 
+def _read_mcp_tools_file(path: str, ttl: float) -> Optional[tuple]:
+    # Returns (tools, written_at) while the file is younger than ttl
+    try:
+        written_at = os.stat(path).st_mtime
+        if time.time() - written_at >= ttl:
+            return None
+        with open(path, "rb") as f:
+            return [MCPTool.model_validate(item) for item in json.load(f)], written_at
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable MCP tool cache {path}: {e}")
+        return None
+
+def _write_mcp_tools_file(path: str, tools: List[MCPTool]) -> None:
+    # Write-then-rename, so concurrent workers never read a half-written file
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump([tool.model_dump(mode="json") for tool in tools], f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def parse_tool_arguments(arguments: Any) -> dict:
+    # Already-parsed dicts (common from MCP) pass straight through; orjson skips surrounding whitespace itself
+    if isinstance(arguments, dict):
+        return arguments
+    if isinstance(arguments, (str, bytes)) and arguments:
+        try:
+            parsed = orjson.loads(arguments)
+        except orjson.JSONDecodeError:
+            return {}
+        return parsed if isinstance(parsed, dict) else {}
+    return {}
+
 class ToolCallAgent(ReActAgent):
 
     name: str = "toolcall"
@@ -42,6 +87,10 @@ class ToolCallAgent(ReActAgent):
     mcp_tools_cache_timestamp: Optional[float] = Field(default=None, exclude=True)
     mcp_tools_cache_ttl: float = Field(default=300.0, exclude=True)
 
+    # Tool params sent to the LLM, rebuilt only when the local tools or the MCP tool list change
+    tools_params_cache: Optional[List[Dict[str, Any]]] = Field(default=None, exclude=True)
+    tools_params_signature: Optional[tuple] = Field(default=None, exclude=True)
+
     async def _get_cached_mcp_tools(self) -> List[MCPTool]:
         current_time = time.time()
         if (self.mcp_tools_cache is not None and
@@ -50,37 +99,63 @@ class ToolCallAgent(ReActAgent):
             return self.mcp_tools_cache
 
         if hasattr(self, "list_mcp_tools"):
+            path = self._mcp_tools_cache_path()
+            if path:
+                cached = await asyncio.to_thread(_read_mcp_tools_file, path, self.mcp_tools_cache_ttl)
+                if cached is not None:
+                    self.mcp_tools_cache, self.mcp_tools_cache_timestamp = cached
+                    return self.mcp_tools_cache
+
             mcp_tools = await self.list_mcp_tools()
             self.mcp_tools_cache = mcp_tools
             self.mcp_tools_cache_timestamp = current_time
+            if path:
+                try:
+                    await asyncio.to_thread(_write_mcp_tools_file, path, mcp_tools)
+                except Exception as e:
+                    logger.warning(f"Could not write MCP tool cache {path}: {e}")
             return mcp_tools
         return []
 
-    async def think(self) -> bool:
-        if self.next_step_prompt:
-            self.add_message("user", self.next_step_prompt)
-
-        mcp_tools = await self._get_cached_mcp_tools()
-
-        def convert_mcp_tool(tool: MCPTool) -> SpoonMCPTool:
+    def _mcp_tools_cache_path(self) -> Optional[str]:
+        # One file per MCP server, so agents pointed at different servers don't share a list
+        if not MCP_TOOLS_CACHE_DIR:
+            return None
+        server = repr(getattr(self, "mcp_transport", self.name))
+        digest = hashlib.sha256(server.encode()).hexdigest()[:16]
+        return os.path.join(os.path.expanduser(MCP_TOOLS_CACHE_DIR), f"mcp_tools_{digest}.json")
+
+    def _tools_params(self, mcp_tools: List[MCPTool]) -> List[Dict[str, Any]]:
+        # Local tools and the MCP list (by fetch time) identify the set; MCP tools override same-named local ones
+        signature = (tuple(map(id, self.avaliable_tools.tools)), self.mcp_tools_cache_timestamp)
+        if self.tools_params_cache is not None and signature == self.tools_params_signature:
+            return self.tools_params_cache
+
+        def convert_mcp_tool(tool: MCPTool) -> Dict[str, Any]:
             return SpoonMCPTool(
                 name=tool.name,
                 description=tool.description,
                 parameters=tool.inputSchema,
             ).to_param()
 
-        all_tools = self.avaliable_tools.to_params()
-        mcp_tools_params = [convert_mcp_tool(tool) for tool in mcp_tools]
-        
-        unique_tools = {}
-        for tool in all_tools + mcp_tools_params:
-            unique_tools[tool["function"]["name"]] = tool
-        unique_tools_list = list(unique_tools.values())
+        unique_tools = {
+            tool["function"]["name"]: tool
+            for tool in itertools.chain(self.avaliable_tools.to_params(), map(convert_mcp_tool, mcp_tools))
+        }
+        self.tools_params_cache = list(unique_tools.values())
+        self.tools_params_signature = signature
+        return self.tools_params_cache
+
+    async def think(self) -> bool:
+        if self.next_step_prompt:
+            self.add_message("user", self.next_step_prompt)
+
+        mcp_tools = await self._get_cached_mcp_tools()
 
         response = await self.llm.ask_tool(
             messages=self.memory.messages,
             system_msg=self.system_prompt,
-            tools=unique_tools_list,
+            tools=self._tools_params(mcp_tools),
             tool_choice=self.tool_choices,
             output_queue=self.output_queue,
         )
@@ -186,23 +261,25 @@ class ToolCallAgent(ReActAgent):
                 raise ValueError("No tools to call")
             return self.memory.messages[-1].content or "No response from assistant"
 
-        results = []
-        for tool_call in self.tool_calls:
-            result = await self.execute_tool(tool_call)
+        # Tool calls from one LLM turn don't depend on each other, so run them concurrently
+        results = await asyncio.gather(
+            *(self.execute_tool(tool_call) for tool_call in self.tool_calls),
+            return_exceptions=True,
+        )
+        # A payment request takes precedence so the server can answer with a 402
+        for result in results:
+            if type(result).__name__ == "PaymentRequiredException":
+                raise result
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+        # Tool messages are added in call order once everything has finished
+        for tool_call, result in zip(self.tool_calls, results):
             self.add_message("tool", result, tool_call_id=tool_call.id)
-            results.append(result)
         return "\n\n".join(results)
 
     async def execute_tool(self, tool_call: ToolCall) -> str:
-        def parse_tool_arguments(arguments):
-            if isinstance(arguments, str):
-                arguments = arguments.strip()
-                if not arguments: return {}
-                try: return json.loads(arguments)
-                except json.JSONDecodeError: return {}
-            elif isinstance(arguments, dict): return arguments
-            else: return {}
-
         if tool_call.function.name not in self.avaliable_tools.tool_map:
             if not hasattr(self, "call_mcp_tool"):
                 raise ValueError(f"Tool {tool_call.function.name} not found")
@@ -266,5 +343,5 @@ class ToolCallAgent(ReActAgent):
         self.tool_calls = []
         self.state = AgentState.IDLE
         self.current_step = 0
-        self.mcp_tools_cache = None
-        self.mcp_tools_cache_timestamp = None
\ No newline at end of file
+        # The MCP tool list and the tool params built from it outlive the conversation; the list
+        # expires by mcp_tools_cache_ttl and the params follow its timestamp
\ No newline at end of file
@@ -0,0 +1,3 @@
+from .microbatcher import AsyncMicroBatcher
+
+__all__ = ["AsyncMicroBatcher"]
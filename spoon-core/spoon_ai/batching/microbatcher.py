@@ -0,0 +1,108 @@
+# spoon-core/spoon_ai/batching/microbatcher.py
+
+import asyncio
+import logging
+import re
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# "### Answer 2" on a line of its own; unlike "2." it can't be confused with a list inside an answer
+_ANSWER_RE = re.compile(r"^[ \t]*#{1,6}[ \t]*Answer[ \t]+(\d+)[ \t]*:?[ \t]*$", re.MULTILINE | re.IGNORECASE)
+
+
+class AsyncMicroBatcher:
+    """
+    Collects prompts submitted within a short window and answers them with one LLM call.
+    Only prompts submitted under the same group (e.g. one client) share a call, so no client's
+    prompt or answer ever appears in another client's LLM context. Each prompt is sent under its own
+    heading and the reply split back on the answer headings; prompts whose answer is missing from
+    the reply are asked on their own.
+    """
+    def __init__(self, ask: Callable[[str], Awaitable[str]], max_batch: int = 8, window_ms: int = 25):
+        self._ask = ask
+        self.max_batch = max_batch
+        self.window = window_ms / 1000
+        # Batches still collecting, per group, and the timers that will dispatch them
+        self._open: Dict[Hashable, List[Tuple[str, asyncio.Future]]] = {}
+        self._timers: Dict[Hashable, asyncio.TimerHandle] = {}
+        self._dispatches: set = set()
+
+    async def submit(self, prompt: str, group: Hashable = None) -> str:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        batch = self._open.get(group)
+        if batch is None:
+            batch = self._open[group] = []
+            self._timers[group] = loop.call_later(self.window, self._flush, group)
+        batch.append((prompt, future))
+        if len(batch) >= self.max_batch:
+            self._timers.pop(group).cancel()
+            self._flush(group)
+        return await future
+
+    async def close(self) -> None:
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        for task in list(self._dispatches):
+            task.cancel()
+        for batch in self._open.values():
+            for _, future in batch:
+                if not future.done():
+                    future.cancel()
+        self._open.clear()
+
+    def _flush(self, group: Hashable) -> None:
+        self._timers.pop(group, None)
+        batch = self._open.pop(group)
+        # Dispatch in the background so the group's next window starts collecting right away
+        task = asyncio.ensure_future(self._dispatch(batch))
+        self._dispatches.add(task)
+        task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        prompts = [prompt for prompt, _ in batch]
+        try:
+            if len(batch) == 1:
+                answers = [await self._ask(prompts[0])]
+            else:
+                answers = self.split_answers(await self._ask(self.build_prompt(prompts)), len(batch))
+                missing = [i for i, answer in enumerate(answers) if answer is None]
+                if missing:
+                    logger.warning("Batched reply is missing %s of %s answers; asking those individually", len(missing), len(batch))
+                    for i, answer in zip(missing, await asyncio.gather(*(self._ask(prompts[i]) for i in missing))):
+                        answers[i] = answer
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), answer in zip(batch, answers):
+            if not future.done():
+                future.set_result(answer)
+
+    @staticmethod
+    def build_prompt(prompts: List[str]) -> str:
+        questions = "\n\n".join(f"### Question {i}\n{prompt}" for i, prompt in enumerate(prompts, 1))
+        return (
+            f"Answer each of the {len(prompts)} questions below independently. For each question, write a line "
+            "\"### Answer N\" with its number N, then the answer on the following lines, in the same order "
+            "as the questions.\n\n"
+            + questions
+        )
+
+    @staticmethod
+    def split_answers(reply: str, count: int) -> List[Optional[str]]:
+        """
+        Splits a reply into `count` answers by their "### Answer N" headings. An answer whose
+        heading is absent, repeated or out of range is None.
+        """
+        matches = list(_ANSWER_RE.finditer(reply))
+        numbers = [int(m.group(1)) for m in matches]
+        ends = [m.start() for m in matches[1:]] + [len(reply)]
+        answers: List[Optional[str]] = [None] * count
+        for m, number, end in zip(matches, numbers, ends):
+            if 1 <= number <= count and numbers.count(number) == 1:
+                answers[number - 1] = reply[m.end():end].strip()
+        return answers
@@ -0,0 +1,3 @@
+from .llm_cache import InMemoryCacheBackend, LLMCache, RedisCacheBackend
+
+__all__ = ["LLMCache", "InMemoryCacheBackend", "RedisCacheBackend"]
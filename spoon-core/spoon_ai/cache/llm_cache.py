@@ -0,0 +1,108 @@
+# spoon-core/spoon_ai/cache/llm_cache.py
+
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional, Protocol, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(Protocol):
+    async def get(self, key: str) -> Optional[str]: ...
+
+    async def set(self, key: str, value: str, ttl_seconds: int) -> None: ...
+
+    async def close(self) -> None: ...
+
+
+class InMemoryCacheBackend:
+    """
+    Process-local LRU cache with per-entry expiry.
+    """
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str, ttl_seconds: int) -> None:
+        self._data[key] = (time.monotonic() + ttl_seconds, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    async def close(self) -> None:
+        self._data.clear()
+
+
+class RedisCacheBackend:
+    """
+    Redis-backed cache shared by every server process. Requires the optional `redis` package.
+    """
+    def __init__(self, url: str, prefix: str = "llm_cache:"):
+        try:
+            from redis import asyncio as aioredis
+        except ImportError as e:
+            raise ImportError("RedisCacheBackend requires the 'redis' package (pip install redis)") from e
+        self._redis = aioredis.Redis.from_url(url, decode_responses=True)
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self._redis.get(self.prefix + key)
+
+    async def set(self, key: str, value: str, ttl_seconds: int) -> None:
+        await self._redis.set(self.prefix + key, value, ex=ttl_seconds)
+
+    async def close(self) -> None:
+        # redis-py 5 renamed close() to aclose()
+        close = getattr(self._redis, "aclose", None) or self._redis.close
+        await close()
+
+
+class LLMCache:
+    """
+    Caches final agent responses by a hash of everything that shapes them (model, prompts, tool set).
+    Backend failures are logged and treated as misses so the cache can never fail a request.
+    """
+    def __init__(self, backend: Optional[CacheBackend] = None, ttl_seconds: int = 3600):
+        self.backend = backend or InMemoryCacheBackend()
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def make_key(model: Optional[str], system_prompt: Optional[str], prompt: str, tool_names: Iterable[str]) -> str:
+        payload = json.dumps(
+            {"model": model, "system": system_prompt, "prompt": prompt, "tools": sorted(tool_names)},
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        try:
+            return await self.backend.get(key)
+        except Exception as e:
+            logger.warning("LLM cache read failed: %s", e)
+            return None
+
+    async def set(self, key: str, value: str, ttl_seconds: Optional[int] = None) -> None:
+        try:
+            await self.backend.set(key, value, ttl_seconds or self.ttl_seconds)
+        except Exception as e:
+            logger.warning("LLM cache write failed: %s", e)
+
+    async def close(self) -> None:
+        try:
+            await self.backend.close()
+        except Exception as e:
+            logger.warning("LLM cache close failed: %s", e)
@@ -5,6 +5,7 @@ import json
 
 from spoon_ai.schema import Message, LLMResponse, ToolCall
 from spoon_ai.utils.config_manager import ConfigManager
+from spoon_ai.http import get_http_client
 
 from openai import AsyncOpenAI
 from anthropic import AsyncAnthropic
@@ -44,7 +45,7 @@ def to_dict(message: Message) -> dict:
 
 class ChatBot:
     # def __init__(self, model_name: str = "gpt-4.5-preview", llm_config: dict = None, llm_provider: str = "openai", api_key: str = None):
-    def __init__(self, model_name: str = None, llm_config: dict = None, llm_provider: str = None, api_key: str = None, base_url: str = None):
+    def __init__(self, model_name: str = None, llm_config: dict = None, llm_provider: str = None, api_key: str = None, base_url: str = None, http_client: Optional[AsyncClient] = None):
         # Initialize configuration manager
         config_manager = ConfigManager()
 
@@ -55,6 +56,8 @@ class ChatBot:
         self.api_key = api_key
         self.llm_config = llm_config
         self.output_index = 0
+        # Every ChatBot shares the process-wide connection pool unless given its own client
+        http_client = http_client or get_http_client()
 
         # If llm_provider is still not specified, determine it from config first, then environment variables
         if self.llm_provider is None:
@@ -133,12 +136,12 @@ class ChatBot:
             self.api_logic = "openai"
             self.llm = AsyncOpenAI(
                 api_key=self.api_key or os.getenv("OPENAI_API_KEY"),
-                base_url=self.base_url
+                base_url=self.base_url,
+                http_client=http_client
             )
         elif self.llm_provider == "anthropic" and not self.base_url:
             # Use native Anthropic API only when no custom base_url is specified
             self.api_logic = "anthropic"
-            http_client = AsyncClient(follow_redirects=True)
             self.llm = AsyncAnthropic(
                 api_key=self.api_key or os.getenv("ANTHROPIC_API_KEY"),
                 http_client=http_client
@@ -0,0 +1,3 @@
+from .shared import close_http_client, get_http_client
+
+__all__ = ["get_http_client", "close_http_client"]
@@ -0,0 +1,32 @@
+# spoon-core/spoon_ai/http/shared.py
+
+import importlib.util
+from typing import Optional
+
+import httpx
+
+# One keep-alive connection pool shared by every LLM client in the process
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Returns the process-wide AsyncClient, creating it on first use (or after it was closed).
+    HTTP/2 is used when the optional `h2` package is installed.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=importlib.util.find_spec("h2") is not None,
+            timeout=httpx.Timeout(60.0, connect=5.0),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=30),
+            follow_redirects=True,
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
@@ -73,7 +73,9 @@ class CoinMarketCapTool(BaseTool):
         try:
             logger.info(f"Calling CoinMarketCap API: {self._base_url} for {symbol}")
             
-            response = requests.get(
+            # requests is blocking; run it on a worker thread so the event loop keeps serving
+            response = await asyncio.to_thread(
+                requests.get,
                 self._base_url,
                 headers=headers,
                 params=parameters,
@@ -6,7 +6,8 @@ for the spoon-core chat functionality.
 """
 
 import logging
-from typing import List, Optional
+from functools import lru_cache
+from typing import List, Optional, Tuple
 from spoon_ai.tools.base import BaseTool
 from spoon_ai.tools.tool_manager import ToolManager
 
@@ -95,6 +96,17 @@ def get_crypto_tools() -> List[BaseTool]:
     logger.info(f"🔧 Loaded {len(crypto_tools)} crypto tools successfully")
     return crypto_tools
 
+@lru_cache(maxsize=None)
+def get_shared_crypto_tools() -> Tuple[BaseTool, ...]:
+    """
+    Return crypto tool instances built once per process and shared by every caller.
+    The tools hold no per-request state, so agents can register the same instances.
+
+    Returns:
+        Tuple[BaseTool, ...]: Shared crypto tools
+    """
+    return tuple(get_crypto_tools())
+
 def create_crypto_tool_manager() -> ToolManager:
     """
     Create a ToolManager instance with all crypto tools loaded.
@@ -112,8 +124,7 @@ def get_crypto_tool_names() -> List[str]:
     Returns:
         List[str]: List of crypto tool names
     """
-    crypto_tools = get_crypto_tools()
-    return [tool.name for tool in crypto_tools]
+    return [tool.name for tool in get_shared_crypto_tools()]
 
 def add_crypto_tools_to_manager(tool_manager: ToolManager) -> ToolManager:
     """
@@ -1,4 +1,5 @@
 # spoon-core/spoon_ai/tools/premium_chainbase_tool.py
+import asyncio
 import os
 import requests
 import logging
@@ -9,7 +10,7 @@ from pydantic import Field, PrivateAttr
 from spoon_ai.tools.base import BaseTool
 # Import the context getter and verification logic
 from spoon_ai.x402.context import get_txn_hash
-from spoon_ai.x402.verifier import verify_payment
+from spoon_ai.x402.verifier import verify_payment_async
 from spoon_ai.utils.config import TREASURY_ADDRESS, PREMIUM_TOOL_FEE_WEI
 
 logger = logging.getLogger(__name__)
@@ -113,7 +114,7 @@ class PremiumChainbaseTool(BaseTool):
         logger.info(f"[PremiumChainbaseTool] Checking payment. Hash provided: {txn_hash}")
 
         # 2. VERIFY PAYMENT
-        if not txn_hash or not verify_payment(txn_hash):
+        if not txn_hash or not await verify_payment_async(txn_hash):
             logger.warning("[PremiumChainbaseTool] Payment verification failed")
             
             # Raise exception with payment metadata
@@ -128,11 +129,11 @@ class PremiumChainbaseTool(BaseTool):
 
         logger.info(f"[PremiumChainbaseTool] Payment verified. Executing {query_type}...")
 
-        # 3. EXECUTE LOGIC
+        # 3. EXECUTE LOGIC (_make_request blocks, so it runs on a worker thread)
         if query_type == "transactions":
-            result = self._make_request("account/txs", {"chain_id": chain_id, "address": wallet_address})
+            result = await asyncio.to_thread(self._make_request, "account/txs", {"chain_id": chain_id, "address": wallet_address})
         elif query_type == "balances":
-            result = self._make_request("account/balance", {"chain_id": chain_id, "address": wallet_address})
+            result = await asyncio.to_thread(self._make_request, "account/balance", {"chain_id": chain_id, "address": wallet_address})
         else:
             return f"Invalid query_type '{query_type}'."
 
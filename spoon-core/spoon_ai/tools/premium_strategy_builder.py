@@ -1,5 +1,6 @@
 # spoon_ai/tools/premium_strategy_builder.py
 
+import asyncio
 import os
 import requests
 import json
@@ -12,7 +13,7 @@ from spoon_ai.tools.base import BaseTool
 # --- NEW IMPORT ---
 from spoon_ai.x402.context import get_txn_hash, get_user_privy_token 
 # --- END NEW IMPORT ---
-from spoon_ai.x402.verifier import verify_payment
+from spoon_ai.x402.verifier import verify_payment_async
 from spoon_ai.utils.config import TREASURY_ADDRESS, PREMIUM_TOOL_FEE_WEI
 
 # Re-use the exception for the 402 flow
@@ -113,7 +114,7 @@ class PremiumStrategyBuilderTool(BaseTool):
         logger.info(f"[PremiumStrategyBuilder] Request: {strategy_name}. Hash: {txn_hash}")
 
         # 2. VERIFY PAYMENT (The Gate)
-        if not txn_hash or not verify_payment(txn_hash):
+        if not txn_hash or not await verify_payment_async(txn_hash):
             logger.warning("[PremiumStrategyBuilder] Payment verification failed")
             
             # Raise exception to trigger the 402 Flow
@@ -216,7 +217,9 @@ class PremiumStrategyBuilderTool(BaseTool):
             
             logger.info(f"[PremiumStrategyBuilder] Posting to {url} with Privy Token...")
             
-            response = requests.post(
+            # requests is blocking; run it on a worker thread so the event loop keeps serving
+            response = await asyncio.to_thread(
+                requests.post,
                 url, 
                 json=strategy_payload,
                 headers=headers,
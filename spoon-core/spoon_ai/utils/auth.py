@@ -1,11 +1,38 @@
 # spoon-core/spoon_ai/utils/auth.py
 
+import ipaddress
 from typing import Optional
 from fastapi import Request
 import logging
 
+from spoon_ai.utils.config import TRUSTED_PROXIES
+
 logger = logging.getLogger(__name__)
 
+_trusted_networks = [ipaddress.ip_network(p.strip(), strict=False) for p in TRUSTED_PROXIES.split(",") if p.strip()]
+
+def _is_trusted_proxy(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in _trusted_networks)
+
+def client_address(request: Request) -> str:
+    """
+    The requesting client's address for rate limiting and batching. Behind a proxy listed in
+    TRUSTED_PROXIES, this is the nearest X-Forwarded-For hop that isn't one of those proxies;
+    the header is ignored when the direct peer isn't trusted, so clients can't spoof it.
+    """
+    peer = request.client.host if request.client else "unknown"
+    if not _is_trusted_proxy(peer):
+        return peer
+    hops = [hop.strip() for hop in request.headers.get("X-Forwarded-For", "").split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not _is_trusted_proxy(hop):
+            return hop
+    return hops[0] if hops else peer
+
 def extract_privy_token(request: Request) -> Optional[str]:
     """
     Extracts the Privy JWT token from the Authorization header of the request.
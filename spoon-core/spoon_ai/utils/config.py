@@ -1,4 +1,5 @@
 import os
+import tempfile
 
 from dotenv import load_dotenv
 
@@ -21,6 +22,52 @@ REDIS_HOST = os.getenv("REDIS_HOST")
 REDIS_PORT = os.getenv("REDIS_PORT")
 REDIS_PASSWORD = os.getenv("REDIS_PASSWORD")
 
+# Agent response cache: 0 disables it; without a Redis URL the cache is process-local
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", "0"))
+LLM_CACHE_REDIS_URL = os.getenv("LLM_CACHE_REDIS_URL")
+
+# Directory for the MCP tool list, so restarted workers skip the list_tools round-trip (empty disables)
+MCP_TOOLS_CACHE_DIR = os.getenv("MCP_TOOLS_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "spoon_ai"))
+# Connected MCP clients an agent keeps open and reuses per worker (also its cap on concurrent MCP calls)
+MCP_POOL_SIZE = int(os.getenv("MCP_POOL_SIZE", "8"))
+
+# Agent server limits: per-client and server-wide chat request rates (limits syntax).
+# With the default memory:// storage every worker counts on its own, so the real server-wide ceiling is
+# CHAT_GLOBAL_RATE_LIMIT x workers; point RATE_LIMIT_STORAGE_URI at shared storage (e.g. redis://...) for one
+# count across workers. These count requests, not LLM calls: an agent run makes up to max_steps (2) calls.
+CHAT_RATE_LIMIT = os.getenv("CHAT_RATE_LIMIT", "60/minute")
+CHAT_GLOBAL_RATE_LIMIT = os.getenv("CHAT_GLOBAL_RATE_LIMIT", "240/minute")
+RATE_LIMIT_STORAGE_URI = os.getenv("RATE_LIMIT_STORAGE_URI", "memory://")
+# Reverse proxies / load balancers in front of the server (comma-separated IPs or CIDRs). Their
+# X-Forwarded-For header names the real client for per-client rate limits and batching; without
+# the right entries every client behind the proxy shares the proxy's address.
+TRUSTED_PROXIES = os.getenv("TRUSTED_PROXIES", "127.0.0.1,::1")
+# Agents per worker; each serves one run at a time, so this is also the worker's concurrent-run limit
+AGENT_MAX_CONCURRENCY = int(os.getenv("AGENT_MAX_CONCURRENCY", "48"))
+# Seconds a /chat request may wait for a free agent before it is turned away with a 503
+AGENT_SLOT_TIMEOUT = float(os.getenv("AGENT_SLOT_TIMEOUT", "0.1"))
+
+# Micro-batching of one client's concurrent plain /chat prompts into one LLM call (0 disables). Batched
+# prompts get the agent's system prompt but no tools, so only enable it for traffic that doesn't need them.
+CHAT_BATCH_WINDOW_MS = int(os.getenv("CHAT_BATCH_WINDOW_MS", "0"))
+CHAT_BATCH_MAX_SIZE = int(os.getenv("CHAT_BATCH_MAX_SIZE", "8"))
+
+# Background chat jobs (POST /chat/jobs): seconds a finished result waits to be polled before it is dropped
+CHAT_JOB_RESULT_TTL = float(os.getenv("CHAT_JOB_RESULT_TTL", "300"))
+# Unfinished background jobs allowed per worker before POST /chat/jobs answers 503. Each job needs one of
+# the worker's AGENT_MAX_CONCURRENCY agents, so the default queues at most one more job behind every agent.
+CHAT_JOB_MAX_PENDING = int(os.getenv("CHAT_JOB_MAX_PENDING", str(2 * AGENT_MAX_CONCURRENCY)))
+
+# Logging for the server entry points: level name, and "text" or "json" lines
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")
+# Per-request access log lines from the HTTP server; off by default to keep them off the hot path
+ACCESS_LOG = os.getenv("ACCESS_LOG", "0") == "1"
+
+# Per-request profiling of the agent server (needs pyinstrument); requests opt in with "X-Profile: 1"
+PROFILING_ENABLED = os.getenv("SYNAPSE_PROFILE") == "1"
+PROFILE_OUTPUT_DIR = os.getenv("SYNAPSE_PROFILE_DIR") or tempfile.gettempdir()
+
 SECRET_KEY = "spoon-ai-secret-key"
 
 ALGORITHM = "HS256"
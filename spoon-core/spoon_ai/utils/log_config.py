@@ -0,0 +1,44 @@
+# spoon-core/spoon_ai/utils/log_config.py
+
+import logging
+from typing import Optional
+
+import orjson
+
+from spoon_ai.utils.config import LOG_FORMAT, LOG_LEVEL
+
+TEXT_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+_configured = False
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, for log shippers."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry, default=str).decode()
+
+
+def configure_logging(level: Optional[str] = None, fmt: Optional[str] = None) -> None:
+    """
+    Configures root logging once per process from LOG_LEVEL / LOG_FORMAT ("text" or "json").
+    Entry points call this; library modules only call logging.getLogger(__name__).
+    """
+    global _configured
+    if _configured:
+        return
+    handler = logging.StreamHandler()
+    if (fmt or LOG_FORMAT).lower() == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+    logging.basicConfig(level=(level or LOG_LEVEL).upper(), handlers=[handler])
+    _configured = True
@@ -1,7 +1,8 @@
 # spoon-core/spoon_ai/x402/context.py (CONSOLIDATED & FIXED)
 
+from contextlib import contextmanager
 from contextvars import ContextVar, Token
-from typing import Optional, Dict, Any
+from typing import Iterator, Optional, Dict, Any
 
 # --- 1. SHARED CONTEXT VARIABLE (The fix for the ImportError) ---
 # This single dictionary holds all request-specific data (txn_hash, privy_token)
@@ -42,4 +43,21 @@ def get_user_privy_token() -> Optional[str]:
 
 # NOTE: The setter for privy_token is handled in run_agent_server.py 
 # where it extracts the token and combines it with txn_hash before calling tool_context.set().
-# We don't need a standalone setter here if run_agent_server.py handles the extraction and merging.
\ No newline at end of file
+# We don't need a standalone setter here if run_agent_server.py handles the extraction and merging.
+
+# --- 4. Per-request Context Manager ---
+
+@contextmanager
+def request_context(txn_hash: Optional[str] = None, privy_token: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Sets txn_hash and privy_token for the duration of a request with a single
+    tool_context.set(), and always restores the previous context on exit.
+    """
+    new_context = {**tool_context.get(), "txn_hash": txn_hash}
+    if privy_token:
+        new_context["privy_token"] = privy_token
+    token = tool_context.set(new_context)
+    try:
+        yield new_context
+    finally:
+        tool_context.reset(token)
@@ -1,8 +1,22 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Tuple
+
 from web3 import Web3
+from spoon_ai.http import get_http_client
 from spoon_ai.utils.config import AVALANCHE_RPC, TREASURY_ADDRESS, PREMIUM_TOOL_FEE_WEI
 
+logger = logging.getLogger(__name__)
+
 w3 = Web3(Web3.HTTPProvider(AVALANCHE_RPC))
 
+# txn_hash -> (expires_at, is_valid); confirmed payments don't revert, pending ones are re-checked sooner
+VERIFY_CACHE_TTL = 30.0
+VERIFY_NEGATIVE_CACHE_TTL = 5.0
+_VERIFY_CACHE_MAX_SIZE = 1024
+_verify_cache: Dict[str, Tuple[float, bool]] = {}
+
 def verify_payment(txn_hash: str) -> bool:
     try:
         receipt = w3.eth.get_transaction_receipt(txn_hash)
@@ -15,4 +29,48 @@ def verify_payment(txn_hash: str) -> bool:
         )
     except Exception as e:
         logger.error(f"Verification error: {e}")
-        return False
\ No newline at end of file
+        return False
+
+async def _rpc(method: str, params: List[Any]) -> Any:
+    response = await get_http_client().post(
+        AVALANCHE_RPC, json={"jsonrpc": "2.0", "id": 1, "method": method, "params": params}
+    )
+    response.raise_for_status()
+    body = response.json()
+    if body.get("error"):
+        raise RuntimeError(f"{method} failed: {body['error']}")
+    return body.get("result")
+
+async def _check_payment(txn_hash: str) -> bool:
+    receipt, tx = await asyncio.gather(
+        _rpc("eth_getTransactionReceipt", [txn_hash]),
+        _rpc("eth_getTransactionByHash", [txn_hash]),
+    )
+    if not receipt or int(receipt["status"], 16) != 1 or not tx:
+        return False
+    return (
+        (tx.get("to") or "").lower() == TREASURY_ADDRESS.lower() and
+        int(tx["value"], 16) >= PREMIUM_TOOL_FEE_WEI
+    )
+
+async def verify_payment_async(txn_hash: str) -> bool:
+    """
+    Non-blocking verify_payment over the shared HTTP client, with results cached briefly per txn_hash.
+    """
+    now = time.monotonic()
+    cached = _verify_cache.get(txn_hash)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    try:
+        is_valid = await _check_payment(txn_hash)
+    except Exception as e:
+        logger.error(f"Verification error: {e}")
+        return False
+
+    if len(_verify_cache) >= _VERIFY_CACHE_MAX_SIZE:
+        for key in [k for k, (expires_at, _) in _verify_cache.items() if expires_at <= now]:
+            del _verify_cache[key]
+    ttl = VERIFY_CACHE_TTL if is_valid else VERIFY_NEGATIVE_CACHE_TTL
+    _verify_cache[txn_hash] = (now + ttl, is_valid)
+    return is_valid
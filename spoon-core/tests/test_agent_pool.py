@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+from spoon_ai.agents.agent_pool import AgentPool
+
+
+class FakeAgent:
+    def __init__(self):
+        self.output_queue = asyncio.Queue()
+
+
+async def test_concurrent_runs_get_distinct_agents():
+    pool = AgentPool([FakeAgent(), FakeAgent()])
+    async with pool.acquire() as first, pool.acquire() as second:
+        assert first is not second
+        assert pool.in_use == 2
+    assert pool.in_use == 0
+
+
+async def test_acquire_times_out_when_all_agents_are_busy():
+    pool = AgentPool([FakeAgent()])
+    async with pool.acquire():
+        with pytest.raises(asyncio.TimeoutError):
+            async with pool.acquire(timeout=0.01):
+                pass
+    # The timed-out waiter must not have kept the agent
+    async with pool.acquire(timeout=0.01):
+        assert pool.in_use == 1
+
+
+async def test_waiter_gets_the_released_agent():
+    agent = FakeAgent()
+    pool = AgentPool([agent])
+    held = await pool.checkout()
+    waiter = asyncio.ensure_future(pool.checkout(timeout=1))
+    await asyncio.sleep(0)
+    pool.release(held)
+    assert await waiter is agent
+
+
+async def test_release_drains_unconsumed_output():
+    agent = FakeAgent()
+    pool = AgentPool([agent])
+    async with pool.acquire() as checked_out:
+        checked_out.output_queue.put_nowait({"content": "left over"})
+    assert agent.output_queue.empty()
+
+
+async def test_release_waits_for_a_run_still_unwinding():
+    agent = FakeAgent()
+    pool = AgentPool([agent])
+    run = asyncio.get_running_loop().create_future()
+    # The run's own end-of-stream marker, pushed when it finishes, must not reach the next stream
+    run.add_done_callback(lambda _: agent.output_queue.put_nowait("done"))
+    held = await pool.checkout()
+    pool.release(held, after=run)
+    assert pool.in_use == 1
+
+    run.set_result(None)
+    await asyncio.sleep(0)
+    assert pool.in_use == 0
+    assert agent.output_queue.empty()
+
+
+def test_empty_pool_is_rejected():
+    with pytest.raises(ValueError):
+        AgentPool([])
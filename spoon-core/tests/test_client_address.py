@@ -0,0 +1,37 @@
+import pytest
+from starlette.requests import Request
+
+from spoon_ai.utils import auth
+
+
+def make_request(peer, forwarded_for=None):
+    headers = [(b"x-forwarded-for", forwarded_for.encode())] if forwarded_for else []
+    return Request({"type": "http", "headers": headers, "client": (peer, 12345)})
+
+
+@pytest.fixture(autouse=True)
+def trusted_proxies(monkeypatch):
+    monkeypatch.setattr(auth, "_trusted_networks", [auth.ipaddress.ip_network("10.0.0.0/8")])
+
+
+def test_direct_client_is_its_own_address():
+    assert auth.client_address(make_request("203.0.113.7")) == "203.0.113.7"
+
+
+def test_forwarded_for_is_ignored_from_untrusted_peers():
+    assert auth.client_address(make_request("203.0.113.7", "198.51.100.1")) == "203.0.113.7"
+
+
+def test_client_behind_trusted_proxy_is_told_apart():
+    assert auth.client_address(make_request("10.0.0.2", "198.51.100.1")) == "198.51.100.1"
+    assert auth.client_address(make_request("10.0.0.2", "198.51.100.2")) == "198.51.100.2"
+
+
+def test_spoofed_hops_before_the_real_client_are_skipped():
+    # The client sent its own X-Forwarded-For; the proxies appended the real address and each other
+    request = make_request("10.0.0.2", "1.2.3.4, 198.51.100.1, 10.0.0.3")
+    assert auth.client_address(request) == "198.51.100.1"
+
+
+def test_trusted_peer_without_header_is_the_address():
+    assert auth.client_address(make_request("10.0.0.2")) == "10.0.0.2"
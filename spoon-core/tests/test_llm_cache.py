@@ -0,0 +1,49 @@
+from spoon_ai.cache import InMemoryCacheBackend, LLMCache
+from spoon_ai.cache import llm_cache
+
+
+async def test_in_memory_backend_evicts_least_recently_used():
+    backend = InMemoryCacheBackend(max_entries=2)
+    await backend.set("a", "1", 60)
+    await backend.set("b", "2", 60)
+    # Reading "a" makes "b" the least recently used entry
+    assert await backend.get("a") == "1"
+    await backend.set("c", "3", 60)
+    assert await backend.get("b") is None
+    assert await backend.get("a") == "1"
+    assert await backend.get("c") == "3"
+
+
+async def test_in_memory_backend_expires_entries(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(llm_cache.time, "monotonic", lambda: now[0])
+    backend = InMemoryCacheBackend()
+    await backend.set("a", "1", 10)
+    now[0] += 9
+    assert await backend.get("a") == "1"
+    now[0] += 1
+    assert await backend.get("a") is None
+    assert "a" not in backend._data
+
+
+async def test_backend_failures_are_misses():
+    class BrokenBackend:
+        async def get(self, key):
+            raise ConnectionError("down")
+
+        async def set(self, key, value, ttl_seconds):
+            raise ConnectionError("down")
+
+        async def close(self):
+            raise ConnectionError("down")
+
+    cache = LLMCache(backend=BrokenBackend())
+    await cache.set("k", "v")
+    assert await cache.get("k") is None
+    await cache.close()
+
+
+def test_make_key_ignores_tool_order():
+    key = LLMCache.make_key("gpt", "system", "hi", ["b", "a"])
+    assert key == LLMCache.make_key("gpt", "system", "hi", ["a", "b"])
+    assert key != LLMCache.make_key("gpt", "system", "hello", ["a", "b"])
@@ -0,0 +1,126 @@
+import asyncio
+
+import pytest
+
+from spoon_ai.agents import mcp_client_mixin
+from spoon_ai.agents.mcp_client_mixin import MCPClientPool
+
+
+class FakeClient:
+    def __init__(self):
+        self.connected = False
+        self.closed = False
+        self.pings = 0
+        self.ping_ok = True
+
+    async def __aenter__(self):
+        self.connected = True
+        return self
+
+    async def __aexit__(self, *exc):
+        self.connected = False
+        self.closed = True
+
+    def is_connected(self):
+        return self.connected
+
+    async def ping(self):
+        self.pings += 1
+        if not self.ping_ok:
+            raise ConnectionError("gone")
+        return True
+
+
+@pytest.fixture
+def created():
+    return []
+
+
+@pytest.fixture
+def pool(created):
+    def factory():
+        client = FakeClient()
+        created.append(client)
+        return client
+
+    return MCPClientPool(factory, max_size=2, ping_after=30.0)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(mcp_client_mixin.time, "monotonic", lambda: now[0])
+    return now
+
+
+async def test_client_is_connected_once_and_reused(pool, created):
+    async with pool.client() as first:
+        assert first.connected
+    async with pool.client() as second:
+        assert second is first
+    assert len(created) == 1
+
+
+async def test_concurrent_calls_get_distinct_clients(pool, created):
+    async with pool.client() as first, pool.client() as second:
+        assert first is not second
+    assert len(created) == 2
+
+
+async def test_max_size_bounds_clients_in_use(pool):
+    async with pool.client(), pool.client():
+        third = asyncio.ensure_future(pool.client().__aenter__())
+        await asyncio.sleep(0)
+        assert not third.done()
+    await third
+
+
+async def test_idle_client_is_pinged_before_reuse(pool, created, clock):
+    async with pool.client() as first:
+        pass
+    clock[0] += 10
+    async with pool.client():
+        pass
+    assert first.pings == 0
+
+    clock[0] += 31
+    async with pool.client() as again:
+        assert again is first
+    assert first.pings == 1
+
+
+async def test_client_failing_its_ping_is_replaced(pool, created, clock):
+    async with pool.client() as first:
+        pass
+    first.ping_ok = False
+    clock[0] += 31
+    async with pool.client() as replacement:
+        assert replacement is not first
+    assert first.closed
+
+
+async def test_client_goes_back_to_the_pool_after_a_tool_error(pool, created):
+    with pytest.raises(ValueError):
+        async with pool.client():
+            raise ValueError("tool failed")
+    async with pool.client():
+        pass
+    assert len(created) == 1
+
+
+async def test_dropped_client_is_discarded_after_an_error(pool, created):
+    with pytest.raises(ConnectionError):
+        async with pool.client() as client:
+            client.connected = False
+            raise ConnectionError("connection lost")
+    async with pool.client() as replacement:
+        assert replacement is not client
+    assert client.closed
+    assert len(created) == 2
+
+
+async def test_close_disconnects_idle_clients(pool, created):
+    async with pool.client(), pool.client():
+        pass
+    await pool.close()
+    assert all(client.closed for client in created)
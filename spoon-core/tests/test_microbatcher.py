@@ -0,0 +1,63 @@
+import asyncio
+
+from spoon_ai.batching import AsyncMicroBatcher
+
+
+def test_build_prompt_puts_each_question_under_its_own_heading():
+    prompt = AsyncMicroBatcher.build_prompt(["What is BTC?", "1. list\n2. items"])
+    assert "### Question 1\nWhat is BTC?" in prompt
+    assert "### Question 2\n1. list\n2. items" in prompt
+    assert "### Answer N" in prompt
+
+
+def test_split_answers_keeps_lists_inside_answers():
+    reply = (
+        "### Answer 1\nTwo reasons:\n1. liquidity\n2. fees\n\n"
+        "### Answer 2\nETH is a chain."
+    )
+    assert AsyncMicroBatcher.split_answers(reply, 2) == [
+        "Two reasons:\n1. liquidity\n2. fees",
+        "ETH is a chain.",
+    ]
+
+
+def test_split_answers_marks_missing_and_repeated_answers():
+    reply = "### Answer 1\na\n### Answer 3\nc\n### Answer 3\nc again"
+    assert AsyncMicroBatcher.split_answers(reply, 3) == ["a", None, None]
+    assert AsyncMicroBatcher.split_answers("1. a\n2. b", 2) == [None, None]
+
+
+async def test_only_prompts_of_the_same_group_share_a_call():
+    calls = []
+
+    async def ask(prompt):
+        calls.append(prompt)
+        if "### Question" not in prompt:
+            return f"single: {prompt}"
+        return "### Answer 1\nfirst\n### Answer 2\nsecond"
+
+    batcher = AsyncMicroBatcher(ask, max_batch=8, window_ms=10)
+    answers = await asyncio.gather(
+        batcher.submit("a1", group="client-a"),
+        batcher.submit("b1", group="client-b"),
+        batcher.submit("a2", group="client-a"),
+    )
+    assert answers == ["first", "single: b1", "second"]
+    assert len(calls) == 2
+    await batcher.close()
+
+
+async def test_only_missing_answers_are_asked_again():
+    calls = []
+
+    async def ask(prompt):
+        calls.append(prompt)
+        if "### Question" in prompt:
+            return "### Answer 1\nfirst"
+        return f"single: {prompt}"
+
+    batcher = AsyncMicroBatcher(ask, max_batch=2, window_ms=10)
+    answers = await asyncio.gather(batcher.submit("q1"), batcher.submit("q2"))
+    assert answers == ["first", "single: q2"]
+    assert len(calls) == 2
+    await batcher.close()
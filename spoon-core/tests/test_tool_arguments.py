@@ -0,0 +1,18 @@
+import pytest
+
+from spoon_ai.agents.toolcall import parse_tool_arguments
+
+
+def test_dict_arguments_pass_through():
+    arguments = {"symbol": "BTC"}
+    assert parse_tool_arguments(arguments) is arguments
+
+
+@pytest.mark.parametrize("raw", ['{"symbol": "BTC"}', b'{"symbol": "BTC"}', '  {"symbol": "BTC"}\n'])
+def test_json_object_arguments_are_parsed(raw):
+    assert parse_tool_arguments(raw) == {"symbol": "BTC"}
+
+
+@pytest.mark.parametrize("raw", [None, "", "not json", "[1, 2]", '"BTC"', 42])
+def test_anything_else_becomes_no_arguments(raw):
+    assert parse_tool_arguments(raw) == {}
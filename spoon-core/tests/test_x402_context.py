@@ -0,0 +1,39 @@
+import asyncio
+
+import pytest
+
+from spoon_ai.x402.context import get_txn_hash, get_user_privy_token, request_context
+
+
+def test_request_context_sets_and_restores():
+    with request_context("0xabc", "privy-token"):
+        assert get_txn_hash() == "0xabc"
+        assert get_user_privy_token() == "privy-token"
+    assert get_txn_hash() is None
+    assert get_user_privy_token() is None
+
+
+def test_request_context_restores_after_an_error():
+    with pytest.raises(RuntimeError):
+        with request_context("0xabc", "privy-token"):
+            raise RuntimeError("tool failed")
+    assert get_txn_hash() is None
+    assert get_user_privy_token() is None
+
+
+def test_nested_request_context_restores_the_outer_one():
+    with request_context("0xouter", "outer-token"):
+        with request_context("0xinner"):
+            assert get_txn_hash() == "0xinner"
+            # No token given: the outer request's token is still visible
+            assert get_user_privy_token() == "outer-token"
+        assert get_txn_hash() == "0xouter"
+
+
+async def test_concurrent_requests_see_only_their_own_context():
+    async def handle(txn_hash):
+        with request_context(txn_hash):
+            await asyncio.sleep(0)
+            return get_txn_hash()
+
+    assert await asyncio.gather(handle("0x1"), handle("0x2")) == ["0x1", "0x2"]
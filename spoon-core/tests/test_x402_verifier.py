@@ -0,0 +1,70 @@
+import pytest
+
+from spoon_ai.x402 import verifier
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(verifier.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(verifier, "_verify_cache", {})
+    return now
+
+
+@pytest.fixture
+def chain(monkeypatch):
+    """Stands in for the RPC check; tests set `result` and read `calls`."""
+    class Chain:
+        result = True
+        calls = 0
+
+    async def check_payment(txn_hash):
+        Chain.calls += 1
+        if isinstance(Chain.result, Exception):
+            raise Chain.result
+        return Chain.result
+
+    monkeypatch.setattr(verifier, "_check_payment", check_payment)
+    return Chain
+
+
+async def test_valid_payment_is_cached_for_the_positive_ttl(clock, chain):
+    assert await verifier.verify_payment_async("0x1") is True
+    clock[0] += verifier.VERIFY_CACHE_TTL - 1
+    assert await verifier.verify_payment_async("0x1") is True
+    assert chain.calls == 1
+
+    clock[0] += 1
+    await verifier.verify_payment_async("0x1")
+    assert chain.calls == 2
+
+
+async def test_invalid_payment_is_rechecked_after_the_negative_ttl(clock, chain):
+    chain.result = False
+    assert await verifier.verify_payment_async("0x1") is False
+    clock[0] += verifier.VERIFY_NEGATIVE_CACHE_TTL - 1
+    assert await verifier.verify_payment_async("0x1") is False
+    assert chain.calls == 1
+
+    # The transaction confirmed in the meantime
+    chain.result = True
+    clock[0] += 1
+    assert await verifier.verify_payment_async("0x1") is True
+    assert chain.calls == 2
+
+
+async def test_rpc_errors_are_not_cached(clock, chain):
+    chain.result = ConnectionError("rpc down")
+    assert await verifier.verify_payment_async("0x1") is False
+    chain.result = True
+    assert await verifier.verify_payment_async("0x1") is True
+    assert chain.calls == 2
+
+
+async def test_full_cache_drops_expired_entries(clock, chain, monkeypatch):
+    monkeypatch.setattr(verifier, "_VERIFY_CACHE_MAX_SIZE", 2)
+    await verifier.verify_payment_async("0x1")
+    await verifier.verify_payment_async("0x2")
+    clock[0] += verifier.VERIFY_CACHE_TTL
+    await verifier.verify_payment_async("0x3")
+    assert set(verifier._verify_cache) == {"0x3"}
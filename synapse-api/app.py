@@ -1,7 +1,9 @@
 import truststore
 truststore.inject_into_ssl()
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from contextlib import asynccontextmanager
 
 from core.config import settings
@@ -29,9 +31,13 @@ app = FastAPI(
     title="Synapse API",
     description="Backend service for Synapse trading platform",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
+# Compress larger bodies (strategy lists); small responses are sent as-is
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=4)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -1,5 +1,5 @@
 from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.exc import SQLAlchemyError
 import logging
 
@@ -46,7 +46,7 @@ class NotFoundError(SynapseAPIError):
 async def synapse_exception_handler(request: Request, exc: SynapseAPIError):
     """Handle custom Synapse API exceptions"""
     logger.error(f"SynapseAPIError: {exc.message}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={"error": exc.message, "type": type(exc).__name__}
     )
@@ -55,7 +55,7 @@ async def synapse_exception_handler(request: Request, exc: SynapseAPIError):
 async def sqlalchemy_exception_handler(request: Request, exc: SQLAlchemyError):
     """Handle database errors"""
     logger.error(f"Database error: {str(exc)}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"error": "Database error occurred", "type": "DatabaseError"}
     )
@@ -64,7 +64,7 @@ async def sqlalchemy_exception_handler(request: Request, exc: SQLAlchemyError):
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle unexpected errors"""
     logger.error(f"Unexpected error: {str(exc)}", exc_info=True)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"error": "Internal server error", "type": "InternalError"}
     )
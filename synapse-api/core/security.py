@@ -1,5 +1,10 @@
 # synapse-api/core/security.py
 
+import hashlib
+import time
+
+import jwt
+from cachetools import TTLCache
 from fastapi import HTTPException, Depends, status, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -12,6 +17,15 @@ logger = logging.getLogger(__name__)
 
 security = HTTPBearer()
 
+# Verified session JWTs -> (user id, token expiry), so repeat requests skip the JWT decode and load the
+# user by primary key in their own session. Keyed by a digest rather than the bearer token itself;
+# entries never outlive the token's exp.
+_session_cache = TTLCache(maxsize=8192, ttl=60)
+
+
+def _token_key(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
@@ -20,6 +34,15 @@ async def get_current_user(
     """
     Dependency to get current authenticated user from JWT token (Synapse Session JWT)
     """
+    key = _token_key(credentials.credentials)
+    cached = _session_cache.get(key)
+    if cached is not None and cached[1] > time.time():
+        user = await db.get(UserProfile, cached[0])
+        if user is not None:
+            return user
+        # The user is gone; drop the entry and let full verification reject the token
+        _session_cache.pop(key, None)
+
     try:
         auth_service = AuthService(db)
         # Verifies the Synapse Session JWT
@@ -31,7 +54,11 @@ async def get_current_user(
                 detail="Invalid authentication credentials",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        
+
+        # The signature was just verified, so only the expiry needs reading here
+        exp = jwt.decode(credentials.credentials, options={"verify_signature": False}).get("exp")
+        if exp is not None:
+            _session_cache[key] = (user.id, exp)
         return user
     
     except Exception as e:
@@ -0,0 +1,27 @@
+"""GIN (jsonb_path_ops) index on strategy_conditions.payload for @> lookups"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261016_conditions_payload_gin"
+down_revision = "20261016_updated_at_triggers"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # CONCURRENTLY cannot run inside a transaction block; build without blocking writes to strategy_conditions
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_strategy_conditions_payload_gin",
+            "strategy_conditions",
+            ["payload"],
+            postgresql_using="gin",
+            postgresql_ops={"payload": "jsonb_path_ops"},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_strategy_conditions_payload_gin", table_name="strategy_conditions", postgresql_concurrently=True)
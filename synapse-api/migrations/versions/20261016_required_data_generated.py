@@ -0,0 +1,37 @@
+"""Make strategies.required_data a stored generated column derived from assets and condition_ids"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "20261016_required_data_generated"
+down_revision = "20261016_conditions_payload_gin"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # An existing column cannot be turned into a generated one in place; add the generated column,
+    # then swap it in. The application never populated required_data beyond '{}', so nothing is lost.
+    op.add_column(
+        "strategies",
+        sa.Column(
+            "required_data_gen",
+            postgresql.JSONB(astext_type=sa.Text()),
+            sa.Computed("jsonb_build_object('assets', assets, 'condition_ids', condition_ids)", persisted=True),
+            nullable=False,
+        ),
+    )
+    op.drop_column("strategies", "required_data")
+    op.alter_column("strategies", "required_data_gen", new_column_name="required_data")
+
+
+def downgrade():
+    op.add_column(
+        "strategies",
+        sa.Column("required_data_plain", postgresql.JSONB(astext_type=sa.Text()), nullable=False, server_default=sa.text("'{}'::jsonb")),
+    )
+    op.execute("UPDATE strategies SET required_data_plain = required_data")
+    op.drop_column("strategies", "required_data")
+    op.alter_column("strategies", "required_data_plain", new_column_name="required_data")
@@ -0,0 +1,28 @@
+"""Partial index on active strategies covering the scheduler's schedule scan"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261016_strategies_active_idx"
+down_revision = "20261016_trigger_logs_strat_idx"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # CONCURRENTLY cannot run inside a transaction block; build without blocking writes to strategies
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_strategies_active",
+            "strategies",
+            ["id"],
+            postgresql_where=sa.text("status = 'active'"),
+            postgresql_include=["schedule", "last_run_at"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_strategies_active", table_name="strategies", postgresql_concurrently=True)
@@ -0,0 +1,25 @@
+"""Index strategies (status, last_run_at) for the scheduler's due-to-run query"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261016_strategies_due_idx"
+down_revision = "20261016_trigger_logs_ts_idx"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # CONCURRENTLY cannot run inside a transaction block; build without blocking strategy writes
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_strategies_status_last_run_at",
+            "strategies",
+            ["status", "last_run_at"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_strategies_status_last_run_at", table_name="strategies", postgresql_concurrently=True)
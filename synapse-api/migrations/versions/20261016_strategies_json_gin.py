@@ -0,0 +1,35 @@
+"""GIN (jsonb_path_ops) indexes on strategies.assets, logic_tree and condition_ids for @> lookups"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261016_strategies_json_gin"
+down_revision = "20261016_strategies_due_idx"
+branch_labels = None
+depends_on = None
+
+_INDEXES = (
+    ("ix_strategies_assets_gin", "assets"),
+    ("ix_strategies_logic_tree_gin", "logic_tree"),
+    ("ix_strategies_condition_ids_gin", "condition_ids"),
+)
+
+
+def upgrade():
+    # CONCURRENTLY cannot run inside a transaction block; build without blocking writes to strategies
+    with op.get_context().autocommit_block():
+        for name, column in _INDEXES:
+            op.create_index(
+                name,
+                "strategies",
+                [column],
+                postgresql_using="gin",
+                postgresql_ops={column: "jsonb_path_ops"},
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, _ in _INDEXES:
+            op.drop_index(name, table_name="strategies", postgresql_concurrently=True)
@@ -0,0 +1,29 @@
+"""Move strategies column defaults to the server"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261016_strategies_srv_defaults"
+down_revision = "20261016_strategies_tree_check"
+branch_labels = None
+depends_on = None
+
+_DEFAULTS = (
+    ("condition_ids", "'[]'::jsonb"),
+    ("assets", "'[]'::jsonb"),
+    ("notification_preferences", "'{}'::jsonb"),
+    ("required_data", "'{}'::jsonb"),
+    ("trigger_count", "0"),
+    ("status", "'active'"),
+)
+
+
+def upgrade():
+    for column, default in _DEFAULTS:
+        op.alter_column("strategies", column, server_default=sa.text(default))
+
+
+def downgrade():
+    for column, _ in _DEFAULTS:
+        op.alter_column("strategies", column, server_default=None)
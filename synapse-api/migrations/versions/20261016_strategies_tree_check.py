@@ -0,0 +1,24 @@
+"""CHECK constraint on the shape of strategies.logic_tree's root node"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261016_strategies_tree_check"
+down_revision = "20261016_strategies_active_idx"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # NOT VALID: enforced for new writes right away without a full-table scan under an exclusive lock.
+    # Run VALIDATE CONSTRAINT separately once legacy rows have been checked.
+    op.execute(
+        "ALTER TABLE strategies ADD CONSTRAINT ck_strategies_logic_tree_shape CHECK ("
+        "jsonb_typeof(logic_tree) = 'object' AND (logic_tree ? 'ref' OR "
+        "(logic_tree->>'operator' IN ('AND', 'OR') AND jsonb_typeof(logic_tree->'conditions') = 'array'))"
+        ") NOT VALID"
+    )
+
+
+def downgrade():
+    op.drop_constraint("ck_strategies_logic_tree_shape", "strategies", type_="check")
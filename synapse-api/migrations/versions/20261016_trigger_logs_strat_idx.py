@@ -0,0 +1,26 @@
+"""Composite index strategy_trigger_logs (strategy_id, triggered_at DESC) for per-strategy recent triggers"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261016_trigger_logs_strat_idx"
+down_revision = "20261016_strategies_json_gin"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # CONCURRENTLY cannot run inside a transaction block; build without blocking trigger log inserts
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_trigger_logs_strategy_time",
+            "strategy_trigger_logs",
+            ["strategy_id", sa.text("triggered_at DESC")],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_trigger_logs_strategy_time", table_name="strategy_trigger_logs", postgresql_concurrently=True)
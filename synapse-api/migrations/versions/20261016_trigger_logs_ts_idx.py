@@ -0,0 +1,27 @@
+"""Index strategy_trigger_logs.triggered_at for paginated trigger log reads"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261016_trigger_logs_ts_idx"
+down_revision = "b6c2f51c9b1e"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # CONCURRENTLY cannot run inside a transaction block; build without blocking trigger log inserts
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_strategy_trigger_logs_triggered_at",
+            "strategy_trigger_logs",
+            ["triggered_at"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_strategy_trigger_logs_triggered_at", table_name="strategy_trigger_logs", postgresql_concurrently=True
+        )
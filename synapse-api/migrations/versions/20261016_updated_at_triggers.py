@@ -0,0 +1,29 @@
+"""Maintain updated_at on strategies and strategy_conditions with a BEFORE UPDATE trigger"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261016_updated_at_triggers"
+down_revision = "20261016_strategies_srv_defaults"
+branch_labels = None
+depends_on = None
+
+_TABLES = ("strategies", "strategy_conditions")
+
+
+def upgrade():
+    op.execute(
+        "CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger LANGUAGE plpgsql AS $$ "
+        "BEGIN NEW.updated_at := now(); RETURN NEW; END $$"
+    )
+    for table in _TABLES:
+        op.execute(
+            f"CREATE TRIGGER trg_{table}_updated_at BEFORE UPDATE ON {table} "
+            "FOR EACH ROW EXECUTE FUNCTION set_updated_at()"
+        )
+
+
+def downgrade():
+    for table in _TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_updated_at ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS set_updated_at()")
@@ -0,0 +1,33 @@
+from cachetools import TTLCache
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+
+# Short-lived per-process caches for strategy reads, so dashboards polling the same user's
+# strategies don't hit the database every time. Writes through StrategyService invalidate them;
+# scheduler-side fields (last_run_at, trigger_count) may lag by up to the TTL.
+STRATEGY_CACHE_TTL_SECONDS = 15
+
+# user_id -> {(status, asset): [StrategyReadSchema, ...]}
+list_cache: TTLCache = TTLCache(maxsize=1024, ttl=STRATEGY_CACHE_TTL_SECONDS)
+
+# (user_id, strategy_id) -> StrategyReadSchema
+detail_cache: TTLCache = TTLCache(maxsize=4096, ttl=STRATEGY_CACHE_TTL_SECONDS)
+
+
+def get_list(user_id: UUID, filters: Tuple[Optional[str], Optional[str]]) -> Optional[Any]:
+    """Returns the cached list for this user and filter combination, if any."""
+    return list_cache.get(user_id, {}).get(filters)
+
+
+def set_list(user_id: UUID, filters: Tuple[Optional[str], Optional[str]], items: Any) -> None:
+    entries: Dict[Tuple[Optional[str], Optional[str]], Any] = list_cache.get(user_id) or {}
+    entries[filters] = items
+    # Re-assigning restarts the TTL for the user's whole entry
+    list_cache[user_id] = entries
+
+
+def invalidate(user_id: UUID, strategy_id: Optional[UUID] = None) -> None:
+    """Drops the user's cached lists and, if given, the cached strategy."""
+    list_cache.pop(user_id, None)
+    if strategy_id is not None:
+        detail_cache.pop((user_id, strategy_id), None)
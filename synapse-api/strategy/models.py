@@ -4,7 +4,7 @@ from datetime import datetime
 import enum
 import uuid
 import re
-from typing import Optional, List, Dict, Any, Union
+from typing import Optional, List, Dict, Any, Type, Union
 
 from sqlalchemy import (
     Column,
@@ -15,7 +15,12 @@ from sqlalchemy import (
     Integer,
     Boolean,
     Index,
+    CheckConstraint,
+    Computed,
+    FetchedValue,
+    cast,
     func,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
@@ -43,6 +48,14 @@ class LogicOperator(str, enum.Enum):
 
 class Strategy(Base):
     __tablename__ = "strategies"
+    __table_args__ = (
+        # Structural check on the root node, enforced by Postgres even for writes that bypass the API schema
+        CheckConstraint(
+            "jsonb_typeof(logic_tree) = 'object' AND (logic_tree ? 'ref' OR "
+            "(logic_tree->>'operator' IN ('AND', 'OR') AND jsonb_typeof(logic_tree->'conditions') = 'array'))",
+            name="ck_strategies_logic_tree_shape",
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("user_profiles.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -52,39 +65,65 @@ class Strategy(Base):
 
     # The canonical normalized condition records are stored in strategy_conditions
     # 'logic_tree' refers to condition/group structure using refs to condition ids (see Pydantic schema)
-    logic_tree = Column(JSONB, nullable=False, default={})  # {"operator":"AND", "conditions":[{"ref":"c1"}, {"operator":"OR","conditions":[{"ref":"c2"},{"ref":"c3"}]}]}
+    logic_tree = Column(JSONB, nullable=False)  # {"operator":"AND", "conditions":[{"ref":"c1"}, {"operator":"OR","conditions":[{"ref":"c2"},{"ref":"c3"}]}]}
 
     # optional materialized list of condition ids (helpful for quick queries)
-    condition_ids = Column(JSONB, nullable=False, default=list)
+    condition_ids = Column(JSONB, nullable=False, server_default=text("'[]'::jsonb"))
 
     # schedule: cron-like or simple interval (1m,5m,1h) or "event"
     schedule = Column(String, nullable=False, default="1m")
 
     # assets explicitly referenced by strategy (for data prefetching)
-    assets = Column(JSONB, nullable=False, default=list)
+    assets = Column(JSONB, nullable=False, server_default=text("'[]'::jsonb"))
 
     # notification preferences follow a validated JSON schema (see Pydantic below)
-    notification_preferences = Column(JSONB, nullable=False, default={})
+    notification_preferences = Column(JSONB, nullable=False, server_default=text("'{}'::jsonb"))
 
-    # engine metadata: required data sources, last run times, derived info
-    required_data = Column(JSONB, nullable=False, default={})
+    # engine metadata: required data sources, derived by Postgres from the columns above on every write
+    required_data = Column(
+        JSONB,
+        Computed("jsonb_build_object('assets', assets, 'condition_ids', condition_ids)", persisted=True),
+        nullable=False,
+    )
 
     # stats
     last_run_at = Column(DateTime, nullable=True)
     last_triggered_at = Column(DateTime, nullable=True)
-    trigger_count = Column(Integer, nullable=False, default=0)
+    trigger_count = Column(Integer, nullable=False, server_default=text("0"))
 
-    status = Column(SQLEnum(StrategyStatus), nullable=False, default=StrategyStatus.active)
+    status = Column(SQLEnum(StrategyStatus), nullable=False, server_default=text("'active'"))
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # Maintained by the set_updated_at() BEFORE UPDATE trigger; FetchedValue makes the ORM expire it after updates
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue())
 
     # relationships
     conditions = relationship("StrategyCondition", cascade="all, delete-orphan", back_populates="strategy")
     trigger_logs = relationship("StrategyTriggerLog", cascade="all, delete-orphan", back_populates="strategy")
 
+    # Containment (@>) predicates: unlike ->/->> extraction these can use the jsonb_path_ops GIN indexes
+    @classmethod
+    def references_asset(cls, symbol: str):
+        return cls.assets.op("@>")(cast([symbol], JSONB))
+
+    @classmethod
+    def has_condition(cls, condition_id: str):
+        return cls.condition_ids.op("@>")(cast([condition_id], JSONB))
+
 
 Index("ix_strategies_user_status", Strategy.user_id, Strategy.status)
+Index("ix_strategies_status_last_run_at", Strategy.status, Strategy.last_run_at)
+# Partial index over live strategies only: the scheduler's schedule scan is index-only and stays cache-resident
+Index(
+    "ix_strategies_active",
+    Strategy.id,
+    postgresql_where=Strategy.status == StrategyStatus.active,
+    postgresql_include=["schedule", "last_run_at"],
+)
+# jsonb_path_ops GIN indexes serve `@>` containment lookups such as "strategies referencing asset X"
+Index("ix_strategies_assets_gin", Strategy.assets, postgresql_using="gin", postgresql_ops={"assets": "jsonb_path_ops"})
+Index("ix_strategies_logic_tree_gin", Strategy.logic_tree, postgresql_using="gin", postgresql_ops={"logic_tree": "jsonb_path_ops"})
+Index("ix_strategies_condition_ids_gin", Strategy.condition_ids, postgresql_using="gin", postgresql_ops={"condition_ids": "jsonb_path_ops"})
 
 
 class StrategyCondition(Base):
@@ -108,10 +147,21 @@ class StrategyCondition(Base):
 
     # created/updated
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # Maintained by the set_updated_at() BEFORE UPDATE trigger; FetchedValue makes the ORM expire it after updates
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue())
 
     strategy = relationship("Strategy", back_populates="conditions")
 
+    @classmethod
+    def has_payload_field(cls, key: str, value: Any):
+        """
+        Containment predicate on the payload, e.g. has_payload_field("asset", "BTC") -> payload @> '{"asset": "BTC"}'.
+        """
+        return cls.payload.op("@>")(cast({key: value}, JSONB))
+
+
+Index("ix_strategy_conditions_payload_gin", StrategyCondition.payload, postgresql_using="gin", postgresql_ops={"payload": "jsonb_path_ops"})
+
 
 class StrategyTriggerLog(Base):
     __tablename__ = "strategy_trigger_logs"
@@ -119,7 +169,7 @@ class StrategyTriggerLog(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     strategy_id = Column(UUID(as_uuid=True), ForeignKey("strategies.id", ondelete="CASCADE"), nullable=False, index=True)
 
-    triggered_at = Column(DateTime(timezone=True), server_default=func.now())
+    triggered_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     # store snapshot of data that caused the trigger for audit (prices, candles, indicator values, group evaluation result)
     snapshot = Column(JSONB, nullable=False, default={})
 
@@ -129,10 +179,54 @@ class StrategyTriggerLog(Base):
     strategy = relationship("Strategy", back_populates="trigger_logs")
 
 
+# "Latest N triggers for a strategy" walks this index in order and stops at the LIMIT, no sort
+Index("ix_trigger_logs_strategy_time", StrategyTriggerLog.strategy_id, StrategyTriggerLog.triggered_at.desc())
+
+
 # -------------------------
 # Pydantic schemas (API / validation)
 # -------------------------
 
+_LOGIC_OPS = frozenset(op.value for op in LogicOperator)
+_LOGIC_OPS_SORTED = sorted(_LOGIC_OPS)
+# Logic trees come straight from clients; bound them before walking
+_MAX_LOGIC_DEPTH = 32
+_MAX_LOGIC_NODES = 1000
+
+
+def check_logic_tree(tree: Any) -> None:
+    """
+    Validates a logic tree iteratively (no recursion), raising ValueError on the first bad node.
+    """
+    stack = [(tree, 1)]
+    seen = 0
+    while stack:
+        node, depth = stack.pop()
+        seen += 1
+        if seen > _MAX_LOGIC_NODES:
+            raise ValueError(f"logic_tree must have at most {_MAX_LOGIC_NODES} nodes")
+        if depth > _MAX_LOGIC_DEPTH:
+            raise ValueError(f"logic_tree must be nested at most {_MAX_LOGIC_DEPTH} levels deep")
+        if not isinstance(node, dict):
+            raise ValueError("logic_tree nodes must be dicts")
+
+        if "ref" in node:
+            ref = node.get("ref")
+            if not isinstance(ref, str) or not ref.strip():
+                raise ValueError("logic_tree condition ref must be a non-empty string")
+            continue  # Valid condition reference node
+
+        # If not a 'ref' node, it must be a group node
+        op = node.get("operator")
+        conds = node.get("conditions")
+
+        if op not in _LOGIC_OPS:
+            raise ValueError(f"logic_tree.operator must be one of {_LOGIC_OPS_SORTED}")
+        if not isinstance(conds, list) or len(conds) == 0:
+            raise ValueError("logic_tree.conditions must be a non-empty list")
+
+        stack.extend((child, depth + 1) for child in reversed(conds))
+
 # Notification schemas
 class NotificationChannel(BaseModel):
     enabled: bool = True
@@ -210,6 +304,12 @@ class TechnicalIndicatorPayload(BaseModel):
 # Union type for all possible condition payloads
 ConditionPayload = Union[PriceAlertPayload, VolumeAlertPayload, TechnicalIndicatorPayload]
 
+_PAYLOAD_MODELS: Dict[str, Type[BaseModel]] = {
+    "price_alert": PriceAlertPayload,
+    "volume_alert": VolumeAlertPayload,
+    "technical_indicator": TechnicalIndicatorPayload,
+}
+
 
 # Update ConditionCreate to use the Union type for payload and add a validator
 class ConditionCreate(BaseModel):
@@ -222,13 +322,10 @@ class ConditionCreate(BaseModel):
     @validator("payload", pre=True)
     def validate_payload_by_type(cls, v, values):
         condition_type = values.get("type")
-        if condition_type == "price_alert":
-            return PriceAlertPayload(**v)
-        elif condition_type == "volume_alert":
-            return VolumeAlertPayload(**v)
-        elif condition_type == "technical_indicator":
-            return TechnicalIndicatorPayload(**v)
-        raise ValueError(f"Unknown condition type: {condition_type}")
+        model = _PAYLOAD_MODELS.get(condition_type)
+        if model is None:
+            raise ValueError(f"Unknown condition type: {condition_type}")
+        return v if isinstance(v, model) else model.parse_obj(v)
 
 
 class ConditionRead(ConditionCreate):
@@ -260,28 +357,7 @@ class StrategyCreateSchema(BaseModel):
 
     @validator("logic_tree")
     def validate_logic_tree(cls, v, values):
-        def check(node: Any):
-            if not isinstance(node, dict):
-                raise ValueError("logic_tree nodes must be dicts")
-
-            if "ref" in node:
-                ref = node.get("ref")
-                if not isinstance(ref, str) or not ref.strip():
-                    raise ValueError("logic_tree condition ref must be a non-empty string")
-                return # Valid condition reference node
-
-            # If not a 'ref' node, it must be a group node
-            op = node.get("operator")
-            conds = node.get("conditions")
-
-            if op not in {op_enum.value for op_enum in LogicOperator}:
-                raise ValueError(f"logic_tree.operator must be one of {[op_enum.value for op_enum in LogicOperator]}")
-            if not isinstance(conds, list) or len(conds) == 0:
-                raise ValueError("logic_tree.conditions must be a non-empty list")
-
-            for child in conds:
-                check(child) # Recursively check child nodes
-        check(v)
+        check_logic_tree(v)
         return v
 
 
@@ -57,11 +57,12 @@ async def create_strategy_from_agent(
 @router.get("/strategies", response_model=List[StrategyReadSchema])
 async def list_strategies(
     status: Optional[StrategyStatus] = Query(default=None),
+    asset: Optional[str] = Query(default=None, description="Only strategies referencing this asset"),
     db: AsyncSession = Depends(get_db),
     current_user: UserProfile = Depends(get_current_user),
 ):
     svc = StrategyService(db)
-    return await svc.list_strategies(current_user, status.value if status else None)
+    return await svc.list_strategies(current_user, status.value if status else None, asset=asset)
 
 
 @router.get("/strategies/{strategy_id}", response_model=StrategyReadSchema)
@@ -2,11 +2,12 @@ from typing import Optional, List, Dict, Any
 from uuid import UUID, uuid4
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete
+from sqlalchemy import insert, select, update, delete
 from sqlalchemy.exc import IntegrityError
 
 from core.errors import NotFoundError
 from auth.models import UserProfile
+from . import cache
 from .models import (
     Strategy,
     StrategyCondition,
@@ -21,27 +22,17 @@ class StrategyService:
         self.db = db
 
     async def create_strategy(self, current_user: UserProfile, payload: StrategyCreateSchema) -> StrategyReadSchema:
-        # Assign stable UUIDs to conditions (use provided id or generate)
+        # The strategy id is assigned up front so condition rows can reference it without a separate flush
+        strategy_id = uuid4()
         cond_id_map: Dict[str, UUID] = {}
-        normalized_conditions = []
-        for c in payload.conditions:
-            cid = c.id or uuid4()
-            cond_id_map[str(c.id) if c.id else str(cid)] = cid
-            normalized_conditions.append(
-                StrategyCondition(
-                    id=cid,
-                    type=c.type,
-                    payload=c.payload.dict(),
-                    label=c.label,
-                    enabled=c.enabled,
-                )
-            )
+        condition_rows = self._condition_rows(payload, strategy_id, cond_id_map)
 
         # Rewrite logic_tree refs to actual UUID strings
         rewritten_tree = self._rewrite_logic_refs(payload.logic_tree, cond_id_map)
 
         # Create strategy
         strategy = Strategy(
+            id=strategy_id,
             user_id=current_user.id,
             name=payload.name,
             description=payload.description,
@@ -50,33 +41,38 @@ class StrategyService:
             schedule=payload.schedule,
             assets=payload.assets,
             notification_preferences=payload.notification_preferences.dict() if hasattr(payload.notification_preferences, "dict") else payload.notification_preferences,
-            required_data={},  # can be derived by evaluator later
             status=payload.status or StrategyStatus.active,
         )
         self.db.add(strategy)
-        await self.db.flush()  # get strategy.id before creating condition rows
-
-        # Attach conditions to this strategy
-        for sc in normalized_conditions:
-            sc.strategy_id = strategy.id
-            self.db.add(sc)
 
         try:
+            # Autoflushes the strategy, then writes every condition in one multi-row INSERT
+            if condition_rows:
+                await self.db.execute(insert(StrategyCondition), condition_rows)
             await self.db.commit()
         except IntegrityError:
             await self.db.rollback()
             from core.errors import ConflictError
             raise ConflictError("Strategy creation failed due to integrity constraints")
 
+        cache.invalidate(current_user.id)
         await self.db.refresh(strategy)
         # Load conditions back for response
         conds = await self._fetch_conditions(strategy.id)
         return self._to_read_schema(strategy, conds)
 
-    async def list_strategies(self, current_user: UserProfile, status: Optional[str] = None) -> List[StrategyReadSchema]:
+    async def list_strategies(
+        self, current_user: UserProfile, status: Optional[str] = None, asset: Optional[str] = None
+    ) -> List[StrategyReadSchema]:
+        cached = cache.get_list(current_user.id, (status, asset))
+        if cached is not None:
+            return cached
+
         stmt = select(Strategy).where(Strategy.user_id == current_user.id)
         if status:
             stmt = stmt.where(Strategy.status == StrategyStatus(status))
+        if asset:
+            stmt = stmt.where(Strategy.references_asset(asset))
         res = await self.db.execute(stmt.order_by(Strategy.created_at.desc()))
         items = res.scalars().all()
 
@@ -84,9 +80,14 @@ class StrategyService:
         for s in items:
             conds = await self._fetch_conditions(s.id)
             result.append(self._to_read_schema(s, conds))
+        cache.set_list(current_user.id, (status, asset), result)
         return result
 
     async def get_strategy(self, current_user: UserProfile, strategy_id: UUID) -> StrategyReadSchema:
+        cached = cache.detail_cache.get((current_user.id, strategy_id))
+        if cached is not None:
+            return cached
+
         res = await self.db.execute(
             select(Strategy).where(Strategy.id == strategy_id, Strategy.user_id == current_user.id)
         )
@@ -95,42 +96,22 @@ class StrategyService:
             raise NotFoundError("Strategy not found")
 
         conds = await self._fetch_conditions(strategy.id)
-        return self._to_read_schema(strategy, conds)
+        result = self._to_read_schema(strategy, conds)
+        cache.detail_cache[(current_user.id, strategy_id)] = result
+        return result
 
     async def update_strategy(self, current_user: UserProfile, strategy_id: UUID, payload: StrategyCreateSchema) -> StrategyReadSchema:
-        # Ensure strategy exists
-        res = await self.db.execute(
-            select(Strategy).where(Strategy.id == strategy_id, Strategy.user_id == current_user.id)
-        )
-        strategy = res.scalar_one_or_none()
-        if not strategy:
-            raise NotFoundError("Strategy not found")
-
-        # Delete existing conditions (full replace semantics)
-        await self.db.execute(delete(StrategyCondition).where(StrategyCondition.strategy_id == strategy_id))
-
-        # Recreate conditions with new IDs (or provided)
         cond_id_map: Dict[str, UUID] = {}
-        for c in payload.conditions:
-            cid = c.id or uuid4()
-            cond_id_map[str(c.id) if c.id else str(cid)] = cid
-            self.db.add(
-                StrategyCondition(
-                    id=cid,
-                    strategy_id=strategy_id,
-                    type=c.type,
-                    payload=c.payload.dict(),
-                    label=c.label,
-                    enabled=c.enabled,
-                )
-            )
+        condition_rows = self._condition_rows(payload, strategy_id, cond_id_map)
 
         rewritten_tree = self._rewrite_logic_refs(payload.logic_tree, cond_id_map)
 
         try:
-            await self.db.execute(
+            # The ownership-scoped UPDATE doubles as the existence check, and RETURNING hands back the
+            # row as written (including trigger/generated columns), so no SELECT before or after
+            res = await self.db.execute(
                 update(Strategy)
-                .where(Strategy.id == strategy_id)
+                .where(Strategy.id == strategy_id, Strategy.user_id == current_user.id)
                 .values(
                     name=payload.name,
                     description=payload.description,
@@ -141,19 +122,26 @@ class StrategyService:
                     notification_preferences=payload.notification_preferences.dict() if hasattr(payload.notification_preferences, "dict") else payload.notification_preferences,
                     status=payload.status or StrategyStatus.active,
                 )
+                .returning(Strategy)
             )
+            updated = res.scalar_one_or_none()
+            if not updated:
+                await self.db.rollback()
+                raise NotFoundError("Strategy not found")
+
+            # Replace the conditions (full replace semantics); the new rows come back from the INSERT
+            await self.db.execute(delete(StrategyCondition).where(StrategyCondition.strategy_id == strategy_id))
+            conds: List[ConditionRead] = []
+            if condition_rows:
+                res = await self.db.execute(insert(StrategyCondition).returning(StrategyCondition), condition_rows)
+                conds = [self._to_condition_read(c) for c in res.scalars().all()]
             await self.db.commit()
         except IntegrityError:
             await self.db.rollback()
             from core.errors import ConflictError
             raise ConflictError("Strategy update failed due to integrity constraints")
 
-        # Reload and return
-        res = await self.db.execute(
-            select(Strategy).where(Strategy.id == strategy_id, Strategy.user_id == current_user.id)
-        )
-        updated = res.scalar_one_or_none()
-        conds = await self._fetch_conditions(strategy_id)
+        cache.invalidate(current_user.id, strategy_id)
         return self._to_read_schema(updated, conds)
 
     async def delete_strategy(self, current_user: UserProfile, strategy_id: UUID) -> None:
@@ -167,26 +155,42 @@ class StrategyService:
 
         await self.db.execute(delete(Strategy).where(Strategy.id == strategy_id))
         await self.db.commit()
+        cache.invalidate(current_user.id, strategy_id)
+
+    def _condition_rows(self, payload: StrategyCreateSchema, strategy_id: UUID, cond_id_map: Dict[str, UUID]) -> List[Dict[str, Any]]:
+        # Assign stable UUIDs to conditions (use provided id or generate) and record them in cond_id_map
+        rows: List[Dict[str, Any]] = []
+        for c in payload.conditions:
+            cid = c.id or uuid4()
+            cond_id_map[str(cid)] = cid
+            rows.append(
+                {
+                    "id": cid,
+                    "strategy_id": strategy_id,
+                    "type": c.type,
+                    "payload": c.payload.dict(),
+                    "label": c.label,
+                    "enabled": c.enabled,
+                }
+            )
+        return rows
 
     async def _fetch_conditions(self, strategy_id: UUID) -> List[ConditionRead]:
         res = await self.db.execute(
             select(StrategyCondition).where(StrategyCondition.strategy_id == strategy_id)
         )
-        items = res.scalars().all()
-        out: List[ConditionRead] = []
-        for i in items:
-            out.append(
-                ConditionRead(
-                    id=i.id,
-                    type=i.type,
-                    payload=i.payload,
-                    label=i.label,
-                    enabled=i.enabled,
-                    created_at=i.created_at,
-                    updated_at=i.updated_at,
-                )
-            )
-        return out
+        return [self._to_condition_read(i) for i in res.scalars().all()]
+
+    def _to_condition_read(self, i: StrategyCondition) -> ConditionRead:
+        return ConditionRead(
+            id=i.id,
+            type=i.type,
+            payload=i.payload,
+            label=i.label,
+            enabled=i.enabled,
+            created_at=i.created_at,
+            updated_at=i.updated_at,
+        )
 
     def _to_read_schema(self, s: Strategy, conds: List[ConditionRead]) -> StrategyReadSchema:
         return StrategyReadSchema(
@@ -0,0 +1,106 @@
+import time
+import uuid
+from types import SimpleNamespace
+
+import jwt
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from auth.service import AuthService
+from core import security
+
+
+class FakeSession:
+    """Stands in for AsyncSession: primary-key lookups only."""
+
+    def __init__(self, users):
+        self.users = users
+        self.get_calls = 0
+
+    async def get(self, model, pk):
+        self.get_calls += 1
+        return self.users.get(pk)
+
+
+def bearer(exp: float) -> HTTPAuthorizationCredentials:
+    token = jwt.encode({"privy_user_id": "did:privy:1", "exp": int(exp)}, "test-secret", algorithm="HS256")
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+@pytest.fixture(autouse=True)
+def clear_session_cache():
+    security._session_cache.clear()
+    yield
+    security._session_cache.clear()
+
+
+@pytest.fixture
+def user():
+    return SimpleNamespace(id=uuid.uuid4())
+
+
+@pytest.fixture
+def verify_calls(monkeypatch, user):
+    calls = []
+
+    async def verify_token(self, token):
+        calls.append(token)
+        return user
+
+    monkeypatch.setattr(AuthService, "verify_token", verify_token)
+    return calls
+
+
+async def test_cache_hit_skips_verification_and_reloads_user(user, verify_calls):
+    db = FakeSession({user.id: user})
+    creds = bearer(time.time() + 3600)
+
+    assert await security.get_current_user(creds, db) is user
+    assert await security.get_current_user(creds, db) is user
+
+    assert len(verify_calls) == 1
+    # The hit reloads the user in the caller's session instead of reusing a cached instance
+    assert db.get_calls == 1
+    # Keyed by a digest, not the bearer token
+    assert list(security._session_cache) == [security._token_key(creds.credentials)]
+
+
+async def test_expired_entry_is_verified_again(user, verify_calls):
+    db = FakeSession({user.id: user})
+    creds = bearer(time.time() + 3600)
+    await security.get_current_user(creds, db)
+    key = security._token_key(creds.credentials)
+    security._session_cache[key] = (user.id, time.time() - 1)
+
+    await security.get_current_user(creds, db)
+
+    assert len(verify_calls) == 2
+    assert db.get_calls == 0
+
+
+async def test_deleted_user_is_not_served_from_cache(user, verify_calls, monkeypatch):
+    creds = bearer(time.time() + 3600)
+    await security.get_current_user(creds, FakeSession({user.id: user}))
+
+    async def verify_token(self, token):
+        return None
+
+    monkeypatch.setattr(AuthService, "verify_token", verify_token)
+    with pytest.raises(HTTPException) as exc:
+        await security.get_current_user(creds, FakeSession({}))
+
+    assert exc.value.status_code == 401
+    assert len(security._session_cache) == 0
+
+
+async def test_invalid_token_is_not_cached(monkeypatch):
+    async def verify_token(self, token):
+        return None
+
+    monkeypatch.setattr(AuthService, "verify_token", verify_token)
+    with pytest.raises(HTTPException) as exc:
+        await security.get_current_user(bearer(time.time() + 3600), FakeSession({}))
+
+    assert exc.value.status_code == 401
+    assert len(security._session_cache) == 0